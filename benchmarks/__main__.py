@@ -0,0 +1,89 @@
+import argparse
+import json
+import logging
+import platform
+import sys
+import timeit
+import tracemalloc
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from benchmarks.corpus import OPERATIONS, Corpus, build_corpora
+
+logging.basicConfig(format="", level=logging.INFO)
+logger = logging.getLogger(__package__)
+
+
+def _peak_memory(operation: str, corpus: Corpus) -> int:
+    tracemalloc.start()
+    try:
+        OPERATIONS[operation](corpus)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(operation: str, corpus: Corpus, repeat: int = 5) -> dict[str, float | int]:
+    timer = timeit.Timer(lambda: OPERATIONS[operation](corpus))
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {
+        "seconds": seconds,
+        "ops_per_sec": 1 / seconds,
+        "bytes_per_sec": len(corpus.data) / seconds,
+        "bytes": len(corpus.data),
+        "peak_memory": _peak_memory(operation, corpus),
+    }
+
+
+def _version() -> str:
+    try:
+        return version("pysn1")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def run(names: list[str] | None = None, repeat: int = 5) -> dict:
+    results = {}
+    for corpus in build_corpora():
+        if names and corpus.name not in names:
+            continue
+        for operation in sorted(OPERATIONS):
+            result = measure(operation, corpus, repeat)
+            results[f"{operation}/{corpus.name}"] = result
+            logger.info(
+                "%-6s %-13s %12.0f ops/s %10.2f MB/s %10d B peak",
+                operation,
+                corpus.name,
+                result["ops_per_sec"],
+                result["bytes_per_sec"] / 1e6,
+                result["peak_memory"],
+            )
+    return {
+        "pysn1": _version(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="pysn1 codec throughput")
+    parser.add_argument("--json", type=Path, help="write machine-readable results to this file ('-' for stdout)")
+    parser.add_argument("--corpus", action="append", help="only run this corpus (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs per benchmark, the best one is kept")
+    args = parser.parse_args(argv)
+
+    report = run(args.corpus, args.repeat)
+    if args.json is None:
+        return
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if str(args.json) == "-":
+        sys.stdout.write(output + "\n")
+    else:
+        args.json.write_text(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import logging
+import timeit
+
+from pysn1.debugger import Identifier
+
+logging.basicConfig(format="", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+NUMBER = 200_000
+TAGS = (0x01, 0x30, 0x61, 0x80, 0x85, 0xAB)
+
+
+def bench_identifier(number: int = NUMBER) -> dict[str, float]:
+    # per-tag decode cost in nanoseconds, uncached (match + new objects) vs interned table
+    uncached = timeit.timeit(
+        "for tag in tags: decode(tag)",
+        globals={"tags": TAGS, "decode": Identifier._decode},  # noqa: SLF001
+        number=number,
+    )
+    interned = timeit.timeit(
+        "for tag in tags: decode(tag)",
+        globals={"tags": TAGS, "decode": Identifier.from_int},
+        number=number,
+    )
+    calls = number * len(TAGS)
+    return {"uncached": uncached / calls * 1e9, "interned": interned / calls * 1e9}
+
+
+if __name__ == "__main__":
+    result = bench_identifier()
+    logger.info("Identifier.from_int uncached: %7.1f ns/tag", result["uncached"])
+    logger.info("Identifier.from_int interned: %7.1f ns/tag", result["interned"])
+    logger.info("speedup: %.1fx", result["uncached"] / result["interned"])
@@ -0,0 +1,112 @@
+import logging
+import timeit
+from struct import pack, unpack
+
+from pysn1.triplet import Triplet, pack_header
+
+logging.basicConfig(format="", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+NUMBER = 100_000
+
+# every length form, 0x83/0x84 use small (non-minimal) lengths to keep the corpus small
+LENGTH_FORMS = {
+    "short": b"\x81\x7f" + b"\x01" * 0x7F,
+    "0x81": b"\x81\x81\x80" + b"\x01" * 0x80,
+    "0x82": b"\x81\x82\x01\x00" + b"\x01" * 0x100,
+    "0x83": b"\x81\x83\x00\x01\x00" + b"\x01" * 0x100,
+    "0x84": b"\x81\x84\x00\x00\x01\x00" + b"\x01" * 0x100,
+}
+
+
+def _format_string_header(bytestring: bytes) -> tuple[int, int, int]:
+    # the previous codec: module-level unpack with format strings and sliced copies, kept as the baseline
+    tag = unpack("!B", bytestring[0:1])[0]
+    length = unpack("!B", bytestring[1:2])[0]
+    extended_length_string = bytestring[2:6]
+    extended_length = 0
+    match length:
+        case 0x81:
+            length = unpack("!B", extended_length_string[0:1])[0]
+            extended_length = 1
+        case 0x82:
+            length = unpack("!H", extended_length_string[0:2])[0]
+            extended_length = 2
+        case 0x83:
+            length = unpack("!I", b"\x00" + extended_length_string[0:3])[0]
+            extended_length = 3
+        case 0x84:
+            length = unpack("!I", extended_length_string[0:4])[0]
+            extended_length = 4
+    return tag, length, 2 + extended_length
+
+
+def _format_string_bytes(tag: int, length: int) -> bytes:
+    if length < 0x80:  # noqa: PLR2004
+        header = pack("!B", length)
+    elif length <= 0xFF:  # noqa: PLR2004
+        header = b"\x81" + pack("!B", length)
+    elif length <= 0xFFFF:  # noqa: PLR2004
+        header = b"\x82" + pack("!H", length)
+    elif length <= 0xFFFFFF:  # noqa: PLR2004
+        header = b"\x83" + pack("!I", length)[1:4]
+    else:
+        header = b"\x84" + pack("!I", length)
+    return pack("!B", tag) + header
+
+
+class BenchmarkMismatchError(ValueError): ...
+
+
+def check_length() -> None:
+    # both codecs must agree with Triplet.from_bytes on every length form, or the timings compare different work
+    for name, bytestring in LENGTH_FORMS.items():
+        triplet = Triplet.from_bytes(bytestring)
+        header = (triplet.tag, triplet.length, len(bytestring) - triplet.length)
+        if _format_string_header(bytestring) != header or Triplet.read_header(bytestring) != header:
+            msg = f"Length form {name}: header decoders disagree with Triplet.from_bytes {header}"
+            raise BenchmarkMismatchError(msg)
+        # the baseline encoder always writes the minimal form, the Struct one must match it
+        if _format_string_bytes(triplet.tag, triplet.length) != pack_header(triplet.tag, triplet.length):
+            msg = f"Length form {name}: header encoders disagree for length {triplet.length}"
+            raise BenchmarkMismatchError(msg)
+
+
+def _ns(statement: str, namespace: dict, number: int) -> float:
+    # best of 5 runs, the least noisy estimate of the per-call cost
+    return min(timeit.repeat(statement, globals=namespace, number=number, repeat=5)) / number * 1e9
+
+
+def bench_length(number: int = NUMBER) -> dict[str, dict[str, float]]:
+    # nanoseconds per header decode/encode for every length form, format strings vs precompiled Struct
+    check_length()
+    results = {}
+    for name, bytestring in LENGTH_FORMS.items():
+        triplet = Triplet.from_bytes(bytestring)
+        namespace = {
+            "bytestring": bytestring,
+            "triplet": triplet,
+            "Triplet": Triplet,
+            "pack_header": pack_header,
+            "format_string_header": _format_string_header,
+            "format_string_bytes": _format_string_bytes,
+        }
+        results[name] = {
+            "decode_format_string": _ns("format_string_header(bytestring)", namespace, number),
+            "decode_struct": _ns("Triplet.read_header(bytestring)", namespace, number),
+            "encode_format_string": _ns("format_string_bytes(0x81, triplet.length)", namespace, number),
+            "encode_struct": _ns("pack_header(0x81, triplet.length)", namespace, number),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    for name, result in bench_length().items():
+        logger.info(
+            "%-5s decode: %6.1f -> %6.1f ns, encode: %6.1f -> %6.1f ns",
+            name,
+            result["decode_format_string"],
+            result["decode_struct"],
+            result["encode_format_string"],
+            result["encode_struct"],
+        )
@@ -0,0 +1,31 @@
+import logging
+import os
+import time
+
+from benchmarks.corpus import goose_pdu
+from pysn1.encoder import encode
+from pysn1.parallel import decode_parallel
+
+logging.basicConfig(format="", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FRAMES = 2_000
+
+
+def bench_parallel(frames: int = FRAMES) -> dict[int, float]:
+    # seconds to decode frames GOOSE PDUs into records, per number of workers
+    buffer = bytes(encode(goose_pdu())) * frames
+    result = {}
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        decode_parallel(buffer, workers=workers)
+        result[workers] = time.perf_counter() - start
+        workers *= 2
+    return result
+
+
+if __name__ == "__main__":
+    result = bench_parallel()
+    for workers, seconds in result.items():
+        logger.info("%2d workers: %6.2f s, %4.1fx", workers, seconds, result[1] / seconds)
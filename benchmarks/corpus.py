@@ -0,0 +1,117 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from pysn1.encoder import Constructed, Element, encode
+from pysn1.index import TlvIndex
+from pysn1.tree import Node, decode_tree
+from pysn1.triplet import Triplet
+
+GOOSE_ENTRIES = 100
+SV_ASDUS = 8
+SV_CHANNELS = 8
+NESTED_DEPTH = 64
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Corpus:
+    name: str
+    element: Element
+    data: bytes
+
+
+def goose_pdu(entries: int = GOOSE_ENTRIES) -> Element:
+    # IEC 61850-8-1 goosePdu with a dataset of BOOLEAN/BIT STRING/INTEGER entries
+    dataset = []
+    for index in range(entries):
+        dataset.append(Triplet.build(tag=0x83, value=bytes((index & 1,))))
+        dataset.append(Triplet.build(tag=0x84, value=b"\x03\x00\x00"))
+        dataset.append(Triplet.build(tag=0x85, value=index.to_bytes(2, "big")))
+    return Constructed(
+        tag=0x61,
+        children=(
+            Triplet.build(tag=0x80, value=b"IED1LD0/LLN0$GO$gcb01"),
+            Triplet.build(tag=0x81, value=b"\x07\xd0"),
+            Triplet.build(tag=0x82, value=b"IED1LD0/LLN0$Dataset1"),
+            Triplet.build(tag=0x83, value=b"IED1_GOOSE1"),
+            Triplet.build(tag=0x84, value=b"\x65\x00\x00\x00\x00\x00\x00\x0a"),
+            Triplet.build(tag=0x85, value=b"\x01"),
+            Triplet.build(tag=0x86, value=b"\x2a"),
+            Triplet.build(tag=0x87, value=b"\x00"),
+            Triplet.build(tag=0x88, value=b"\x01"),
+            Triplet.build(tag=0x89, value=b"\x00"),
+            Triplet.build(tag=0x8A, value=len(dataset).to_bytes(2, "big")),
+            Constructed(tag=0xAB, children=tuple(dataset)),
+        ),
+    )
+
+
+def sv_pdu(asdus: int = SV_ASDUS, channels: int = SV_CHANNELS) -> Element:
+    # IEC 61850-9-2 savPdu, every ASDU carries channels INT32 samples + quality
+    seq_data = b"".join(index.to_bytes(4, "big") + b"\x00\x00\x00\x00" for index in range(channels))
+    asdu = tuple(
+        Constructed(
+            tag=0x30,
+            children=(
+                Triplet.build(tag=0x80, value=b"MU0101"),
+                Triplet.build(tag=0x82, value=index.to_bytes(2, "big")),
+                Triplet.build(tag=0x83, value=b"\x00\x00\x00\x01"),
+                Triplet.build(tag=0x85, value=b"\x02"),
+                Triplet.build(tag=0x87, value=seq_data),
+            ),
+        )
+        for index in range(asdus)
+    )
+    return Constructed(
+        tag=0x60,
+        children=(Triplet.build(tag=0x80, value=bytes((asdus,))), Constructed(tag=0xA2, children=asdu)),
+    )
+
+
+def length_form(length: int) -> Element:
+    return Triplet.build(tag=0x04, value=b"\x01" * length)
+
+
+def nested(depth: int = NESTED_DEPTH) -> Element:
+    element: Element = Triplet.build(tag=0x02, value=b"\x01")
+    for _ in range(depth):
+        element = Constructed(tag=0x30, children=(Triplet.build(tag=0x02, value=b"\x01"), element))
+    return element
+
+
+def _corpus(name: str, element: Element) -> Corpus:
+    return Corpus(name=name, element=element, data=bytes(encode(element)))
+
+
+def build_corpora() -> tuple[Corpus, ...]:
+    return (
+        _corpus("goose", goose_pdu()),
+        _corpus("sv", sv_pdu()),
+        _corpus("length_short", length_form(0x7F)),
+        _corpus("length_0x81", length_form(0xFF)),
+        _corpus("length_0x82", length_form(0xFFFF)),
+        _corpus("length_0x83", length_form(0x10000)),
+        _corpus("length_0x84", length_form(0x1000000)),
+        _corpus("nested", nested()),
+    )
+
+
+def decode_all(data: bytes) -> int:
+    # decodes every element of the tree, returns how many were decoded
+    stack = [decode_tree(data)]
+    count = 0
+    while stack:
+        node: Node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    return count
+
+
+def encode_all(element: Element) -> int:
+    return len(encode(element))
+
+
+OPERATIONS: dict[str, Callable[[Corpus], int]] = {
+    "decode": lambda corpus: decode_all(corpus.data),
+    "encode": lambda corpus: encode_all(corpus.element),
+    "index": lambda corpus: len(TlvIndex.from_buffer(corpus.data)),
+}
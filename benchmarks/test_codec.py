@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from benchmarks import bench_length as bench_length_module
+from benchmarks.bench_length import LENGTH_FORMS, BenchmarkMismatchError, bench_length, check_length
+from benchmarks.corpus import OPERATIONS, Corpus, build_corpora
+from pysn1.debugger import Identifier
+from pysn1.triplet import Triplet, Validation, validation
+
+CORPORA = build_corpora()
+
+
+@pytest.mark.parametrize("corpus", CORPORA, ids=[corpus.name for corpus in CORPORA])
+@pytest.mark.parametrize("operation", sorted(OPERATIONS))
+def test_codec(benchmark: BenchmarkFixture, corpus: Corpus, operation: str) -> None:
+    benchmark.extra_info["bytes"] = len(corpus.data)
+    result = benchmark(OPERATIONS[operation], corpus)
+    assert result > 0
+
+
+def test_triplet_from_bytes(benchmark: BenchmarkFixture) -> None:
+    assert benchmark(Triplet.from_bytes, b"\x85\x02\x01\x00").length == 2  # noqa: PLR2004
+
+
+def test_identifier_from_int(benchmark: BenchmarkFixture) -> None:
+    assert benchmark(Identifier.from_int, 0xAB).constructed is True
+
+
+@pytest.mark.parametrize("level", [Validation.STRICT, Validation.TRUSTED])
+def test_triplet_validation(benchmark: BenchmarkFixture, level: Validation) -> None:
+    with validation(level):
+        assert benchmark(Triplet.from_bytes, b"\x85\x02\x01\x00").length == 2  # noqa: PLR2004
+
+
+
+def test_bench_length() -> None:
+    results = bench_length(number=100)
+    assert sorted(results) == sorted(LENGTH_FORMS)
+    assert all(timing > 0 for result in results.values() for timing in result.values())
+
+
+def test_bench_length_mismatch(monkeypatch: pytest.MonkeyPatch) -> None:
+    # the check must catch a codec that decodes a different header than Triplet.from_bytes
+    monkeypatch.setattr(bench_length_module, "_format_string_header", lambda _: (0, 0, 0))
+    with pytest.raises(BenchmarkMismatchError, match="Length form short: header decoders disagree"):
+        check_length()
@@ -1,17 +1,76 @@
+import argparse
 import logging
+import time
+from pathlib import Path
 
-from pysn1.debugger import Identifier
+from pysn1.debugger import Identifier, LazyDebug
+from pysn1.pcap import ETHERTYPE_GOOSE, CaptureReader
+from pysn1.tree import decode_tree, iter_dump
 from pysn1.triplet import Triplet
 
 logging.basicConfig(format="", level=logging.INFO)
 logger = logging.getLogger(__package__)
 
-identifier = Identifier.from_bytes(b"\x01")
-logger.info(str(identifier))
 
-t1 = Triplet(tag=1, length=1, value=b"\x01")
-t2 = Triplet.from_bytes(b"\x01\x01\x01")
+def demo() -> None:
+    identifier = Identifier.from_bytes(b"\x01")
+    logger.info(LazyDebug(identifier, str))
 
-logger.info(t1)
-logger.info(t2)
-logger.info(t1.debug())
+    t1 = Triplet(tag=1, length=1, value=b"\x01")
+    t2 = Triplet.from_bytes(b"\x01\x01\x01")
+
+    logger.info(t1)
+    logger.info(t2)
+    logger.info(LazyDebug(t1))
+
+
+def pcap(path: Path) -> None:
+    # decodes every element of every GOOSE/SV frame in the capture and reports the throughput
+    frames = goose = elements = errors = size = 0
+    start = time.perf_counter()
+    with CaptureReader(path) as reader:
+        for frame in reader:
+            frames += 1
+            goose += frame.ethertype == ETHERTYPE_GOOSE
+            size += len(frame.pdu)
+            try:
+                elements += sum(1 for _ in decode_tree(frame.pdu).walk())
+            except ValueError:
+                errors += 1
+    seconds = time.perf_counter() - start
+
+    logger.info(
+        "%s: %d frames (%d GOOSE, %d SV), %d elements, %d errors",
+        path, frames, goose, frames - goose, elements, errors,
+    )
+    logger.info("%.3f s, %.0f frames/s, %.2f MB/s", seconds, frames / seconds, size / seconds / 1e6)
+
+
+def dump(path: Path) -> None:
+    # annotated hexdump of a file of BER/DER encoded PDUs, streamed line by line
+    with path.open("rb") as file:
+        data = file.read()
+    for line in iter_dump(data):
+        logger.info(line)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m pysn1", description="Python ASN.1 implementation for IEC 61850")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("demo", help="decode and debug a few sample triplets (default)")
+    pcap_parser = subparsers.add_parser("pcap", help="print GOOSE/SV decode throughput for a pcap/pcapng capture")
+    pcap_parser.add_argument("path", type=Path)
+    dump_parser = subparsers.add_parser("dump", help="print an annotated hexdump of a file of encoded PDUs")
+    dump_parser.add_argument("path", type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == "pcap":
+        pcap(args.path)
+    elif args.command == "dump":
+        dump(args.path)
+    else:
+        demo()
+
+
+if __name__ == "__main__":
+    main()
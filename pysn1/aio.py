@@ -0,0 +1,83 @@
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+from pysn1.debugger import CONTINUATION_BIT, HIGH_TAG_NUMBER
+from pysn1.triplet import (
+    EXTENDED_LENGTH,
+    FOUR_EXTRA_BYTES,
+    Triplet,
+    TripletLengthTooBigError,
+    TripletMissingBytesError,
+    trusted_triplet,
+)
+
+
+async def _readexactly(reader: asyncio.StreamReader, size: int, what: str) -> bytes:
+    try:
+        return await reader.readexactly(size)
+    except asyncio.IncompleteReadError as error:
+        msg = f"Stream ended while reading the triplet {what} ({len(error.partial)} of {size} bytes)"
+        raise TripletMissingBytesError(msg) from error
+
+
+async def read_triplet(reader: asyncio.StreamReader, max_length: int | None = None) -> Triplet | None:
+    # reads exactly one triplet: tag, length, extended length, then readexactly(length) for the value
+    # returns None if the stream ends cleanly before a new triplet starts
+    # readexactly buffers the whole value whatever the reader limit, a peer can announce up to 4 GiB,
+    # max_length rejects such lengths (TripletLengthTooBigError) before any value byte is read
+    tag_bytes = await reader.read(1)
+    if not tag_bytes:
+        return None
+    tag = tag_bytes[0]
+    if tag & HIGH_TAG_NUMBER == HIGH_TAG_NUMBER:
+        while True:
+            octet = (await _readexactly(reader, 1, "tag"))[0]
+            tag = (tag << 8) | octet
+            if not octet & CONTINUATION_BIT:
+                break
+
+    length_byte = (await _readexactly(reader, 1, "length"))[0]
+    extended_length_string = b""
+    if length_byte > EXTENDED_LENGTH:
+        if length_byte - EXTENDED_LENGTH > FOUR_EXTRA_BYTES:
+            raise TripletLengthTooBigError
+        extended_length_string = await _readexactly(reader, length_byte - EXTENDED_LENGTH, "extended length")
+    length, _ = Triplet._find_length(length_byte, extended_length_string)  # noqa: SLF001
+    if max_length is not None and length > max_length:
+        msg = f"Triplet length is {length}, but the stream accepts at most {max_length} bytes"
+        raise TripletLengthTooBigError(msg)
+
+    value = await _readexactly(reader, length, "value")
+    return trusted_triplet(tag, length, value)
+
+
+class TripletStream:
+    # async iterator of triplets, the next triplet is only read when asked for, so a slow consumer
+    # leaves data in the StreamReader, which pauses the transport once its limit is reached (backpressure)
+
+    def __init__(self: "TripletStream", reader: asyncio.StreamReader, max_length: int | None = None) -> None:
+        self.reader = reader
+        self.max_length = max_length
+
+    def __aiter__(self: "TripletStream") -> AsyncIterator[Triplet]:
+        return self
+
+    async def __anext__(self: "TripletStream") -> Triplet:
+        triplet = await read_triplet(self.reader, self.max_length)
+        if triplet is None:
+            raise StopAsyncIteration
+        return triplet
+
+
+async def open_triplet_stream(
+        host: str | None = None,
+        port: int | str | None = None,
+        *,
+        max_length: int | None = None,
+        **kwargs: Any,  # noqa: ANN401
+) -> tuple[TripletStream, asyncio.StreamWriter]:
+    # kwargs go to asyncio.open_connection, e.g. limit= to bound the buffered bytes per connection
+    # (limit does not bound a single value, max_length does)
+    reader, writer = await asyncio.open_connection(host, port, **kwargs)
+    return TripletStream(reader, max_length), writer
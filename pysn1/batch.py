@@ -0,0 +1,261 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+except ImportError as error:  # pragma: no cover
+    msg = "pysn1.batch requires numpy, install it with: pip install pysn1[numpy]"
+    raise ImportError(msg) from error
+
+from pysn1.tree import Node
+from pysn1.triplet import Buffer
+
+SAV_PDU = 0x60
+SEQ_ASDU = 0xA2
+ASDU = 0x30
+SMP_CNT = 0x82
+SEQ_DATA = 0x87
+SMP_CNT_LENGTH = 2
+SAMPLE_LENGTH = 8  # INT32 value + 32 bits of quality
+QUALITY_OFFSET = 4
+UTC_TIME_LENGTH = 8  # seconds, 3 bytes of fraction, time quality
+NANOSECONDS = 10**9
+FRACTION_BITS = 24
+LEAP_SECONDS_KNOWN = 0x80
+CLOCK_FAILURE = 0x40
+CLOCK_NOT_SYNCHRONIZED = 0x20
+TIME_ACCURACY = 0x1F
+VALIDITY_GOOD = 0b00
+VALIDITY_INVALID = 0b01
+VALIDITY_RESERVED = 0b10
+VALIDITY_QUESTIONABLE = 0b11
+# IEC 61850-7-3 quality, in bit string order
+# validity is one 2-bit code spread over the first two bits, not two flags, see decode_validity
+QUALITY_BITS = (
+    "validity_high",
+    "validity_low",
+    "overflow",
+    "out_of_range",
+    "bad_reference",
+    "oscillatory",
+    "failure",
+    "old_data",
+    "inconsistent",
+    "inaccurate",
+    "source",
+    "test",
+    "operator_blocked",
+)
+
+
+class SvLayoutError(ValueError): ...
+
+
+class SvLayoutMismatchError(ValueError): ...
+
+
+class BatchValueError(ValueError): ...
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class SvLayout:
+    frame_size: int  # up to the end of savPdu, trailing padding is ignored
+    smp_cnt_offsets: tuple[int, ...]
+    seq_data_offsets: tuple[int, ...]
+    channels: int
+    header_positions: tuple[int, ...]
+    header_bytes: bytes
+
+    @classmethod
+    def from_frame(cls: type["SvLayout"], frame: Buffer, offset: int = 0) -> "SvLayout":
+        # offset is where savPdu starts, e.g. after the Ethernet header and APPID/length/reserved fields
+        view = memoryview(frame)
+        sav_pdu, end = Node.from_buffer(view, offset)
+        if sav_pdu.tag != SAV_PDU:
+            msg = f"Sampled Values frame starts with tag {sav_pdu.tag:#04x}, expected savPdu ({SAV_PDU:#04x})"
+            raise SvLayoutError(msg)
+
+        header_positions: list[int] = []
+        _headers(sav_pdu, header_positions)
+
+        smp_cnt_offsets: list[int] = []
+        seq_data_offsets: list[int] = []
+        channels: set[int] = set()
+        for asdu in _find(sav_pdu, SEQ_ASDU).children:
+            if asdu.tag != ASDU:
+                msg = f"Sampled Values seqASDU contains tag {asdu.tag:#04x}, expected ASDU ({ASDU:#04x})"
+                raise SvLayoutError(msg)
+            smp_cnt = _find(asdu, SMP_CNT)
+            seq_data = _find(asdu, SEQ_DATA)
+            if smp_cnt.triplet.length != SMP_CNT_LENGTH or seq_data.triplet.length % SAMPLE_LENGTH:
+                msg = f"Sampled Values ASDU at offset {asdu.offset} has a bad smpCnt or seqData length"
+                raise SvLayoutError(msg)
+            smp_cnt_offsets.append(smp_cnt.value_offset)
+            seq_data_offsets.append(seq_data.value_offset)
+            channels.add(seq_data.triplet.length // SAMPLE_LENGTH)
+        if len(channels) != 1:
+            msg = f"Sampled Values ASDUs must all have the same number of channels, got {sorted(channels)}"
+            raise SvLayoutError(msg)
+
+        return cls(
+            frame_size=end,
+            smp_cnt_offsets=tuple(smp_cnt_offsets),
+            seq_data_offsets=tuple(seq_data_offsets),
+            channels=channels.pop(),
+            header_positions=tuple(header_positions),
+            header_bytes=bytes(view[position] for position in header_positions),
+        )
+
+    @property
+    def asdus(self: "SvLayout") -> int:
+        return len(self.smp_cnt_offsets)
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class SvColumns:
+    # one row per frame, then one column per ASDU (and per channel for values/quality)
+    smp_cnt: npt.NDArray[np.uint16]
+    values: npt.NDArray[np.int32]
+    quality: npt.NDArray[np.uint32]
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class UtcTimes:
+    # one entry per UtcTime, the flags come from its time quality byte
+    time: npt.NDArray[np.datetime64]
+    leap_seconds_known: npt.NDArray[np.bool_]
+    clock_failure: npt.NDArray[np.bool_]
+    clock_not_synchronized: npt.NDArray[np.bool_]
+    accuracy: npt.NDArray[np.uint8]  # number of significant fraction bits, 31 if unspecified
+
+
+def _find(node: Node, tag: int) -> Node:
+    for child in node.children:
+        if child.tag == tag:
+            return child
+    msg = f"Sampled Values element at offset {node.offset} has no child with tag {tag:#04x}"
+    raise SvLayoutError(msg)
+
+
+def _headers(node: Node, positions: list[int]) -> None:
+    # every tag and length byte of the savPdu, used to check that all frames share the same layout
+    positions.extend(range(node.offset, node.value_offset))
+    for child in node.children:
+        _headers(child, positions)
+
+
+def decode_sv(
+        frames: Sequence[Buffer] | Buffer,
+        layout: SvLayout | None = None,
+        *,
+        offset: int = 0,
+        stride: int | None = None,
+) -> SvColumns:
+    # frames is either a sequence of frames, or one contiguous buffer with a frame every stride bytes
+    if isinstance(frames, bytes | bytearray | memoryview):
+        data: Buffer = frames
+        if layout is None:
+            layout = SvLayout.from_frame(memoryview(frames)[: stride or len(frames)], offset)
+        stride = stride or layout.frame_size
+    else:
+        if not frames:
+            msg = "Sampled Values batch is empty"
+            raise SvLayoutError(msg)
+        if layout is None:
+            layout = SvLayout.from_frame(frames[0], offset)
+        stride = len(frames[0])
+        for index, frame in enumerate(frames):
+            if len(frame) != stride or stride < layout.frame_size:
+                msg = f"Sampled Values frame {index} has {len(frame)} bytes, expected {max(stride, layout.frame_size)}"
+                raise SvLayoutMismatchError(msg)
+        data = b"".join(frames)
+
+    count = (len(data) - layout.frame_size) // stride + 1 if len(data) >= layout.frame_size else 0
+    raw = np.ndarray(shape=(count, layout.frame_size), dtype=np.uint8, buffer=data, strides=(stride, 1))
+    expected = np.frombuffer(layout.header_bytes, dtype=np.uint8)
+    mismatches = np.flatnonzero((raw[:, list(layout.header_positions)] != expected).any(axis=1))
+    if mismatches.size:
+        msg = f"Sampled Values frame {mismatches[0]} does not match the layout of the first frame"
+        raise SvLayoutMismatchError(msg)
+
+    def column(dtype: str, start: int, shape: tuple[int, ...], strides: tuple[int, ...]) -> npt.NDArray:
+        return np.ndarray(shape=shape, dtype=dtype, buffer=data, offset=start, strides=strides)
+
+    channels = layout.channels
+    smp_cnt = [column(">u2", start, (count,), (stride,)) for start in layout.smp_cnt_offsets]
+    sample = (stride, SAMPLE_LENGTH)
+    values = [column(">i4", start, (count, channels), sample) for start in layout.seq_data_offsets]
+    quality = [column(">u4", start + QUALITY_OFFSET, (count, channels), sample) for start in layout.seq_data_offsets]
+    return SvColumns(
+        smp_cnt=np.stack(smp_cnt, axis=1).astype(np.uint16),
+        values=np.stack(values, axis=1).astype(np.int32),
+        quality=np.stack(quality, axis=1).astype(np.uint32),
+    )
+
+
+def _records(values: Sequence[Buffer] | Buffer, size: int | None, offset: int, stride: int | None) -> npt.NDArray:
+    # (count, size) uint8 view over fixed-size values, either a sequence of values (size taken from the first)
+    # or one contiguous buffer with a value every stride bytes starting at offset
+    if isinstance(values, bytes | bytearray | memoryview):
+        if size is None:
+            msg = "Batch decoding a contiguous buffer needs the value size"
+            raise BatchValueError(msg)
+        stride = stride or size
+        available = len(values) - offset
+        count = (available - size) // stride + 1 if available >= size else 0
+        return np.ndarray(shape=(count, size), dtype=np.uint8, buffer=values, offset=offset, strides=(stride, 1))
+
+    if size is None:
+        size = len(values[0]) if values else 0
+    for index, value in enumerate(values):
+        if len(value) != size:
+            msg = f"Batch value {index} has {len(value)} bytes, expected {size}"
+            raise BatchValueError(msg)
+    return np.frombuffer(b"".join(values), dtype=np.uint8).reshape(len(values), size)
+
+
+def decode_utc_times(
+        times: Sequence[Buffer] | Buffer,
+        *,
+        offset: int = 0,
+        stride: int | None = None,
+) -> UtcTimes:
+    # times is a sequence of 8-byte UtcTime values (e.g. triplet values), or a buffer with one every stride bytes
+    raw = _records(times, UTC_TIME_LENGTH, offset, stride)
+    seconds = raw[:, :4].astype(np.int64) @ np.array((1 << 24, 1 << 16, 1 << 8, 1), dtype=np.int64)
+    fraction = raw[:, 4:7].astype(np.int64) @ np.array((1 << 16, 1 << 8, 1), dtype=np.int64)
+    nanoseconds = seconds * NANOSECONDS + (fraction * NANOSECONDS >> FRACTION_BITS)
+    quality = raw[:, 7]
+    return UtcTimes(
+        time=nanoseconds.astype("datetime64[ns]"),
+        leap_seconds_known=(quality & LEAP_SECONDS_KNOWN).astype(bool),
+        clock_failure=(quality & CLOCK_FAILURE).astype(bool),
+        clock_not_synchronized=(quality & CLOCK_NOT_SYNCHRONIZED).astype(bool),
+        accuracy=(quality & TIME_ACCURACY).astype(np.uint8),
+    )
+
+
+def decode_quality(
+        qualities: Sequence[Buffer] | Buffer,
+        *,
+        size: int | None = None,
+        offset: int = 0,
+        stride: int | None = None,
+) -> npt.NDArray[np.bool_]:
+    # BIT STRING values (unused-bits byte first) to a (count, bits) boolean matrix, bit 0 first,
+    # columns follow QUALITY_BITS for IEC 61850 quality; size is the value size when qualities is one buffer
+    raw = _records(qualities, size, offset, stride)
+    if not raw.size:
+        return np.zeros((len(raw), 0), dtype=bool)
+    unused = raw[:, 0]
+    if (unused != unused[0]).any():
+        msg = f"Bit string {np.flatnonzero(unused != unused[0])[0]} has a different number of unused bits"
+        raise BatchValueError(msg)
+    bits = (raw.shape[1] - 1) * 8 - int(unused[0])
+    return np.unpackbits(raw[:, 1:], axis=1)[:, :bits].astype(bool)
+
+
+def decode_validity(quality: npt.NDArray[np.bool_]) -> npt.NDArray[np.uint8]:
+    # validity code (VALIDITY_GOOD ... VALIDITY_QUESTIONABLE) of every row of a decode_quality matrix
+    return (quality[:, 0] * np.uint8(2) + quality[:, 1]).astype(np.uint8)
@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any, cast
+
+from pysn1.debugger import CONSTRUCTED_BIT, Identifier
+from pysn1.triplet import END_OF_CONTENTS, Buffer, Triplet, iter_spans
+
+CACHE_SIZE = 1024
+CACHE_BYTES = 1 << 20
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Subtree:
+    # a fully decoded element, immutable so it can be shared by every message containing the same bytes
+    # values are memoryviews into the cached (immutable) bytes, never into the decoded buffer
+    triplet: Triplet
+    children: tuple["Subtree", ...] = ()
+
+    @property
+    def tag(self: "Subtree") -> int:
+        return self.triplet.tag
+
+    @property
+    def identifier(self: "Subtree") -> Identifier:
+        return Identifier.from_int(self.triplet.tag)
+
+    @property
+    def value(self: "Subtree") -> bytes | memoryview:
+        return self.triplet.value
+
+    def __getitem__(self: "Subtree", index: int) -> "Subtree":
+        return self.children[index]
+
+    def __iter__(self: "Subtree") -> Iterator["Subtree"]:
+        return iter(self.children)
+
+    def __len__(self: "Subtree") -> int:
+        return len(self.children)
+
+
+class DecodeCache:
+    # LRU cache of decoded constructed elements, keyed by their raw bytes (tag, length and value)
+    # byte-identical substructures (e.g. unchanged MMS attributes, static name lists) are decoded once,
+    # a changed message only decodes the constructed elements that actually changed
+    # the element passed to tree() is copied once, the keys and values of everything inside it are read-only views
+    # into that copy, so nbytes is the size of the distinct copies still referenced by a cached entry
+    # bounded by both the number of entries (maxsize) and nbytes (maxbytes)
+
+    def __init__(self: "DecodeCache", maxsize: int = CACHE_SIZE, maxbytes: int = CACHE_BYTES) -> None:
+        if maxsize < 1 or maxbytes < 1:
+            msg = f"DecodeCache maxsize and maxbytes must be at least 1, got {maxsize} and {maxbytes}"
+            raise ValueError(msg)
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        # key -> (subtree, the copies its key and values point into)
+        self._entries: OrderedDict[memoryview, tuple[Subtree, tuple[bytes, ...]]] = OrderedDict()
+        # id of a copy -> [copy, number of entries retaining it]
+        self._copies: dict[int, list[Any]] = {}
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self: "DecodeCache") -> int:
+        return len(self._entries)
+
+    def __contains__(self: "DecodeCache", bytestring: bytes) -> bool:
+        return bytestring in self._entries
+
+    def stats(self: "DecodeCache") -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+        }
+
+    def clear(self: "DecodeCache") -> None:
+        self._entries.clear()
+        self._copies.clear()
+        self.nbytes = 0
+
+    def tree(self: "DecodeCache", buffer: Buffer, offset: int = 0) -> tuple[Subtree, int]:
+        # the element at offset, with every descendant decoded, and the offset right after it
+        view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+        _, end = Triplet.from_buffer(view, offset)
+        if not view[offset] & CONSTRUCTED_BIT:
+            # primitive elements are cheaper to decode than to look up
+            return Subtree(triplet=Triplet.from_bytes(bytes(view[offset:end]))), end
+        # the only copy, read-only views of bytes hash and compare like bytes
+        return self._lookup(memoryview(bytes(view[offset:end])))[0], end
+
+    def triplet(self: "DecodeCache", bytestring: bytes) -> Triplet:
+        # Triplet.from_bytes, shared with every earlier constructed triplet of the same bytes
+        return self.tree(bytestring)[0].triplet
+
+    def _lookup(self: "DecodeCache", key: memoryview) -> tuple[Subtree, tuple[bytes, ...]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = self._decode(key)
+        copies = entry[1]
+        if sum(len(copy) for copy in copies) <= self.maxbytes:
+            self._entries[key] = entry
+            self._retain(copies)
+            while len(self._entries) > self.maxsize or self.nbytes > self.maxbytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._release(evicted)
+                self.evictions += 1
+        return entry
+
+    def _decode(self: "DecodeCache", key: memoryview) -> tuple[Subtree, tuple[bytes, ...]]:
+        # only reached on a miss, children are looked up by slicing the key, not by copying it
+        triplet, _ = Triplet.from_buffer(key, 0)
+        start = len(key) - triplet.length - (len(END_OF_CONTENTS) if triplet.indefinite else 0)
+        root = cast("bytes", key.obj)  # the copy made by tree(), for the key and every slice of it
+        copies = {id(root): root}
+        children = []
+        for offset, value_start, child in iter_spans(key, start, start + triplet.length):
+            if key[offset] & CONSTRUCTED_BIT:
+                # the child ends where its value (and end-of-contents) does, whatever length form it was sent with
+                end = value_start + child.length + (len(END_OF_CONTENTS) if child.indefinite else 0)
+                subtree, child_copies = self._lookup(key[offset:end])
+                copies.update((id(copy), copy) for copy in child_copies)
+                children.append(subtree)
+            else:
+                children.append(Subtree(triplet=child))
+        return Subtree(triplet=triplet, children=tuple(children)), tuple(copies.values())
+
+    def _retain(self: "DecodeCache", copies: tuple[bytes, ...]) -> None:
+        for copy in copies:
+            retained = self._copies.get(id(copy))
+            if retained is None:
+                self._copies[id(copy)] = [copy, 1]
+                self.nbytes += len(copy)
+            else:
+                retained[1] += 1
+
+    def _release(self: "DecodeCache", copies: tuple[bytes, ...]) -> None:
+        for copy in copies:
+            retained = self._copies[id(copy)]
+            retained[1] -= 1
+            if not retained[1]:
+                del self._copies[id(copy)]
+                self.nbytes -= len(copy)
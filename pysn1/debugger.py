@@ -1,7 +1,24 @@
+from collections.abc import Callable
 from dataclasses import dataclass
 from enum import Enum
-from struct import pack, unpack
-from typing import Protocol
+from functools import lru_cache
+from struct import Struct
+from typing import Any, Protocol
+
+MAX_IDENTIFIER = 0xFF
+HIGH_TAG_NUMBER = 0x1F
+CONTINUATION_BIT = 0x80
+CONSTRUCTED_BIT = 0x20
+HIGH_TAG_CACHE_SIZE = 1024
+RENDER_CACHE_SIZE = 512
+
+UINT8 = Struct("!B")
+
+
+class IdentifierOutOfRangeError(ValueError): ...
+
+
+class IdentifierMissingBytesError(ValueError): ...
 
 
 class TypeProtocol(Protocol):
@@ -93,6 +110,16 @@ class ApplicationType(SpecificType):
     name: str = "APPLICATION"
 
 
+class UniversalType(SpecificType):
+    # universal tag numbers PrimitiveType does not know, e.g. from the high-tag-number form
+    name: str = "UNIVERSAL"
+
+
+class PrivateType(SpecificType):
+    # private tag numbers PrimitiveType does not know, private numbers are not universal types anyway
+    name: str = "PRIVATE"
+
+
 @dataclass(frozen=True, kw_only=True, slots=True)
 class Identifier:
 
@@ -102,32 +129,98 @@ class Identifier:
 
     @classmethod
     def from_int(cls: type["Identifier"], integer: int) -> "Identifier":
-        ref = IdentifierClass(integer >> 6)  # 0b1100_0000
+        # single-byte identifiers are interned, every call returns the same shared (frozen) instance
+        if 0 <= integer <= MAX_IDENTIFIER:
+            identifier = _IDENTIFIERS[integer]
+            if identifier is None:
+                msg = f"Identifier {integer:#04x} uses the high-tag-number form, but is missing bytes"
+                raise IdentifierMissingBytesError(msg)
+            return identifier
+        if integer > MAX_IDENTIFIER:
+            return cls.from_bytes(integer.to_bytes((integer.bit_length() + 7) // 8, "big"))
+        msg = f"Identifier must be positive, got {integer}"
+        raise IdentifierOutOfRangeError(msg)
+
+    @classmethod
+    def from_bytes(cls: type["Identifier"], bytestring: bytes) -> "Identifier":
+        if len(bytestring) == 1:
+            return cls.from_int(bytestring[0])
+        if not bytestring:
+            msg = "Identifier is missing bytes"
+            raise IdentifierMissingBytesError(msg)
+        return _decode_high_tag(bytes(bytestring))
+
+    @classmethod
+    def from_buffer(
+            cls: type["Identifier"],
+            buffer: bytes | bytearray | memoryview,
+            offset: int = 0,
+    ) -> tuple["Identifier", int]:
+        # returns the identifier at offset and the offset right after it
+        if offset >= len(buffer):
+            msg = f"Identifier at offset {offset} is missing bytes"
+            raise IdentifierMissingBytesError(msg)
+        if buffer[offset] & HIGH_TAG_NUMBER != HIGH_TAG_NUMBER:
+            return cls.from_int(buffer[offset]), offset + 1
+
+        end = offset + 1
+        while end < len(buffer) and buffer[end] & CONTINUATION_BIT:
+            end += 1
+        if end >= len(buffer):
+            msg = f"Identifier at offset {offset} uses the high-tag-number form, but is missing bytes"
+            raise IdentifierMissingBytesError(msg)
+        return _decode_high_tag(bytes(buffer[offset : end + 1])), end + 1
+
+    @classmethod
+    def _decode(cls: type["Identifier"], integer: int) -> "Identifier":
+        return cls._build(integer, integer & HIGH_TAG_NUMBER)
+
+    @classmethod
+    def _build(cls: type["Identifier"], leading: int, number: int) -> "Identifier":
+        ref = IdentifierClass(leading >> 6)  # 0b1100_0000
 
         # 0 for primitive, 1 for constructed
-        constructed = bool(integer >> 5 & 0b1)  # 0b0010_0000
+        constructed = bool(leading >> 5 & 0b1)  # 0b0010_0000
 
-        # 0b0001_1111
+        # 0b0001_1111, or the subsequent bytes for the high-tag-number form
         datatype: TypeProtocol
         match ref.value:
             case IdentifierClass.APPLICATION.value:
-                datatype = ApplicationType(value=integer & 0x1F)
+                datatype = ApplicationType(value=number)
             case IdentifierClass.CONTEXT.value:
-                datatype = ContextType(value=integer & 0x1F)
+                datatype = ContextType(value=number)
+            case _ if number in _PRIMITIVE_TYPES:
+                datatype = _PRIMITIVE_TYPES[number]
+            case IdentifierClass.PRIVATE.value:
+                datatype = PrivateType(value=number)
             case _:
-                datatype = PrimitiveType(integer & 0x1F)
+                datatype = UniversalType(value=number)
         return cls(reference=ref, constructed=constructed, datatype=datatype)
 
-    @classmethod
-    def from_bytes(cls: type["Identifier"], bytestring: bytes) -> "Identifier":
-        return cls.from_int(unpack("!B", bytestring)[0])
+    @property
+    def number(self: "Identifier") -> int:
+        return int(self.datatype)
 
-    def __int__(self: "Identifier") -> int:
+    @property
+    def high_tag(self: "Identifier") -> bool:
+        return self.number >= HIGH_TAG_NUMBER
+
+    def _leading(self: "Identifier") -> int:
         ref = int(self.reference)
         pc = int(self.constructed)
-        dt = int(self.datatype)
+        dt = HIGH_TAG_NUMBER if self.high_tag else self.number
         return (ref << 6) + (pc << 5) + dt
 
+    def __int__(self: "Identifier") -> int:
+        if self.high_tag:
+            return int.from_bytes(bytes(self), "big")
+        return self._leading()
+
+    def __len__(self: "Identifier") -> int:
+        if self.high_tag:
+            return 1 + len(_encode_tag_number(self.number))
+        return 1
+
     @property
     def integer(self: "Identifier") -> int:
         return int(self)
@@ -137,27 +230,120 @@ class Identifier:
         return not self.constructed
 
     def __bytes__(self: "Identifier") -> bytes:
-        return pack("!B", int(self))
+        if self.high_tag:
+            return UINT8.pack(self._leading()) + _encode_tag_number(self.number)
+        return UINT8.pack(self._leading())
 
     def __str__(self: "Identifier") -> str:
-        string = repr(self) + "\n"
-        string += self.reference.name.capitalize()
-        if self.constructed:
-            string = f"{string} [Constructed]"
-        string += ": "
-        if isinstance(self.datatype, SpecificType):
-            string += str(self.datatype.value)
-        else:
-            string += self.datatype.name.capitalize()
-            if self.constructed:
-                " " + str(self.datatype.value)
-        string += f"\nint: {int(self)}"
-        string += f"\nhex: {int(self):#x}"
-        string += f"\nbin: {int(self):#011_b}"
-
-        string += f"\nbyt: {bytes(self)!s:>7} [ASCII]"
-        in_bytes = hex(int(self)).replace("0x", "")
-        if len(in_bytes) == 1:
-            in_bytes = "0" + in_bytes
-        string += f"\nbyt: b'\\x{in_bytes}' [No-ASCII]"
-        return string
+        return _render_identifier(self)
+
+    @property
+    def label(self: "Identifier") -> str:
+        # one line, e.g. "Context 3" or "Universal Sequence_of [Constructed]"
+        return _label_identifier(self)
+
+
+class LazyDebug:
+    # renders obj only when str() is called, e.g. by logging once a record passes the level check,
+    # then keeps the string; render defaults to obj.debug() when there is one, str(obj) otherwise
+    __slots__ = ("_obj", "_render", "_string")
+
+    def __init__(self: "LazyDebug", obj: object, render: Callable[[Any], str] | None = None) -> None:
+        self._obj = obj
+        self._render = render
+        self._string: str | None = None
+
+    def __str__(self: "LazyDebug") -> str:
+        if self._string is None:
+            if self._render is not None:
+                self._string = self._render(self._obj)
+            else:
+                debug = getattr(self._obj, "debug", None)
+                self._string = debug() if callable(debug) else str(self._obj)
+        return self._string
+
+    def __repr__(self: "LazyDebug") -> str:
+        return f"LazyDebug({self._obj!r})"
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_identifier(identifier: Identifier) -> str:
+    # identifiers are interned and frozen, so every distinct one is only formatted once
+    string = repr(identifier) + "\n"
+    string += identifier.reference.name.capitalize()
+    if identifier.constructed:
+        string = f"{string} [Constructed]"
+    string += ": "
+    if isinstance(identifier.datatype, SpecificType):
+        string += str(identifier.datatype.value)
+    else:
+        string += identifier.datatype.name.capitalize()
+        if identifier.constructed:
+            " " + str(identifier.datatype.value)
+    string += f"\nint: {int(identifier)}"
+    string += f"\nhex: {int(identifier):#x}"
+    string += f"\nbin: {int(identifier):#011_b}"
+
+    string += f"\nbyt: {bytes(identifier)!s:>7} [ASCII]"
+    in_bytes = "".join(f"\\x{byte:02x}" for byte in bytes(identifier))
+    string += f"\nbyt: b'{in_bytes}' [No-ASCII]"
+    return string
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _label_identifier(identifier: Identifier) -> str:
+    if isinstance(identifier.datatype, SpecificType):
+        label = f"{identifier.reference.name.capitalize()} {identifier.datatype.value}"
+    else:
+        label = f"{identifier.reference.name.capitalize()} {identifier.datatype.name.capitalize()}"
+    if identifier.constructed:
+        label += " [Constructed]"
+    return label
+
+
+def _encode_tag_number(number: int) -> bytes:
+    # base-128, most significant group first, every byte but the last has the continuation bit set
+    encoded = bytearray((number & 0x7F,))
+    number >>= 7
+    while number:
+        encoded.append(CONTINUATION_BIT | (number & 0x7F))
+        number >>= 7
+    encoded.reverse()
+    return bytes(encoded)
+
+
+@lru_cache(maxsize=HIGH_TAG_CACHE_SIZE)
+def _decode_high_tag(bytestring: bytes) -> Identifier:
+    # frequently seen multi-byte tags are cached, so the base-128 loop only runs once per tag
+    if bytestring[0] & HIGH_TAG_NUMBER != HIGH_TAG_NUMBER:
+        msg = f"Identifier {bytestring!r} has {len(bytestring)} bytes, but does not use the high-tag-number form"
+        raise IdentifierOutOfRangeError(msg)
+    if bytestring[1] == CONTINUATION_BIT:
+        msg = f"Identifier {bytestring!r} tag number starts with a padding byte (0x80)"
+        raise IdentifierOutOfRangeError(msg)
+
+    number = 0
+    for index, octet in enumerate(bytestring[1:], 2):
+        number = (number << 7) | (octet & 0x7F)
+        if not octet & CONTINUATION_BIT:
+            if index != len(bytestring):
+                msg = f"Identifier {bytestring!r} has {len(bytestring) - index} extra bytes"
+                raise IdentifierOutOfRangeError(msg)
+            break
+    else:
+        msg = f"Identifier {bytestring!r} uses the high-tag-number form, but is missing bytes"
+        raise IdentifierMissingBytesError(msg)
+
+    if number < HIGH_TAG_NUMBER:
+        msg = f"Identifier {bytestring!r} uses the high-tag-number form for tag number {number} (< 31)"
+        raise IdentifierOutOfRangeError(msg)
+    return Identifier._build(bytestring[0], number)  # noqa: SLF001
+
+
+_PRIMITIVE_TYPES = {primitive.value: primitive for primitive in PrimitiveType}
+
+# high-tag-number leading bytes (0x1F, 0x3F, ...) are not complete identifiers on their own
+_IDENTIFIERS = tuple(
+    None if integer & HIGH_TAG_NUMBER == HIGH_TAG_NUMBER else Identifier._decode(integer)  # noqa: SLF001
+    for integer in range(MAX_IDENTIFIER + 1)
+)
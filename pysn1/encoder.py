@@ -0,0 +1,129 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+from typing import TypeAlias
+
+from pysn1.triplet import (
+    END_OF_CONTENTS,
+    INDEFINITE_LENGTH,
+    UINT8,
+    Triplet,
+    check_tag,
+    header_length,
+    pack_header_into,
+    tag_length,
+)
+
+
+class EncoderBufferTooSmallError(ValueError): ...
+
+
+class Encoding(Enum):
+    DER = 0  # definite lengths only, indefinite flags are ignored
+    BER = 1  # elements flagged indefinite are written with 0x80 and end-of-contents octets
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Constructed:
+    tag: int
+    children: tuple["Element", ...] = ()
+    indefinite: bool = False
+
+
+Element: TypeAlias = Constructed | Triplet
+Measure: TypeAlias = Callable[[Element, dict[int, int]], int]
+Write: TypeAlias = Callable[[Element, memoryview, int, dict[int, int]], int]
+
+
+def _measure(element: Element, sizes: dict[int, int]) -> int:
+    # returns the full encoded size of element, storing the value length of every constructed element by id
+    if isinstance(element, Triplet):
+        return header_length(element.tag, element.length) + element.length
+    length = sum(_measure(child, sizes) for child in element.children)
+    sizes[id(element)] = length
+    return header_length(element.tag, length) + length
+
+
+def _measure_ber(element: Element, sizes: dict[int, int]) -> int:
+    # same as _measure, but indefinite elements take tag + 0x80 + value + end-of-contents
+    if isinstance(element, Triplet):
+        length = element.length
+    else:
+        length = sum(_measure_ber(child, sizes) for child in element.children)
+        sizes[id(element)] = length
+    if element.indefinite:
+        return tag_length(element.tag) + 1 + length + len(END_OF_CONTENTS)
+    return header_length(element.tag, length) + length
+
+
+def _write(element: Element, view: memoryview, offset: int, sizes: dict[int, int]) -> int:
+    if isinstance(element, Triplet):
+        start = pack_header_into(view, offset, element.tag, element.length)
+        end = start + element.length
+        view[start:end] = element.value
+        return end
+    offset = pack_header_into(view, offset, element.tag, sizes[id(element)])
+    for child in element.children:
+        offset = _write(child, view, offset, sizes)
+    return offset
+
+
+def _write_ber(element: Element, view: memoryview, offset: int, sizes: dict[int, int]) -> int:
+    if not element.indefinite:
+        if isinstance(element, Triplet):
+            return _write(element, view, offset, sizes)
+        offset = pack_header_into(view, offset, element.tag, sizes[id(element)])
+    else:
+        check_tag(element.tag)
+        size = tag_length(element.tag)
+        view[offset : offset + size] = element.tag.to_bytes(size, "big")
+        UINT8.pack_into(view, offset + size, INDEFINITE_LENGTH)
+        offset += size + 1
+
+    if isinstance(element, Triplet):
+        view[offset : offset + element.length] = element.value
+        offset += element.length
+    else:
+        for child in element.children:
+            offset = _write_ber(child, view, offset, sizes)
+    if element.indefinite:
+        view[offset : offset + len(END_OF_CONTENTS)] = END_OF_CONTENTS
+        offset += len(END_OF_CONTENTS)
+    return offset
+
+
+def _encoder(encoding: Encoding) -> tuple[Measure, Write]:
+    # DER keeps the definite-length only functions, so the publish path never checks indefinite flags
+    if encoding is Encoding.DER:
+        return _measure, _write
+    return _measure_ber, _write_ber
+
+
+def encoded_size(element: Element, encoding: Encoding = Encoding.DER) -> int:
+    measure, _ = _encoder(encoding)
+    return measure(element, {})
+
+
+def encode_into(
+        element: Element,
+        buffer: bytearray | memoryview,
+        offset: int = 0,
+        encoding: Encoding = Encoding.DER,
+) -> int:
+    # sizes are computed once for the whole tree, then every byte is written exactly once, returns the end offset
+    measure, write = _encoder(encoding)
+    sizes: dict[int, int] = {}
+    size = measure(element, sizes)
+    view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+    if offset + size > len(view):
+        msg = f"Encoded element needs {size} bytes at offset {offset}, but buffer contains only {len(view)} bytes"
+        raise EncoderBufferTooSmallError(msg)
+    return write(element, view, offset, sizes)
+
+
+def encode(element: Element, encoding: Encoding = Encoding.DER) -> bytearray:
+    measure, write = _encoder(encoding)
+    sizes: dict[int, int] = {}
+    buffer = bytearray(measure(element, sizes))
+    write(element, memoryview(buffer), 0, sizes)
+    return buffer
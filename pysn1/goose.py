@@ -0,0 +1,216 @@
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from struct import Struct
+from typing import Any
+
+from pysn1.pcap import APDU_HEADER_LENGTH, ETHERTYPE_GOOSE, Frame
+from pysn1.triplet import Buffer, Triplet
+from pysn1.values import decode_data
+
+GOOSE_PDU = 0x61
+GOCB_REF = 0x80
+ST_NUM = 0x85
+SQ_NUM = 0x86
+CONF_REV = 0x88
+ALL_DATA = 0xAB
+APPID = Struct("!H")
+STATE_CACHE_SIZE = 256
+
+
+class GooseStateError(ValueError): ...
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class GooseState:
+    gocb_ref: bytes
+    st_num: int
+    sq_num: int
+    conf_rev: int
+    dataset: Any
+    changed: bool  # False when dataset was reused from an earlier PDU with the same stNum, confRev and allData
+
+
+class GooseFilter:
+    # drops GOOSE frames of unsubscribed control blocks by reading only the APPID and the gocbRef header/value,
+    # no Identifier or Triplet objects are created, so dropped frames cost two header reads and a dict lookup
+    # a subscription with gocb_ref None accepts every control block sent on that APPID (and takes precedence)
+
+    def __init__(self: "GooseFilter", subscriptions: Iterable[tuple[int, bytes | str | None]]) -> None:
+        # every subscription gets a counter index, APPID -> index (any gocbRef) or APPID -> {gocbRef: index}
+        self._subscriptions: dict[int, int | dict[bytes, int]] = {}
+        self._keys: list[tuple[int, bytes | None]] = []
+        for appid, gocb_ref in subscriptions:
+            reference = gocb_ref.encode("ascii") if isinstance(gocb_ref, str) else gocb_ref
+            if (appid, reference) in self._keys:
+                continue
+            self._keys.append((appid, reference))
+            if reference is None:
+                self._subscriptions[appid] = len(self._keys) - 1
+                continue
+            references = self._subscriptions.setdefault(appid, {})
+            if isinstance(references, dict):
+                references[bytes(reference)] = len(self._keys) - 1
+        self._hits = [0] * len(self._keys)
+        self.dropped_appid = 0
+        self.dropped_gocb_ref = 0
+        self.dropped_malformed = 0
+
+    @property
+    def hits(self: "GooseFilter") -> dict[tuple[int, bytes | None], int]:
+        # per subscription, (APPID, gocbRef or None) -> matched frames
+        return dict(zip(self._keys, self._hits, strict=True))
+
+    @property
+    def matched(self: "GooseFilter") -> int:
+        return sum(self._hits)
+
+    @property
+    def dropped(self: "GooseFilter") -> int:
+        return self.dropped_appid + self.dropped_gocb_ref + self.dropped_malformed
+
+    def stats(self: "GooseFilter") -> dict[str, int]:
+        return {
+            "matched": self.matched,
+            "dropped_appid": self.dropped_appid,
+            "dropped_gocb_ref": self.dropped_gocb_ref,
+            "dropped_malformed": self.dropped_malformed,
+        }
+
+    def _gocb_ref(self: "GooseFilter", payload: Buffer, start: int) -> bytes | None:
+        # the gocbRef value of the goosePdu at start, or None when the PDU does not start like one
+        try:
+            tag, _, value_start = Triplet.read_header(payload, start)
+            if tag != GOOSE_PDU:
+                return None
+            tag, length, value_start = Triplet.read_header(payload, value_start)
+        except ValueError:
+            return None
+        if tag != GOCB_REF or value_start + length > len(payload):
+            return None
+        # the only copy made, a few dozen bytes, so it can be looked up whatever the payload buffer is
+        return bytes(payload[value_start : value_start + length])
+
+    def match(self: "GooseFilter", payload: Buffer, offset: int = 0) -> bool:
+        # payload starts at the APPID (offset), followed by length, reserved 1/2 and the goosePdu
+        if len(payload) < offset + APDU_HEADER_LENGTH:
+            self.dropped_malformed += 1
+            return False
+        appid = APPID.unpack_from(payload, offset)[0]
+        subscription = self._subscriptions.get(appid)
+        if subscription is None:
+            self.dropped_appid += 1
+            return False
+        if isinstance(subscription, int):
+            self._hits[subscription] += 1
+            return True
+
+        gocb_ref = self._gocb_ref(payload, offset + APDU_HEADER_LENGTH)
+        if gocb_ref is None:
+            self.dropped_malformed += 1
+            return False
+        index = subscription.get(gocb_ref)
+        if index is None:
+            self.dropped_gocb_ref += 1
+            return False
+        self._hits[index] += 1
+        return True
+
+    def frames(self: "GooseFilter", frames: Iterable[Frame]) -> Iterator[Frame]:
+        # the subscribed GOOSE frames of e.g. a CaptureReader, SV frames are skipped without being counted
+        for frame in frames:
+            if frame.ethertype == ETHERTYPE_GOOSE and self.match(frame.payload):
+                yield frame
+
+
+class GooseStateCache:
+    # remembers the last decoded allData of every control block (gocbRef), LRU bounded to maxsize blocks
+    # a retransmission (same stNum and confRev) whose raw allData bytes are equal to the cached ones reuses the
+    # cached dataset, so only the goosePdu headers are read and allData is compared, not decoded
+    # decode turns the allData value into a dataset, by default a list of Python values (see pysn1.values)
+
+    def __init__(
+            self: "GooseStateCache",
+            maxsize: int = STATE_CACHE_SIZE,
+            decode: Callable[[memoryview], Any] = decode_data,
+    ) -> None:
+        if maxsize < 1:
+            msg = f"GooseStateCache maxsize must be at least 1, got {maxsize}"
+            raise ValueError(msg)
+        self.maxsize = maxsize
+        self._decode = decode
+        # gocbRef -> (stNum, confRev, raw allData, dataset)
+        self._entries: OrderedDict[bytes, tuple[int, int, bytes, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self: "GooseStateCache") -> int:
+        return len(self._entries)
+
+    def __contains__(self: "GooseStateCache", gocb_ref: bytes | str) -> bool:
+        return (gocb_ref.encode("ascii") if isinstance(gocb_ref, str) else gocb_ref) in self._entries
+
+    def stats(self: "GooseStateCache") -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries)}
+
+    def clear(self: "GooseStateCache") -> None:
+        self._entries.clear()
+
+    def update(self: "GooseStateCache", pdu: Buffer, offset: int = 0) -> GooseState:
+        # pdu holds the goosePdu (0x61) at offset, e.g. Frame.pdu or a payload with offset APDU_HEADER_LENGTH
+        view = memoryview(pdu)
+        tag, length, position = Triplet.read_header(view, offset)
+        if tag != GOOSE_PDU:
+            msg = f"Expected a goosePdu (0x61) at offset {offset}, got tag {tag:#x}"
+            raise GooseStateError(msg)
+        end = position + length
+        if end > len(view):
+            msg = f"goosePdu at offset {offset} needs {end - len(view)} more bytes"
+            raise GooseStateError(msg)
+
+        # only the headers are read, the few fields needed are sliced out of the view
+        fields: dict[int, memoryview] = {}
+        while position < end:
+            tag, length, value_start = Triplet.read_header(view, position)
+            position = value_start + length
+            if tag in (GOCB_REF, ST_NUM, SQ_NUM, CONF_REV, ALL_DATA):
+                fields[tag] = view[value_start:position]
+        if position != end:
+            msg = f"goosePdu at offset {offset} has a field overrunning it by {position - end} bytes"
+            raise GooseStateError(msg)
+        missing = [f"{tag:#x}" for tag in (GOCB_REF, ST_NUM, SQ_NUM, CONF_REV, ALL_DATA) if tag not in fields]
+        if missing:
+            msg = f"goosePdu at offset {offset} is missing fields {', '.join(missing)}"
+            raise GooseStateError(msg)
+
+        gocb_ref = bytes(fields[GOCB_REF])
+        st_num = int.from_bytes(fields[ST_NUM], "big")
+        sq_num = int.from_bytes(fields[SQ_NUM], "big")
+        conf_rev = int.from_bytes(fields[CONF_REV], "big")
+        all_data = fields[ALL_DATA]
+
+        entry = self._entries.get(gocb_ref)
+        if entry is not None and entry[0] == st_num and entry[1] == conf_rev and entry[2] == all_data:
+            self._entries.move_to_end(gocb_ref)
+            self.hits += 1
+            return GooseState(
+                gocb_ref=gocb_ref, st_num=st_num, sq_num=sq_num, conf_rev=conf_rev, dataset=entry[3], changed=False,
+            )
+
+        self.misses += 1
+        dataset = self._decode(all_data)
+        self._entries[gocb_ref] = (st_num, conf_rev, bytes(all_data), dataset)
+        self._entries.move_to_end(gocb_ref)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return GooseState(
+            gocb_ref=gocb_ref, st_num=st_num, sq_num=sq_num, conf_rev=conf_rev, dataset=dataset, changed=True,
+        )
+
+    def frames(self: "GooseStateCache", frames: Iterable[Frame]) -> Iterator[tuple[Frame, GooseState]]:
+        # every GOOSE frame of e.g. a CaptureReader (or GooseFilter.frames) with its state
+        for frame in frames:
+            if frame.ethertype == ETHERTYPE_GOOSE:
+                yield frame, self.update(frame.pdu)
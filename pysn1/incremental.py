@@ -0,0 +1,147 @@
+from enum import Enum
+
+from pysn1.debugger import CONTINUATION_BIT, HIGH_TAG_NUMBER
+from pysn1.triplet import (
+    EXTENDED_LENGTH,
+    FOUR_EXTRA_BYTES,
+    INDEFINITE_LENGTH,
+    Buffer,
+    Triplet,
+    TripletIndefiniteLengthError,
+    TripletLengthTooBigError,
+    TripletMissingBytesError,
+    trusted_triplet,
+)
+
+
+class DecoderState(Enum):
+    TAG = 0
+    TAG_CONTINUATION = 1
+    LENGTH = 2
+    EXTENDED_LENGTH = 3
+    VALUE = 4
+
+
+class IncrementalDecoder:
+    # push-style decoder, keeps a partial tag, extended length or value between feeds
+    # the value buffer grows as bytes arrive, a peer announcing a huge length does not allocate it up front,
+    # max_length rejects such lengths outright (TripletLengthTooBigError) before any value byte is buffered
+
+    def __init__(self: "IncrementalDecoder", max_length: int | None = None) -> None:
+        self.max_length = max_length
+        self._reset()
+
+    def _reset(self: "IncrementalDecoder") -> None:
+        self.state = DecoderState.TAG
+        self._tag = 0
+        self._length_byte = 0
+        self._extended_length = bytearray()
+        self._length = 0
+        self._value = bytearray()
+
+    @property
+    def pending(self: "IncrementalDecoder") -> bool:
+        # True while a triplet has been started but not completed
+        return self.state is not DecoderState.TAG
+
+    def _emit(self: "IncrementalDecoder") -> Triplet:
+        # the value buffer is handed over as a read-only memoryview, so large values are not copied again
+        triplet = trusted_triplet(self._tag, self._length, memoryview(self._value).toreadonly())
+        self._reset()
+        return triplet
+
+    def _start_value(self: "IncrementalDecoder", length: int) -> Triplet | None:
+        if self.max_length is not None and length > self.max_length:
+            self._reset()
+            msg = f"Triplet length is {length}, but the decoder accepts at most {self.max_length} bytes"
+            raise TripletLengthTooBigError(msg)
+        self._length = length
+        self._value = bytearray()
+        if not length:
+            return self._emit()
+        self.state = DecoderState.VALUE
+        return None
+
+    def _read_tag(self: "IncrementalDecoder", view: memoryview, position: int) -> tuple[int, Triplet | None]:
+        self._tag = view[position]
+        high_tag = self._tag & HIGH_TAG_NUMBER == HIGH_TAG_NUMBER
+        self.state = DecoderState.TAG_CONTINUATION if high_tag else DecoderState.LENGTH
+        return position + 1, None
+
+    def _read_tag_continuation(
+            self: "IncrementalDecoder",
+            view: memoryview,
+            position: int,
+    ) -> tuple[int, Triplet | None]:
+        octet = view[position]
+        self._tag = (self._tag << 8) | octet
+        if not octet & CONTINUATION_BIT:
+            self.state = DecoderState.LENGTH
+        return position + 1, None
+
+    def _read_length(self: "IncrementalDecoder", view: memoryview, position: int) -> tuple[int, Triplet | None]:
+        self._length_byte = view[position]
+        if self._length_byte < EXTENDED_LENGTH:
+            return position + 1, self._start_value(self._length_byte)
+        if self._length_byte == INDEFINITE_LENGTH:
+            self._reset()
+            msg = "Triplet uses the indefinite length form (0x80), which is not supported when streaming"
+            raise TripletIndefiniteLengthError(msg)
+        if self._length_byte - EXTENDED_LENGTH > FOUR_EXTRA_BYTES:
+            self._reset()
+            raise TripletLengthTooBigError
+        self.state = DecoderState.EXTENDED_LENGTH
+        return position + 1, None
+
+    def _read_extended_length(
+            self: "IncrementalDecoder",
+            view: memoryview,
+            position: int,
+    ) -> tuple[int, Triplet | None]:
+        needed = self._length_byte - EXTENDED_LENGTH - len(self._extended_length)
+        chunk = view[position : position + needed]
+        self._extended_length += chunk
+        if len(chunk) < needed:
+            return position + len(chunk), None
+        try:
+            length, _ = Triplet._find_length(self._length_byte, self._extended_length)  # noqa: SLF001
+        except ValueError:
+            self._reset()
+            raise
+        return position + len(chunk), self._start_value(length)
+
+    def _read_value(self: "IncrementalDecoder", view: memoryview, position: int) -> tuple[int, Triplet | None]:
+        chunk = view[position : position + self._length - len(self._value)]
+        self._value += chunk
+        if len(self._value) < self._length:
+            return position + len(chunk), None
+        return position + len(chunk), self._emit()
+
+    def feed(self: "IncrementalDecoder", data: Buffer) -> list[Triplet]:
+        # returns every triplet completed by data, in order
+        view = data if isinstance(data, memoryview) else memoryview(data)
+        triplets: list[Triplet] = []
+        position = 0
+        while position < len(view):
+            match self.state:
+                case DecoderState.TAG:
+                    position, triplet = self._read_tag(view, position)
+                case DecoderState.TAG_CONTINUATION:
+                    position, triplet = self._read_tag_continuation(view, position)
+                case DecoderState.LENGTH:
+                    position, triplet = self._read_length(view, position)
+                case DecoderState.EXTENDED_LENGTH:
+                    position, triplet = self._read_extended_length(view, position)
+                case DecoderState.VALUE:
+                    position, triplet = self._read_value(view, position)
+            if triplet is not None:
+                triplets.append(triplet)
+        return triplets
+
+    def close(self: "IncrementalDecoder") -> None:
+        # call at the end of the stream, raises if a triplet was left incomplete
+        if self.pending:
+            state = self.state
+            self._reset()
+            msg = f"Stream ended while decoding a triplet ({state.name.lower()})"
+            raise TripletMissingBytesError(msg)
@@ -0,0 +1,124 @@
+from array import array
+from collections.abc import Iterator
+
+from pysn1.debugger import CONSTRUCTED_BIT, Identifier
+from pysn1.tree import NodeNotFoundError
+from pysn1.triplet import (
+    END_OF_CONTENTS,
+    INDEFINITE_LENGTH,
+    Buffer,
+    Triplet,
+    TripletIndefiniteLengthError,
+    TripletMissingBytesError,
+    tag_length,
+    trusted_triplet,
+)
+
+
+class TlvIndex:
+    # a whole TLV tree as parallel array columns over one buffer, rows are in depth-first order
+    # Triplet/Identifier objects are only created for the rows that are asked for
+    __slots__ = ("buffer", "end", "header", "length", "offset", "parent", "tag")
+
+    def __init__(self: "TlvIndex", buffer: Buffer) -> None:
+        self.buffer = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+        self.tag = array("Q")
+        self.offset = array("I")  # where the tag starts
+        self.header = array("B")  # tag and length bytes, the value starts at offset + header
+        self.length = array("I")  # without the end-of-contents octets of indefinite-length rows
+        self.parent = array("i")  # -1 for top-level rows
+        self.end = array("I")  # first row after the subtree, children of row are in range(row + 1, end[row])
+
+    @classmethod
+    def from_buffer(cls: type["TlvIndex"], buffer: Buffer, start: int = 0, end: int | None = None) -> "TlvIndex":
+        # indexes every triplet in buffer[start:end], and everything inside the constructed ones
+        index = cls(buffer)
+        view = index.buffer
+        if end is None:
+            end = len(view)
+        elif end > len(view):
+            msg = f"Triplet buffer ends at {end}, but buffer contains only {len(view)} bytes"
+            raise TripletMissingBytesError(msg)
+
+        # (row, value end, element end) of the open constructed rows, the element end is past any end-of-contents
+        stack: list[tuple[int, int, int]] = []
+        offset = start
+        while offset < end or stack:
+            while stack and offset >= stack[-1][1]:
+                row, _, offset = stack.pop()
+                index.end[row] = len(index.tag)
+            if offset >= end:
+                break
+            limit = stack[-1][1] if stack else end
+            try:
+                tag, length, value_start = Triplet.read_header(view, offset)
+                value_end = element_end = value_start + length
+            except TripletIndefiniteLengthError:
+                # BER indefinite length, the value runs up to the matching end-of-contents octets (find_end_of_contents)
+                triplet, element_end = Triplet.from_buffer(view[:limit], offset)
+                tag, length = triplet.tag, triplet.length
+                value_end = element_end - len(END_OF_CONTENTS)
+                value_start = value_end - length
+            if element_end > limit:
+                msg = f"Triplet at offset {offset} ends at {element_end}, but its parent ends at {limit}"
+                raise TripletMissingBytesError(msg)
+
+            row = len(index.tag)
+            index.tag.append(tag)
+            index.offset.append(offset)
+            index.header.append(value_start - offset)
+            index.length.append(length)
+            index.parent.append(stack[-1][0] if stack else -1)
+            index.end.append(row + 1)
+            if view[offset] & CONSTRUCTED_BIT and length:
+                stack.append((row, value_end, element_end))
+                offset = value_start
+            else:
+                offset = element_end
+        return index
+
+    def __len__(self: "TlvIndex") -> int:
+        return len(self.tag)
+
+    @property
+    def nbytes(self: "TlvIndex") -> int:
+        # memory used by the columns, the buffer itself is shared and not counted
+        columns = (self.tag, self.offset, self.header, self.length, self.parent, self.end)
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def value_offset(self: "TlvIndex", row: int) -> int:
+        return self.offset[row] + self.header[row]
+
+    def value(self: "TlvIndex", row: int) -> memoryview:
+        start = self.offset[row] + self.header[row]
+        return self.buffer[start : start + self.length[row]]
+
+    def indefinite(self: "TlvIndex", row: int) -> bool:
+        # a definite length never starts with 0x80, so the length byte right after the tag tells the two forms apart
+        return self.buffer[self.offset[row] + tag_length(self.tag[row])] == INDEFINITE_LENGTH
+
+    def triplet(self: "TlvIndex", row: int) -> Triplet:
+        return trusted_triplet(self.tag[row], self.length[row], self.value(row), indefinite=self.indefinite(row))
+
+    def identifier(self: "TlvIndex", row: int) -> Identifier:
+        return Identifier.from_int(self.tag[row])
+
+    def roots(self: "TlvIndex") -> Iterator[int]:
+        row = 0
+        while row < len(self.tag):
+            yield row
+            row = self.end[row]
+
+    def children(self: "TlvIndex", row: int) -> Iterator[int]:
+        child = row + 1
+        while child < self.end[row]:
+            yield child
+            child = self.end[child]
+
+    def find(self: "TlvIndex", row: int, tag: int) -> int:
+        # first direct child of row with tag
+        for child in self.children(row):
+            if self.tag[child] == tag:
+                return child
+        msg = f"Row {row} has no child with tag {tag:#04x}"
+        raise NodeNotFoundError(msg)
@@ -0,0 +1,178 @@
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter_ns
+from typing import Any
+
+from pysn1.debugger import Identifier
+from pysn1.triplet import EXTENDED_LENGTH, INDEFINITE_LENGTH, Buffer, Triplet, tag_length
+
+HISTOGRAM_BUCKETS = 32  # powers of two, 1 ns to ~2 s, slower calls land in the last bucket
+# length byte extra bytes -> name, as in pysn1.triplet
+LENGTH_FORMS = ("NO_EXTRA_BYTES", "ONE_EXTRA_BYTE", "TWO_EXTRA_BYTES", "THREE_EXTRA_BYTES", "FOUR_EXTRA_BYTES")
+# the decoders that get wrapped while instrumentation is enabled
+INSTRUMENTED = (
+    (Triplet, "read_header"),  # used directly by goose, index, parallel and schema
+    (Triplet, "from_bytes"),
+    (Triplet, "from_buffer"),
+    (Identifier, "from_int"),
+    (Identifier, "from_bytes"),
+    (Identifier, "from_buffer"),
+)
+
+
+class Metrics:
+    # counters and latency histograms, only updated by the wrappers installed by enable(), under _LOCK
+    __slots__ = ("errors", "identifiers", "latency", "length_forms", "tags")
+
+    def __init__(self: "Metrics") -> None:
+        self.tags: Counter[int] = Counter()
+        self.length_forms: Counter[str] = Counter()
+        self.identifiers: Counter[int] = Counter()
+        self.errors: Counter[str] = Counter()
+        # operation -> [calls, total ns, bucket counts...]
+        self.latency: dict[str, list[int]] = {}
+
+    def reset(self: "Metrics") -> None:
+        self.tags.clear()
+        self.length_forms.clear()
+        self.identifiers.clear()
+        self.errors.clear()
+        self.latency.clear()
+
+    def observe(self: "Metrics", operation: str, nanoseconds: int) -> None:
+        histogram = self.latency.get(operation)
+        if histogram is None:
+            histogram = self.latency[operation] = [0] * (HISTOGRAM_BUCKETS + 2)
+        histogram[0] += 1
+        histogram[1] += nanoseconds
+        histogram[2 + min(nanoseconds.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def snapshot(self: "Metrics") -> dict[str, Any]:
+        # plain, JSON-serializable copy, tags as "0x.." strings and histogram buckets keyed by their upper bound in ns
+        latency = {}
+        for operation, histogram in self.latency.items():
+            latency[operation] = {
+                "count": histogram[0],
+                "total_ns": histogram[1],
+                "buckets": {1 << index: count for index, count in enumerate(histogram[2:]) if count},
+            }
+        return {
+            "tags": {f"{tag:#04x}": count for tag, count in self.tags.most_common()},
+            "length_forms": dict(self.length_forms.most_common()),
+            "identifiers": {f"{tag:#04x}": count for tag, count in self.identifiers.most_common()},
+            "errors": dict(self.errors.most_common()),
+            "latency": latency,
+        }
+
+
+class _Depth(threading.local):
+    # nesting of instrumented calls in the current thread, only the outermost one is recorded
+    value = 0
+
+
+METRICS = Metrics()
+_DEPTH = _Depth()
+_LOCK = threading.Lock()
+_ORIGINALS: dict[tuple[type, str], Any] = {}
+
+
+def _length_form(buffer: Buffer, offset: int, tag: int) -> str:
+    # read from the encoded length byte, so non-minimal encodings (e.g. 0x83 for a length of 256) are counted as sent
+    length = buffer[offset + tag_length(tag)]
+    if length == INDEFINITE_LENGTH:
+        return "INDEFINITE_LENGTH"
+    return LENGTH_FORMS[length - EXTENDED_LENGTH if length > EXTENDED_LENGTH else 0]
+
+
+def _record(result: Any, args: tuple, kwargs: dict[str, Any]) -> None:  # noqa: ANN401
+    # read_header returns (tag, length, value start), from_buffer (decoded, end), the others the decoded object
+    if isinstance(result, tuple):
+        result = result[0]
+    if isinstance(result, Identifier):
+        METRICS.identifiers[int(result)] += 1
+        return
+    tag = result.tag if isinstance(result, Triplet) else result
+    METRICS.tags[tag] += 1
+    buffer = args[0] if args else kwargs.get("buffer", kwargs.get("bytestring", b""))
+    offset = args[1] if len(args) > 1 else kwargs.get("offset", 0)
+    METRICS.length_forms[_length_form(buffer, offset, tag)] += 1
+
+
+def _wrap(owner: type, name: str, original: Any) -> classmethod | staticmethod:  # noqa: ANN401
+    # nested decoder calls (e.g. from_bytes -> read_header) are timed and counted once, by the outermost
+    function = original.__func__
+    operation = f"{owner.__name__}.{name}"
+
+    @wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        if _DEPTH.value:
+            return function(*args, **kwargs)
+        _DEPTH.value += 1
+        start = perf_counter_ns()
+        try:
+            result = function(*args, **kwargs)
+        except Exception as error:
+            with _LOCK:
+                METRICS.errors[type(error).__name__] += 1
+                METRICS.observe(operation, perf_counter_ns() - start)
+            raise
+        finally:
+            _DEPTH.value -= 1
+        elapsed = perf_counter_ns() - start
+        # classmethods get the class first, it is not part of the decoder arguments
+        arguments = args if isinstance(original, staticmethod) else args[1:]
+        with _LOCK:
+            METRICS.observe(operation, elapsed)
+            _record(result, arguments, kwargs)
+        return result
+
+    if isinstance(original, staticmethod):
+        return staticmethod(wrapper)
+    return classmethod(wrapper)
+
+
+def is_enabled() -> bool:
+    return bool(_ORIGINALS)
+
+
+def enable() -> None:
+    # swaps the decoders for timed wrappers, disabled (the default) the decoders are the plain, unwrapped ones
+    if _ORIGINALS:
+        return
+    for owner, name in INSTRUMENTED:
+        original = vars(owner)[name]
+        _ORIGINALS[owner, name] = original
+        setattr(owner, name, _wrap(owner, name, original))
+
+
+def disable() -> None:
+    # restores the plain decoders, the metrics collected so far are kept until reset()
+    for (owner, name), original in _ORIGINALS.items():
+        setattr(owner, name, original)
+    _ORIGINALS.clear()
+
+
+def snapshot() -> dict[str, Any]:
+    with _LOCK:
+        return METRICS.snapshot()
+
+
+def reset() -> None:
+    with _LOCK:
+        METRICS.reset()
+
+
+@contextmanager
+def instrumented() -> Iterator[Metrics]:
+    # instrumentation for the duration of a with block, leaves it as it was found
+    was_enabled = is_enabled()
+    enable()
+    try:
+        yield METRICS
+    finally:
+        if not was_enabled:
+            disable()
+
@@ -0,0 +1,208 @@
+import mmap
+import os
+from array import array
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import cast
+
+from pysn1.pcap import CaptureReader
+from pysn1.tree import Node
+from pysn1.triplet import Buffer, Triplet, TripletIndefiniteLengthError
+
+CHUNKS_PER_WORKER = 4
+# typecode of every record column, in the order they are laid out in the shared memory block
+COLUMNS = (("frame", "I"), ("parent", "i"), ("tag", "Q"), ("offset", "Q"), ("value_offset", "Q"), ("length", "I"))
+STARTS = "Q"
+
+
+class ParallelDecodeError(ValueError): ...
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Records:
+    # one row per element, frames in order and the elements of each frame depth first
+    # parent is the row of the parent element relative to the start of its frame (-1 for the root),
+    # offset and value_offset are positions in the decoded buffer or capture file
+    frame: array
+    parent: array
+    tag: array
+    offset: array
+    value_offset: array
+    length: array
+    starts: array  # first row of every frame
+
+    @property
+    def frames(self: "Records") -> int:
+        return len(self.starts)
+
+    def rows(self: "Records", frame: int) -> range:
+        end = self.starts[frame + 1] if frame + 1 < len(self.starts) else len(self.frame)
+        return range(self.starts[frame], end)
+
+    def __len__(self: "Records") -> int:
+        return len(self.frame)
+
+
+def _buffer(memory: SharedMemory) -> memoryview:
+    return cast("memoryview", memory.buf)
+
+
+def _walk_frame(view: memoryview, index: int, offset: int, length: int, columns: dict[str, array]) -> str | None:
+    # returns the error message rather than raising, so no traceback keeps views into the shared memory alive
+    try:
+        root, _ = Node.from_buffer(view[: offset + length], offset)
+        stack = [(root, -1)]
+        start = len(columns["frame"])
+        while stack:
+            node, parent = stack.pop()
+            row = len(columns["frame"]) - start
+            columns["frame"].append(index)
+            columns["parent"].append(parent)
+            columns["tag"].append(node.tag)
+            columns["offset"].append(node.offset)
+            columns["value_offset"].append(node.value_offset)
+            columns["length"].append(node.triplet.length)
+            stack.extend((child, row) for child in reversed(node.children))
+    except ValueError as error:
+        return f"Frame {index} at offset {offset} failed to decode: {error}"
+    return None
+
+
+def _decode_chunk(source: str, shared: bool, first: int, table: bytes) -> tuple[str, int, int]:  # noqa: FBT001
+    # runs in a worker, decodes the frames in table and returns (shared memory name, rows, frames)
+    # source is attached rather than pickled, only the small frame table travels to the worker
+    frames = array("Q")
+    frames.frombytes(table)
+    columns = {name: array(typecode) for name, typecode in COLUMNS}
+    starts = array(STARTS)
+
+    if shared:
+        memory = SharedMemory(name=source)
+        view = _buffer(memory)
+    else:
+        with Path(source).open("rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapping)
+    msg = None
+    try:
+        for position in range(0, len(frames), 2):
+            starts.append(len(columns["frame"]))
+            msg = _walk_frame(view, first + position // 2, frames[position], frames[position + 1], columns)
+            if msg is not None:
+                break
+    finally:
+        view.release()
+        if shared:
+            memory.close()
+        else:
+            mapping.close()
+    if msg is not None:
+        raise ParallelDecodeError(msg)
+
+    size = sum(column.itemsize * len(column) for column in columns.values()) + starts.itemsize * len(starts)
+    output = SharedMemory(create=True, size=max(size, 1))
+    position = 0
+    for column in (*columns.values(), starts):
+        data = column.tobytes()
+        _buffer(output)[position : position + len(data)] = data
+        position += len(data)
+    name = output.name
+    output.close()
+    return name, len(columns["frame"]), len(starts)
+
+
+def _collect(results: list[tuple[str, int, int]]) -> Records:
+    # copies the records of every chunk, in frame order, then frees the shared memory blocks
+    columns = {name: array(typecode) for name, typecode in COLUMNS}
+    starts = array(STARTS)
+    for name, rows, frames in results:
+        memory = SharedMemory(name=name)
+        buffer = _buffer(memory)
+        try:
+            base = len(columns["frame"])
+            position = 0
+            for column in columns.values():
+                size = column.itemsize * rows
+                column.frombytes(buffer[position : position + size])
+                position += size
+            chunk_starts = array(STARTS)
+            chunk_starts.frombytes(buffer[position : position + chunk_starts.itemsize * frames])
+            starts.extend(start + base for start in chunk_starts)
+        finally:
+            buffer.release()
+            memory.close()
+            memory.unlink()
+    return Records(**columns, starts=starts)
+
+
+def _unlink(results: Iterable[tuple[str, int, int]]) -> None:
+    for name, _, _ in results:
+        memory = SharedMemory(name=name)
+        memory.close()
+        memory.unlink()
+
+
+def frame_table(buffer: Buffer) -> list[tuple[int, int]]:
+    # (offset, length) of every top-level triplet concatenated in buffer
+    table = []
+    offset = 0
+    while offset < len(buffer):
+        try:
+            _, length, value_start = Triplet.read_header(buffer, offset)
+            end = value_start + length
+        except TripletIndefiniteLengthError:
+            # BER indefinite length, the frame ends after its end-of-contents octets
+            _, end = Triplet.from_buffer(buffer, offset)
+        table.append((offset, end - offset))
+        offset = end
+    return table
+
+
+def decode_parallel(
+        source: Buffer | str | Path,
+        frames: Sequence[tuple[int, int]] | None = None,
+        *,
+        workers: int | None = None,
+        chunk_frames: int | None = None,
+) -> Records:
+    # source is a buffer of PDUs, or the path of a pcap/pcapng capture (its GOOSE and SV PDUs are decoded)
+    # frames are the (offset, length) of every PDU, by default every top-level triplet of the buffer
+    workers = workers or os.cpu_count() or 1
+    memory = None
+    if isinstance(source, str | Path):
+        name, shared = str(source), False
+        if frames is None:
+            with CaptureReader(source) as reader:
+                frames = [(frame.offset, len(frame.pdu)) for frame in reader]
+    else:
+        if frames is None:
+            frames = frame_table(source)
+        memory = SharedMemory(create=True, size=max(len(source), 1))
+        _buffer(memory)[: len(source)] = source
+        name, shared = memory.name, True
+
+    try:
+        chunk_frames = chunk_frames or max(1, -(-len(frames) // (workers * CHUNKS_PER_WORKER)))
+        firsts = range(0, len(frames), chunk_frames)
+        tables = [
+            array("Q", (value for frame in frames[first : first + chunk_frames] for value in frame)).tobytes()
+            for first in firsts
+        ]
+        chunks = list(zip(firsts, tables, strict=True))
+        if workers == 1:
+            return _collect([_decode_chunk(name, shared, first, table) for first, table in chunks])
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_decode_chunk, name, shared, first, table) for first, table in chunks]
+        try:
+            results = [future.result() for future in futures]
+        except ParallelDecodeError:
+            _unlink(future.result() for future in futures if future.exception() is None)
+            raise
+        return _collect(results)
+    finally:
+        if memory is not None:
+            memory.close()
+            memory.unlink()
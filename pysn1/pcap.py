@@ -0,0 +1,237 @@
+import mmap
+from collections.abc import Iterator
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from struct import Struct
+from types import TracebackType
+
+ETHERTYPE_GOOSE = 0x88B8
+ETHERTYPE_SV = 0x88BA
+ETHERTYPE_VLAN = 0x8100
+ETHERTYPE_QINQ = 0x88A8
+IEC61850_ETHERTYPES = frozenset((ETHERTYPE_GOOSE, ETHERTYPE_SV))
+LINKTYPE_ETHERNET = 1
+
+ETHERNET_HEADER_LENGTH = 14
+ETHERTYPE_OFFSET = 12
+VLAN_TAG_LENGTH = 4
+APDU_HEADER_LENGTH = 8  # APPID, length, reserved 1, reserved 2
+
+PCAP_MAGIC_MICRO = 0xA1B2C3D4
+PCAP_MAGIC_NANO = 0xA1B23C4D
+PCAPNG_SECTION_HEADER = 0x0A0D0D0A
+PCAPNG_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+PCAPNG_INTERFACE_DESCRIPTION = 0x00000001
+PCAPNG_SIMPLE_PACKET = 0x00000003
+PCAPNG_ENHANCED_PACKET = 0x00000006
+PCAPNG_OPTION_END = 0
+PCAPNG_OPTION_TSRESOL = 9
+PCAPNG_TSRESOL_POWER_OF_TWO = 0x80
+MICROSECONDS = 6
+NANOSECONDS = 9
+
+UINT16 = Struct("!H")
+APDU_HEADER = Struct("!HH")
+PCAP_HEADERS = {"<": Struct("<IHHiIII"), ">": Struct(">IHHiIII")}
+PCAP_RECORDS = {"<": Struct("<IIII"), ">": Struct(">IIII")}
+PCAPNG_BLOCKS = {"<": Struct("<II"), ">": Struct(">II")}
+PCAPNG_ENHANCED = {"<": Struct("<IIIII"), ">": Struct(">IIIII")}
+PCAPNG_INTERFACES = {"<": Struct("<HHI"), ">": Struct(">HHI")}
+PCAPNG_OPTIONS = {"<": Struct("<HH"), ">": Struct(">HH")}
+PCAPNG_UINT32 = {"<": Struct("<I"), ">": Struct(">I")}
+
+
+class PcapFormatError(ValueError): ...
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Frame:
+    # payload starts at APPID, pdu is the ASN.1 PDU after the 8-byte APDU header, both are views into the capture
+    # offset is where pdu starts in the capture file
+    index: int
+    timestamp_ns: int
+    offset: int
+    ethertype: int
+    appid: int
+    payload: memoryview
+    pdu: memoryview
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class _Interface:
+    linktype: int
+    snaplen: int
+    units_per_second: int
+
+
+def _ethernet(index: int, timestamp_ns: int, start: int, data: memoryview) -> Frame | None:
+    # skips VLAN tags, returns None for anything that is not a complete GOOSE/SV frame
+    offset = ETHERTYPE_OFFSET
+    if len(data) < ETHERNET_HEADER_LENGTH:
+        return None
+    ethertype = UINT16.unpack_from(data, offset)[0]
+    while ethertype in (ETHERTYPE_VLAN, ETHERTYPE_QINQ) and len(data) >= offset + VLAN_TAG_LENGTH + 2:
+        offset += VLAN_TAG_LENGTH
+        ethertype = UINT16.unpack_from(data, offset)[0]
+    if ethertype not in IEC61850_ETHERTYPES:
+        return None
+
+    payload = data[offset + 2 :]
+    if len(payload) < APDU_HEADER_LENGTH:
+        return None
+    appid, length = APDU_HEADER.unpack_from(payload)
+    if not APDU_HEADER_LENGTH <= length <= len(payload):
+        return None
+    return Frame(
+        index=index,
+        timestamp_ns=timestamp_ns,
+        offset=start + offset + 2 + APDU_HEADER_LENGTH,
+        ethertype=ethertype,
+        appid=appid,
+        payload=payload[:length],
+        pdu=payload[APDU_HEADER_LENGTH:length],
+    )
+
+
+class CaptureReader:
+    # memory-maps a pcap or pcapng capture, frames are memoryview slices of the mapping and are never copied
+
+    def __init__(self: "CaptureReader", path: str | Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as file:
+            try:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as error:
+                msg = f"Capture {self.path} is empty"
+                raise PcapFormatError(msg) from error
+        self._view = memoryview(self._mmap)
+
+    def __enter__(self: "CaptureReader") -> "CaptureReader":  # noqa: PYI034
+        return self
+
+    def __exit__(
+            self: "CaptureReader",
+            exc_type: type[BaseException] | None,
+            exc_value: BaseException | None,
+            traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self: "CaptureReader") -> None:
+        self._view.release()
+        # if frames are still referenced, the mapping is closed once the last view is garbage collected
+        with suppress(BufferError):
+            self._mmap.close()
+
+    def __len__(self: "CaptureReader") -> int:
+        return len(self._view)
+
+    def __iter__(self: "CaptureReader") -> Iterator[Frame]:
+        return self.frames()
+
+    def frames(self: "CaptureReader") -> Iterator[Frame]:
+        # yields GOOSE and SV frames only, index counts every packet in the capture
+        for index, timestamp_ns, start, data in self.packets():
+            frame = _ethernet(index, timestamp_ns, start, data)
+            if frame is not None:
+                yield frame
+
+    def packets(self: "CaptureReader") -> Iterator[tuple[int, int, int, memoryview]]:
+        # (index, timestamp in ns, offset in the capture, Ethernet frame) for every Ethernet packet
+        if len(self._view) < PCAPNG_BLOCKS["<"].size:
+            msg = f"Capture {self.path} is too short"
+            raise PcapFormatError(msg)
+        magic = PCAPNG_UINT32["<"].unpack_from(self._view)[0]
+        if magic == PCAPNG_SECTION_HEADER:
+            return self._pcapng_packets()
+        for endian in ("<", ">"):
+            magic = PCAPNG_UINT32[endian].unpack_from(self._view)[0]
+            if magic in (PCAP_MAGIC_MICRO, PCAP_MAGIC_NANO):
+                return self._pcap_packets(endian, NANOSECONDS if magic == PCAP_MAGIC_NANO else MICROSECONDS)
+        msg = f"Capture {self.path} is not a pcap or pcapng file (magic {magic:#010x})"
+        raise PcapFormatError(msg)
+
+    def _pcap_packets(
+            self: "CaptureReader",
+            endian: str,
+            digits: int,
+    ) -> Iterator[tuple[int, int, int, memoryview]]:
+        header = PCAP_HEADERS[endian]
+        record = PCAP_RECORDS[endian]
+        if len(self._view) < header.size:
+            msg = f"Capture {self.path} has a truncated pcap header"
+            raise PcapFormatError(msg)
+        linktype = header.unpack_from(self._view)[6]
+        if linktype != LINKTYPE_ETHERNET:
+            msg = f"Capture {self.path} has link type {linktype}, only Ethernet ({LINKTYPE_ETHERNET}) is supported"
+            raise PcapFormatError(msg)
+
+        scale = 10 ** (NANOSECONDS - digits)
+        offset = header.size
+        index = 0
+        while offset + record.size <= len(self._view):
+            seconds, fraction, captured, _ = record.unpack_from(self._view, offset)
+            start = offset + record.size
+            offset = start + captured
+            if offset > len(self._view):
+                msg = f"Capture {self.path} packet {index} is truncated"
+                raise PcapFormatError(msg)
+            yield index, seconds * 10**NANOSECONDS + fraction * scale, start, self._view[start:offset]
+            index += 1
+
+    def _pcapng_packets(self: "CaptureReader") -> Iterator[tuple[int, int, int, memoryview]]:
+        offset = 0
+        index = 0
+        endian = "<"
+        interfaces: list[_Interface] = []
+        while offset + PCAPNG_BLOCKS[endian].size <= len(self._view):
+            if PCAPNG_UINT32["<"].unpack_from(self._view, offset)[0] == PCAPNG_SECTION_HEADER:
+                # every section sets its own byte order and interfaces
+                byte_order = PCAPNG_UINT32["<"].unpack_from(self._view, offset + 8)[0]
+                endian = "<" if byte_order == PCAPNG_BYTE_ORDER_MAGIC else ">"
+                interfaces = []
+            block_type, block_length = PCAPNG_BLOCKS[endian].unpack_from(self._view, offset)
+            end = offset + block_length
+            if block_length < PCAPNG_BLOCKS[endian].size or end > len(self._view):
+                msg = f"Capture {self.path} has a truncated pcapng block at offset {offset}"
+                raise PcapFormatError(msg)
+            body_start = offset + PCAPNG_BLOCKS[endian].size
+            body = self._view[body_start : end - 4]
+
+            if block_type == PCAPNG_INTERFACE_DESCRIPTION:
+                interfaces.append(self._pcapng_interface(body, endian))
+            elif block_type == PCAPNG_ENHANCED_PACKET:
+                interface_id, high, low, captured, _ = PCAPNG_ENHANCED[endian].unpack_from(body)
+                interface = interfaces[interface_id]
+                if interface.linktype == LINKTYPE_ETHERNET:
+                    start = PCAPNG_ENHANCED[endian].size
+                    timestamp_ns = ((high << 32) | low) * 10**NANOSECONDS // interface.units_per_second
+                    yield index, timestamp_ns, body_start + start, body[start : start + captured]
+                index += 1
+            elif block_type == PCAPNG_SIMPLE_PACKET:
+                # simple packets always belong to the first interface and carry no timestamp
+                interface = interfaces[0]
+                original = PCAPNG_UINT32[endian].unpack_from(body)[0]
+                captured = min(original, interface.snaplen or original)
+                if interface.linktype == LINKTYPE_ETHERNET:
+                    yield index, 0, body_start + 4, body[4 : 4 + captured]
+                index += 1
+            offset = end
+
+    @staticmethod
+    def _pcapng_interface(body: memoryview, endian: str) -> _Interface:
+        linktype, _, snaplen = PCAPNG_INTERFACES[endian].unpack_from(body)
+        units_per_second = 10**MICROSECONDS
+        offset = PCAPNG_INTERFACES[endian].size
+        while offset + PCAPNG_OPTIONS[endian].size <= len(body):
+            code, length = PCAPNG_OPTIONS[endian].unpack_from(body, offset)
+            if code == PCAPNG_OPTION_END:
+                break
+            offset += PCAPNG_OPTIONS[endian].size
+            if code == PCAPNG_OPTION_TSRESOL and length:
+                resolution = body[offset]
+                base = 2 if resolution & PCAPNG_TSRESOL_POWER_OF_TWO else 10
+                units_per_second = base ** (resolution & ~PCAPNG_TSRESOL_POWER_OF_TWO)
+            offset += (length + 3) & ~3  # options are padded to 32 bits
+        return _Interface(linktype=linktype, snaplen=snaplen, units_per_second=units_per_second)
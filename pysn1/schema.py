@@ -0,0 +1,160 @@
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import itemgetter
+from struct import Struct, calcsize, error
+from typing import Any, TypeAlias
+
+from pysn1.triplet import Buffer, Triplet, header_length, iter_triplets, pack_header_into
+
+Decoded: TypeAlias = dict[str, Any]
+Decoder: TypeAlias = Callable[[Buffer, int], Decoded]
+INTEGER_FORMATS = "bBhHiIqQ"
+SCHEMA_CACHE_SIZE = 128
+
+
+class SchemaMismatchError(ValueError): ...
+
+
+class SchemaFormatError(ValueError): ...
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Field:
+    # format is a single struct code ("B", "H", "I", "?", "f", "21s", ...) for a primitive value,
+    # children describe the elements of a constructed value
+    name: str
+    tag: int
+    format: str = ""
+    children: tuple["Field", ...] = ()
+
+    def __post_init__(self: "Field") -> None:
+        # the compiled layout maps every primitive field to exactly one struct item
+        if self.constructed:
+            if self.format:
+                msg = f"Schema field {self.name!r} has children, its format {self.format!r} would be ignored"
+                raise SchemaFormatError(msg)
+            return
+        try:
+            items = len(Struct("!" + self.format).unpack(bytes(calcsize("!" + self.format))))
+        except error as exc:
+            msg = f"Schema field {self.name!r} has an invalid format {self.format!r}"
+            raise SchemaFormatError(msg) from exc
+        if items != 1:
+            msg = f"Schema field {self.name!r} format {self.format!r} unpacks to {items} values, expected 1"
+            raise SchemaFormatError(msg)
+
+    @property
+    def constructed(self: "Field") -> bool:
+        return bool(self.children)
+
+    def value_length(self: "Field") -> int:
+        if self.constructed:
+            return sum(child.encoded_length() for child in self.children)
+        return calcsize("!" + self.format)
+
+    def encoded_length(self: "Field") -> int:
+        length = self.value_length()
+        return header_length(self.tag, length) + length
+
+    def header(self: "Field") -> bytes:
+        length = self.value_length()
+        header = bytearray(header_length(self.tag, length))
+        pack_header_into(header, 0, self.tag, length)
+        return bytes(header)
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Schema:
+    tag: int
+    fields: tuple[Field, ...]
+    # compiled on first use, so decode() does not hash the whole nested schema on every call
+    _decoder: Decoder | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def root(self: "Schema") -> Field:
+        return Field(name="", tag=self.tag, children=self.fields)
+
+    def compile(self: "Schema") -> Decoder:
+        decoder = self._decoder
+        if decoder is None:
+            decoder = compile_schema(self)
+            object.__setattr__(self, "_decoder", decoder)
+        return decoder
+
+    def decode(self: "Schema", buffer: Buffer, offset: int = 0) -> Decoded:
+        return self.compile()(buffer, offset)
+
+
+def _flatten(field: Field, formats: list[str], headers: list[tuple[int, bytes]]) -> Callable[[tuple], Any]:
+    # appends the struct formats of field (header first, then value) and returns a builder for its decoded value
+    header = field.header()
+    headers.append((len(formats), header))
+    formats.append(f"{len(header)}s")
+    if not field.constructed:
+        formats.append(field.format)
+        return itemgetter(len(formats) - 1)
+
+    names = tuple(child.name for child in field.children)
+    builders = tuple(_flatten(child, formats, headers) for child in field.children)
+    return lambda values: {name: build(values) for name, build in zip(names, builders, strict=True)}
+
+
+def _convert(field: Field, value: memoryview) -> Any:  # noqa: ANN401
+    code = field.format[-1:]
+    if code == "s":
+        return bytes(value)
+    if code in INTEGER_FORMATS:
+        return int.from_bytes(value, "big", signed=code.islower())
+    if code == "?":
+        return any(value)
+    try:
+        return Struct("!" + field.format).unpack(value)[0]
+    except error as exc:
+        msg = f"Schema field {field.name!r} expects format {field.format!r}, got {len(value)} bytes"
+        raise SchemaMismatchError(msg) from exc
+
+
+def _decode_generic(field: Field, buffer: memoryview, offset: int) -> Any:  # noqa: ANN401
+    # the generic Triplet path, used when a frame does not match the precompiled layout
+    triplet, _ = Triplet.from_buffer(buffer, offset)
+    if triplet.tag != field.tag:
+        msg = f"Schema field {field.name!r} expects tag {field.tag:#04x}, got {triplet.tag:#04x}"
+        raise SchemaMismatchError(msg)
+    if not field.constructed:
+        return _convert(field, memoryview(triplet.value))
+
+    value = memoryview(triplet.value)
+    children = list(iter_triplets(value))
+    if len(children) != len(field.children):
+        msg = f"Schema field {field.name!r} expects {len(field.children)} elements, got {len(children)}"
+        raise SchemaMismatchError(msg)
+    return {
+        child.name: _decode_generic(child, value, offset)
+        for child, (offset, _) in zip(field.children, children, strict=True)
+    }
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def compile_schema(schema: Schema) -> Decoder:
+    root = schema.root
+    formats: list[str] = []
+    headers: list[tuple[int, bytes]] = []
+    build = _flatten(root, formats, headers)
+    compiled = Struct("!" + "".join(formats))
+    size = compiled.size
+    unpack_from = compiled.unpack_from
+    get_headers = itemgetter(*(index for index, _ in headers))
+    template: list[bytes | None] = [None] * len(formats)
+    for index, header in headers:
+        template[index] = header
+    expected = get_headers(template)
+
+    def decode(buffer: Buffer, offset: int = 0) -> Decoded:
+        if len(buffer) - offset >= size:
+            values = unpack_from(buffer, offset)
+            if get_headers(values) == expected:
+                return build(values)
+        return _decode_generic(root, memoryview(buffer), offset)
+
+    return decode
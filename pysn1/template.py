@@ -0,0 +1,116 @@
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, replace
+
+from pysn1.encoder import Constructed, Element, encode
+from pysn1.triplet import Buffer, Triplet, iter_triplets
+
+
+class TemplateFieldError(ValueError): ...
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class FieldLocation:
+    path: tuple[int, ...]
+    offset: int
+    length: int
+
+
+def _leaf(element: Element, path: tuple[int, ...]) -> Triplet:
+    for depth, index in enumerate(path):
+        if not isinstance(element, Constructed):
+            msg = f"Template field path {path} goes through a primitive element at depth {depth}"
+            raise TemplateFieldError(msg)
+        if not 0 <= index < len(element.children):
+            msg = f"Template field path {path} index {index} is out of range at depth {depth}"
+            raise TemplateFieldError(msg)
+        element = element.children[index]
+    if not isinstance(element, Triplet):
+        msg = f"Template field path {path} does not end in a primitive element"
+        raise TemplateFieldError(msg)
+    return element
+
+
+def _replace(element: Element, path: tuple[int, ...], value: Buffer) -> Element:
+    if not path:
+        return Triplet.build(tag=element.tag, value=bytes(value))
+    if not isinstance(element, Constructed):
+        msg = f"Template field path {path} goes through a primitive element"
+        raise TemplateFieldError(msg)
+    index = path[0]
+    children = list(element.children)
+    children[index] = _replace(children[index], path[1:], value)
+    return replace(element, children=tuple(children))
+
+
+class Template:
+    # encodes once, then patches the bytes of the chosen leaves in place while their length does not change
+
+    def __init__(self: "Template", element: Element, fields: Mapping[str, Sequence[int]]) -> None:
+        self._element = element
+        self._paths = {name: tuple(path) for name, path in fields.items()}
+        for path in self._paths.values():
+            _leaf(element, path)
+        self._values: dict[str, bytes] = {}
+        self._buffer = bytearray()
+        self._locations: dict[str, FieldLocation] = {}
+        self.reencodes = 0
+        self._encode()
+
+    def _encode(self: "Template") -> None:
+        for name, value in self._values.items():
+            self._element = _replace(self._element, self._paths[name], value)
+        self._values.clear()
+        self._buffer = encode(self._element)
+        self._locations = {name: self._locate(path) for name, path in self._paths.items()}
+
+    def _locate(self: "Template", path: tuple[int, ...]) -> FieldLocation:
+        # walks the encoded buffer along path, reading headers only
+        view = memoryview(self._buffer)
+        _, length, start = Triplet.read_header(view)
+        for index in path:
+            for position, (offset, _) in enumerate(iter_triplets(view, start, start + length)):
+                if position == index:
+                    _, length, start = Triplet.read_header(view, offset)
+                    break
+        return FieldLocation(path=path, offset=start, length=length)
+
+    def location(self: "Template", name: str) -> FieldLocation:
+        return self._locations[name]
+
+    def update(self: "Template", values: Mapping[str, Buffer]) -> bool:
+        # returns True if every value was patched in place, False if the frame had to be re-encoded
+        locations = [(self._locations[name], value) for name, value in values.items()]
+        if all(location.length == len(value) for location, value in locations):
+            for location, value in locations:
+                self._buffer[location.offset : location.offset + location.length] = value
+            self._values.update((name, bytes(value)) for name, value in values.items())
+            return True
+
+        self._values.update((name, bytes(value)) for name, value in values.items())
+        self._encode()
+        self.reencodes += 1
+        return False
+
+    def __setitem__(self: "Template", name: str, value: Buffer) -> None:
+        self.update({name: value})
+
+    def __getitem__(self: "Template", name: str) -> memoryview:
+        location = self._locations[name]
+        return memoryview(self._buffer)[location.offset : location.offset + location.length].toreadonly()
+
+    @property
+    def element(self: "Template") -> Element:
+        element = self._element
+        for name, value in self._values.items():
+            element = _replace(element, self._paths[name], value)
+        return element
+
+    @property
+    def frame(self: "Template") -> memoryview:
+        return memoryview(self._buffer).toreadonly()
+
+    def __bytes__(self: "Template") -> bytes:
+        return bytes(self._buffer)
+
+    def __len__(self: "Template") -> int:
+        return len(self._buffer)
@@ -0,0 +1,126 @@
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from pysn1.debugger import CONSTRUCTED_BIT, Identifier
+from pysn1.triplet import END_OF_CONTENTS, Buffer, Triplet, iter_spans, tag_length
+
+DUMP_WIDTH = 16
+DUMP_INDENT = "  "
+
+
+class NodeNotFoundError(KeyError): ...
+
+
+@dataclass(kw_only=True, slots=True)
+class Node:
+    triplet: Triplet
+    offset: int = 0
+    header: int | None = None  # tag and length bytes as decoded, None for hand-built nodes (shortest length form)
+    _children: tuple["Node", ...] | None = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_buffer(cls: type["Node"], buffer: Buffer, offset: int = 0) -> tuple["Node", int]:
+        triplet, end = Triplet.from_buffer(buffer, offset)
+        end_of_contents = len(END_OF_CONTENTS) if triplet.indefinite else 0
+        return cls(triplet=triplet, offset=offset, header=end - end_of_contents - triplet.length - offset), end
+
+    @property
+    def identifier(self: "Node") -> Identifier:
+        return Identifier.from_int(self.triplet.tag)
+
+    @property
+    def tag(self: "Node") -> int:
+        return self.triplet.tag
+
+    @property
+    def value(self: "Node") -> bytes | memoryview:
+        return self.triplet.value
+
+    @property
+    def value_offset(self: "Node") -> int:
+        # offsets are relative to the buffer the root node was decoded from
+        if self.header is not None:
+            return self.offset + self.header
+        end_of_contents = len(END_OF_CONTENTS) if self.triplet.indefinite else 0
+        return self.offset + len(self.triplet) - self.triplet.length - end_of_contents
+
+    @property
+    def expanded(self: "Node") -> bool:
+        return self._children is not None
+
+    @property
+    def children(self: "Node") -> tuple["Node", ...]:
+        # children are only decoded on first access, then cached
+        if self._children is None:
+            # read from the leading tag byte, like TlvIndex, so a tag without an Identifier cannot stop traversal
+            if (self.triplet.tag >> 8 * (tag_length(self.triplet.tag) - 1)) & CONSTRUCTED_BIT:
+                start = self.value_offset
+                self._children = tuple(
+                    Node(triplet=triplet, offset=start + offset, header=value_start - offset)
+                    for offset, value_start, triplet in iter_spans(self.triplet.value)
+                )
+            else:
+                self._children = ()
+        return self._children
+
+    def find(self: "Node", tag: int) -> "Node":
+        # first direct child with tag, without expanding the children of the children
+        for child in self.children:
+            if child.tag == tag:
+                return child
+        msg = f"Node has no child with tag {tag:#04x}"
+        raise NodeNotFoundError(msg)
+
+    def walk(self: "Node") -> Iterator["Node"]:
+        # this node and all its descendants, depth first, expanding every constructed node
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def __getitem__(self: "Node", index: int) -> "Node":
+        return self.children[index]
+
+    def __iter__(self: "Node") -> Iterator["Node"]:
+        return iter(self.children)
+
+
+def decode_tree(buffer: Buffer, offset: int = 0) -> Node:
+    return Node.from_buffer(buffer, offset)[0]
+
+
+def _label(tag: int) -> str:
+    try:
+        return Identifier.from_int(tag).label
+    except ValueError:
+        return f"Tag {tag:#x}"
+
+
+def _hexdump(view: Buffer, offset: int, indent: str, width: int) -> Iterator[str]:
+    for start in range(0, len(view), width):
+        chunk = view[start : start + width]
+        text = "".join(chr(byte) if 0x20 <= byte < 0x7F else "." for byte in chunk)  # noqa: PLR2004
+        yield f"{offset + start:08x}  {indent}{chunk.hex(' '):<{width * 3 - 1}}  |{text}|"
+
+
+def iter_dump(buffer: Buffer, offset: int = 0, *, width: int = DUMP_WIDTH) -> Iterator[str]:
+    # annotated hexdump of every triplet from offset to the end of buffer, one line at a time:
+    # a header line per element (offset, tag/length bytes, identifier), then the hexdump of every primitive value.
+    # only the path to the current element is kept, so dumping a huge PDU does not build the tree or one big string
+    view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+    stack = [iter_spans(view, offset)]
+    while stack:
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
+            continue
+        start, value_start, triplet = entry
+        indent = DUMP_INDENT * (len(stack) - 1)
+        length = "indefinite" if triplet.indefinite else f"{triplet.length} bytes"
+        yield f"{start:08x}  {indent}{view[start:value_start].hex(' ')}  {_label(triplet.tag)}, {length}"
+        if view[start] & CONSTRUCTED_BIT:
+            # children are read from the same buffer, so their offsets stay absolute
+            stack.append(iter_spans(view, value_start, value_start + triplet.length))
+        else:
+            yield from _hexdump(triplet.value, value_start, indent + DUMP_INDENT, width)
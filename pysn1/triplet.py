@@ -1,7 +1,15 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
-from struct import pack, unpack
+from enum import Enum
+from struct import Struct
+from typing import TypeAlias
+
+from pysn1.debugger import CONSTRUCTED_BIT, CONTINUATION_BIT, HIGH_TAG_NUMBER
 
 EXTENDED_LENGTH = 0x80
+INDEFINITE_LENGTH = 0x80  # BER only, the value is terminated by the end-of-contents octets
+END_OF_CONTENTS = b"\x00\x00"
 MAX_EXTENDED_LENGTH = 0x84
 EXTENDED_LENGTH_1 = 0xFF
 EXTENDED_LENGTH_2 = 0xFFFF
@@ -13,6 +21,19 @@ TWO_EXTRA_BYTES = 2
 THREE_EXTRA_BYTES = 3
 FOUR_EXTRA_BYTES = 4
 
+Buffer: TypeAlias = bytes | bytearray | memoryview
+
+MAX_SINGLE_BYTE_TAG = 0xFF
+
+UINT8 = Struct("!B")
+UINT16 = Struct("!H")
+UINT24 = Struct("!BH")  # 3-byte length, high byte + low 2 bytes
+UINT32 = Struct("!I")
+# length field (short form, then 0x81-0x84), indexed by the number of extra bytes
+LENGTH_STRUCTS = (Struct("!B"), Struct("!BB"), Struct("!BH"), Struct("!BBH"), Struct("!BI"))
+# single-byte tag + length field, indexed by the number of extra bytes
+HEADER_STRUCTS = (Struct("!BB"), Struct("!BBB"), Struct("!BBH"), Struct("!BBBH"), Struct("!BBI"))
+
 class TripletLengthTooBigError(ValueError):
 
     def __init__(
@@ -31,11 +52,28 @@ class TripletTooManyBytesError(ValueError): ...
 class TripletBadLengthError(ValueError): ...
 
 
+class TripletIndefiniteLengthError(TripletBadLengthError): ...
+
+
+class TripletBadTagError(ValueError): ...
+
+
+class Validation(Enum):
+    # how much Triplet.__post_init__ checking is repeated on paths that already checked the length
+    STRICT = "strict"  # every Triplet is checked, including the ones the decoders build
+    TRUSTED = "trusted"  # decoders (from_bytes, from_buffer, index, incremental, aio) skip the checks they already did
+    NONE = "none"  # Triplet.build skips the checks as well, length is len(value) by construction
+
+
+_VALIDATION = [Validation.TRUSTED]
+
+
 @dataclass(frozen=True, kw_only=True, slots=True)
 class Triplet:
     tag: int
     length: int
-    value: bytes = b""
+    value: bytes | memoryview = b""
+    indefinite: bool = False  # BER indefinite length form, value excludes the end-of-contents octets
 
     def __post_init__(self: "Triplet") -> None:
         if self.length > EXTENDED_LENGTH_4:
@@ -48,63 +86,59 @@ class Triplet:
             raise TripletTooManyBytesError(msg)
 
     def _extended_length(self: "Triplet") -> int:
-        if self.length < EXTENDED_LENGTH:
-            return NO_EXTRA_BYTES
-        if self.length <= EXTENDED_LENGTH_1:
-            return ONE_EXTRA_BYTE
-        if self.length <= EXTENDED_LENGTH_2:
-            return TWO_EXTRA_BYTES
-        if self.length <= EXTENDED_LENGTH_3:
-            return THREE_EXTRA_BYTES
-        if self.length <= EXTENDED_LENGTH_4:
-            return FOUR_EXTRA_BYTES
-        raise TripletLengthTooBigError
+        return extended_length(self.length)
+
+    def _tag_length(self: "Triplet") -> int:
+        return tag_length(self.tag)
 
     def __len__(self: "Triplet") -> int:
-        # tag field + len field + value field len + extended length
-        return 1 + 1 + len(self.value) + self._extended_length()
+        # tag field + len field + value field len + extended length (or end-of-contents)
+        if self.indefinite:
+            return self._tag_length() + 1 + len(self.value) + len(END_OF_CONTENTS)
+        return self._tag_length() + 1 + len(self.value) + self._extended_length()
 
     @classmethod
     def build(cls: type["Triplet"], tag: int, value: bytes) -> "Triplet":
+        check_tag(tag)
+        if _VALIDATION[0] is Validation.NONE:
+            return unchecked_triplet(tag, len(value), value)
         return cls(tag=tag, length=len(value), value=value)
 
+    def __hash__(self: "Triplet") -> int:
+        # memoryview values over writable buffers (bytearray, mmap) are not hashable, their content is
+        return hash((self.tag, self.length, bytes(self.value), self.indefinite))
+
     def __bytes__(self: "Triplet") -> bytes:
-        tag = pack("!B", self.tag)
-        extended_length = self._extended_length()
-        if extended_length == NO_EXTRA_BYTES:
-            length = pack("!B", self.length)
-        elif extended_length == ONE_EXTRA_BYTE:
-            length = b"\x81" + pack("!B", self.length)
-        elif extended_length == TWO_EXTRA_BYTES:
-            length = b"\x82" + pack("!H", self.length)
-        elif extended_length == THREE_EXTRA_BYTES:
-            length = b"\x83" + pack("!I", self.length)[1:4]
-        elif extended_length == FOUR_EXTRA_BYTES:
-            length = b"\x84" + pack("!I", self.length)
-        else:
-            raise TripletLengthTooBigError
-        return tag + length + self.value
+        if self.indefinite:
+            check_tag(self.tag)
+            tag = self.tag.to_bytes(self._tag_length(), "big")
+            return tag + UINT8.pack(INDEFINITE_LENGTH) + self.value + END_OF_CONTENTS
+        return pack_header(self.tag, self.length) + self.value
 
     @staticmethod
-    def _find_length(length: int, extended_length_string: bytes) -> tuple[int, int]:
-        extended_length = 0
-        if length > EXTENDED_LENGTH and not extended_length_string:
-            msg = "Triplet extended length is missing bytes"
-            raise TripletMissingBytesError(msg)
+    def _find_length(length: int, extended_length_string: Buffer, offset: int = 0) -> tuple[int, int]:
+        # extended_length_string is read from offset in place, without slicing
+        extended_length = NO_EXTRA_BYTES
+        if length > EXTENDED_LENGTH:
+            extended_length = length - EXTENDED_LENGTH
+            needed = extended_length if extended_length <= FOUR_EXTRA_BYTES else ONE_EXTRA_BYTE
+            if len(extended_length_string) < offset + needed:
+                msg = "Triplet extended length is missing bytes"
+                raise TripletMissingBytesError(msg)
 
         match length:
             case 0x81:
-                length = unpack("!B", extended_length_string[0:1])[0]
-                extended_length = ONE_EXTRA_BYTE
+                length = UINT8.unpack_from(extended_length_string, offset)[0]
             case 0x82:
-                length = unpack("!H", extended_length_string[0:2])[0]
-                extended_length = TWO_EXTRA_BYTES
+                length = UINT16.unpack_from(extended_length_string, offset)[0]
             case 0x83:
-                length = unpack("!I", b"\x00" + extended_length_string[0:3])[0]
-                extended_length = THREE_EXTRA_BYTES
+                high, low = UINT24.unpack_from(extended_length_string, offset)
+                length = (high << 16) | low
             case 0x84:
-                length = unpack("!I", extended_length_string[0:4])[0]
-                extended_length = FOUR_EXTRA_BYTES
+                length = UINT32.unpack_from(extended_length_string, offset)[0]
+            case 0x80:
+                msg = "Triplet uses the indefinite length form (0x80)"
+                raise TripletIndefiniteLengthError(msg)
             case _ if length > MAX_EXTENDED_LENGTH:
                 raise TripletLengthTooBigError
 
@@ -115,26 +149,305 @@ class Triplet:
 
     @classmethod
     def from_bytes(cls: type["Triplet"], bytestring: bytes) -> "Triplet":
-        tag = unpack("!B", bytestring[0:1])[0]
+        # value comes after tag (pos 0+) and length (pos 1) and extended_length (possibly pos 2+)
+        try:
+            tag, length, start = cls.read_header(bytestring)
+        except TripletIndefiniteLengthError:
+            triplet, _ = cls._from_indefinite(memoryview(bytestring), 0)
+            return trusted_triplet(triplet.tag, triplet.length, bytes(triplet.value), indefinite=True)
+        end = start + length
+        value = bytestring[start:end]
+
+        if length > len(value):
+            msg = f"Triplet length is {length}, but value contains only {len(value)} bytes"
+            raise TripletMissingBytesError(msg)
+
+        return trusted_triplet(tag, length, value)
+
+    @staticmethod
+    def read_header(buffer: Buffer, offset: int = 0) -> tuple[int, int, int]:
+        # tag (pos offset), length (pos offset + 1) and where the value starts
+        if offset + 2 > len(buffer):
+            msg = f"Triplet header at offset {offset} is missing bytes"
+            raise TripletMissingBytesError(msg)
+        tag = buffer[offset]
+        length = buffer[offset + 1]
+        if length < EXTENDED_LENGTH and tag & HIGH_TAG_NUMBER != HIGH_TAG_NUMBER:
+            # single-byte tag and short form length, the most common case
+            return tag, length, offset + 2
 
-        # length in pos 1, extended_length possibly in pos 2+
-        length, extended_length = cls._find_length(unpack("!B", bytestring[1:2])[0], bytestring[2:6])
+        position = offset + 1
+        if tag & HIGH_TAG_NUMBER == HIGH_TAG_NUMBER:
+            tag, position = _read_tag(buffer, offset)
+        length, extended_length = Triplet._find_length(buffer[position], buffer, position + 1)
+        return tag, length, position + 1 + extended_length
 
-        # value comes after tag (pos 0) and length (pos 1) and extended_length (possibly pos 2+)
-        start = 2 + extended_length
+    @classmethod
+    def from_buffer(cls: type["Triplet"], buffer: Buffer, offset: int = 0) -> tuple["Triplet", int]:
+        # value is a memoryview into buffer (zero-copy), end is the offset right after the triplet
+        view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+        try:
+            tag, length, start = cls.read_header(view, offset)
+        except TripletIndefiniteLengthError:
+            return cls._from_indefinite(view, offset)
         end = start + length
-        value = bytestring[start:end]
+        value = view[start:end]
 
         if length > len(value):
             msg = f"Triplet length is {length}, but value contains only {len(value)} bytes"
             raise TripletMissingBytesError(msg)
 
-        return Triplet(tag=tag, length=length, value=value)
+        return trusted_triplet(tag, length, value), end
+
+    @classmethod
+    def _from_indefinite(cls: type["Triplet"], view: memoryview, offset: int) -> tuple["Triplet", int]:
+        # BER indefinite length, only valid for constructed values, the children are not decoded
+        if not view[offset] & CONSTRUCTED_BIT:
+            msg = f"Triplet at offset {offset} is primitive, but uses the indefinite length form (0x80)"
+            raise TripletBadLengthError(msg)
+        tag, position = _read_tag(view, offset)
+        start = position + 1
+        end = find_end_of_contents(view, start)
+        triplet = trusted_triplet(tag, end - start, view[start:end], indefinite=True)
+        return triplet, end + len(END_OF_CONTENTS)
 
     def debug(self: "Triplet") -> str:
         string = repr(self) + "\n"
         string += f"{self.tag=:#04x}, {self.length=:#04x}\n"
-        string += f"{self.tag=}, {self.length=}: {self.value!r}\n"
+        string += f"{self.tag=}, {self.length=}: {bytes(self.value)!r}\n"
         string += f"{len(self)=}\n"
         string += f"{bytes(self)=}"
         return string
+
+
+# slot setters of the frozen dataclass, used to fill a Triplet without __init__ and __post_init__
+_NEW = object.__new__
+_SET_TAG, _SET_LENGTH, _SET_VALUE, _SET_INDEFINITE = (
+    vars(Triplet)[name].__set__ for name in ("tag", "length", "value", "indefinite")
+)
+
+
+def unchecked_triplet(tag: int, length: int, value: bytes | memoryview, *, indefinite: bool = False) -> Triplet:
+    # internal fast constructor, the caller guarantees length == len(value) <= EXTENDED_LENGTH_4
+    triplet = _NEW(Triplet)
+    _SET_TAG(triplet, tag)
+    _SET_LENGTH(triplet, length)
+    _SET_VALUE(triplet, value)
+    _SET_INDEFINITE(triplet, indefinite)
+    return triplet
+
+
+def trusted_triplet(tag: int, length: int, value: bytes | memoryview, *, indefinite: bool = False) -> Triplet:
+    # constructor of the decode paths, unchecked unless the validation level is STRICT
+    if _VALIDATION[0] is Validation.STRICT:
+        return Triplet(tag=tag, length=length, value=value, indefinite=indefinite)
+    return unchecked_triplet(tag, length, value, indefinite=indefinite)
+
+
+def get_validation() -> Validation:
+    return _VALIDATION[0]
+
+
+def set_validation(level: Validation | str) -> Validation:
+    # sets the process-wide validation level, returns the previous one
+    previous = _VALIDATION[0]
+    _VALIDATION[0] = Validation(level)
+    return previous
+
+
+@contextmanager
+def validation(level: Validation | str) -> Iterator[Validation]:
+    # validation level for the duration of a with block, e.g. STRICT while decoding untrusted test vectors
+    previous = set_validation(level)
+    try:
+        yield _VALIDATION[0]
+    finally:
+        set_validation(previous)
+
+
+def _read_tag(buffer: Buffer, offset: int) -> tuple[int, int]:
+    # returns the tag at offset and the position of the length byte right after it
+    tag = buffer[offset]
+    position = offset + 1
+    if tag & HIGH_TAG_NUMBER == HIGH_TAG_NUMBER:
+        # high-tag-number form, tag continues while the continuation bit is set
+        while True:
+            if position + 1 >= len(buffer):
+                msg = f"Triplet header at offset {offset} is missing bytes"
+                raise TripletMissingBytesError(msg)
+            octet = buffer[position]
+            tag = (tag << 8) | octet
+            position += 1
+            if not octet & CONTINUATION_BIT:
+                break
+    return tag, position
+
+
+def find_end_of_contents(buffer: Buffer, start: int = 0) -> int:
+    # offset of the end-of-contents octets closing the indefinite-length value that starts at start,
+    # one pass over the headers only: definite children are skipped whole, nested indefinite ones tracked by depth
+    depth = 1
+    position = start
+    size = len(buffer)
+    while position + 2 <= size:
+        tag = buffer[position]
+        if not tag:
+            if buffer[position + 1]:
+                msg = f"Triplet end-of-contents at offset {position} has a non-zero length"
+                raise TripletBadLengthError(msg)
+            depth -= 1
+            if not depth:
+                return position
+            position += len(END_OF_CONTENTS)
+            continue
+
+        _, position = _read_tag(buffer, position)
+        length = buffer[position]
+        position += 1
+        if length == INDEFINITE_LENGTH:
+            if not tag & CONSTRUCTED_BIT:
+                msg = f"Triplet at offset {position - 2} is primitive, but uses the indefinite length form (0x80)"
+                raise TripletBadLengthError(msg)
+            depth += 1
+        elif length < EXTENDED_LENGTH:
+            position += length
+        else:
+            length, extra = Triplet._find_length(length, buffer, position)  # noqa: SLF001
+            position += extra + length
+    msg = f"Triplet with indefinite length at offset {start} is missing the end-of-contents octets"
+    raise TripletMissingBytesError(msg)
+
+
+def extended_length(length: int) -> int:
+    if length < EXTENDED_LENGTH:
+        return NO_EXTRA_BYTES
+    if length <= EXTENDED_LENGTH_1:
+        return ONE_EXTRA_BYTE
+    if length <= EXTENDED_LENGTH_2:
+        return TWO_EXTRA_BYTES
+    if length <= EXTENDED_LENGTH_3:
+        return THREE_EXTRA_BYTES
+    if length <= EXTENDED_LENGTH_4:
+        return FOUR_EXTRA_BYTES
+    raise TripletLengthTooBigError
+
+
+def tag_length(tag: int) -> int:
+    # high-tag-number tags are stored as the integer of all their bytes
+    return max(1, (tag.bit_length() + 7) // 8)
+
+
+def check_tag(tag: int) -> None:
+    # a single byte with all five tag number bits set starts a high-tag-number tag, it cannot stand on its own
+    if tag <= MAX_SINGLE_BYTE_TAG:
+        if tag & HIGH_TAG_NUMBER == HIGH_TAG_NUMBER:
+            msg = f"Tag {tag:#04x} is only the leading byte of a high-tag-number tag, tag numbers >= 31 need more bytes"
+            raise TripletBadTagError(msg)
+        return
+    # multi-byte tags: leading byte in the high-tag-number form, continuation bit on every subsequent byte but the
+    # last, no 0x80 padding byte and a tag number >= 31 (lower numbers fit the leading byte)
+    octets = tag.to_bytes(tag_length(tag), "big")
+    if octets[0] & HIGH_TAG_NUMBER != HIGH_TAG_NUMBER:
+        msg = f"Tag {tag:#x} has {len(octets)} bytes, but does not use the high-tag-number form"
+        raise TripletBadTagError(msg)
+    if octets[1] == CONTINUATION_BIT:
+        msg = f"Tag {tag:#x} tag number starts with a padding byte (0x80)"
+        raise TripletBadTagError(msg)
+    if any(not octet & CONTINUATION_BIT for octet in octets[1:-1]) or octets[-1] & CONTINUATION_BIT:
+        msg = f"Tag {tag:#x} continuation bits must be set on every subsequent byte but the last"
+        raise TripletBadTagError(msg)
+    number = 0
+    for octet in octets[1:]:
+        number = (number << 7) | (octet & 0x7F)
+    if number < HIGH_TAG_NUMBER:
+        msg = f"Tag {tag:#x} uses the high-tag-number form for tag number {number} (< 31)"
+        raise TripletBadTagError(msg)
+
+
+def header_length(tag: int, length: int) -> int:
+    # tag field + len field + extended length
+    return tag_length(tag) + 1 + extended_length(length)
+
+
+def pack_header(tag: int, length: int) -> bytes:
+    extended = extended_length(length)
+    if tag > MAX_SINGLE_BYTE_TAG:
+        header = bytearray(tag_length(tag) + LENGTH_STRUCTS[extended].size)
+        pack_header_into(header, 0, tag, length)
+        return bytes(header)
+
+    # single-byte tag, tag and length are packed with one precompiled Struct
+    check_tag(tag)
+    if extended == NO_EXTRA_BYTES:
+        return HEADER_STRUCTS[extended].pack(tag, length)
+    if extended == THREE_EXTRA_BYTES:
+        return HEADER_STRUCTS[extended].pack(tag, EXTENDED_LENGTH | extended, length >> 16, length & EXTENDED_LENGTH_2)
+    return HEADER_STRUCTS[extended].pack(tag, EXTENDED_LENGTH | extended, length)
+
+
+def _pack_length_into(buffer: bytearray | memoryview, offset: int, length: int, extended: int) -> int:
+    length_struct = LENGTH_STRUCTS[extended]
+    if extended == NO_EXTRA_BYTES:
+        length_struct.pack_into(buffer, offset, length)
+    elif extended == THREE_EXTRA_BYTES:
+        length_struct.pack_into(buffer, offset, EXTENDED_LENGTH | extended, length >> 16, length & EXTENDED_LENGTH_2)
+    else:
+        length_struct.pack_into(buffer, offset, EXTENDED_LENGTH | extended, length)
+    return offset + length_struct.size
+
+
+def pack_header_into(buffer: bytearray | memoryview, offset: int, tag: int, length: int) -> int:
+    # writes tag and length (short or 0x81-0x84 form) at offset, returns where the value starts
+    extended = extended_length(length)
+    if tag > MAX_SINGLE_BYTE_TAG:
+        check_tag(tag)
+        size = tag_length(tag)
+        buffer[offset : offset + size] = tag.to_bytes(size, "big")
+        return _pack_length_into(buffer, offset + size, length, extended)
+
+    # single-byte tag, tag and length are written with one precompiled Struct
+    check_tag(tag)
+    header = HEADER_STRUCTS[extended]
+    if extended == NO_EXTRA_BYTES:
+        header.pack_into(buffer, offset, tag, length)
+    elif extended == THREE_EXTRA_BYTES:
+        header.pack_into(buffer, offset, tag, EXTENDED_LENGTH | extended, length >> 16, length & EXTENDED_LENGTH_2)
+    else:
+        header.pack_into(buffer, offset, tag, EXTENDED_LENGTH | extended, length)
+    return offset + header.size
+
+
+def iter_triplets(buffer: Buffer, start: int = 0, end: int | None = None) -> Iterator[tuple[int, Triplet]]:
+    # yields (offset, triplet) for every triplet concatenated in buffer[start:end], values are memoryviews
+    view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+    if end is None:
+        end = len(view)
+    elif end > len(view):
+        msg = f"Triplet buffer ends at {end}, but buffer contains only {len(view)} bytes"
+        raise TripletMissingBytesError(msg)
+    view = view[:end]
+
+    offset = start
+    while offset < end:
+        triplet, next_offset = Triplet.from_buffer(view, offset)
+        yield offset, triplet
+        offset = next_offset
+
+
+def iter_spans(buffer: Buffer, start: int = 0, end: int | None = None) -> Iterator[tuple[int, int, Triplet]]:
+    # like iter_triplets, but yields (offset, value start, triplet): the value start comes from the header as sent,
+    # len(triplet) assumes the shortest length form and is off for e.g. 0x83 00 01 00
+    view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+    if end is None:
+        end = len(view)
+    elif end > len(view):
+        msg = f"Triplet buffer ends at {end}, but buffer contains only {len(view)} bytes"
+        raise TripletMissingBytesError(msg)
+    view = view[:end]
+
+    offset = start
+    while offset < end:
+        triplet, next_offset = Triplet.from_buffer(view, offset)
+        end_of_contents = len(END_OF_CONTENTS) if triplet.indefinite else 0
+        yield offset, next_offset - triplet.length - end_of_contents, triplet
+        offset = next_offset
@@ -0,0 +1,320 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from struct import Struct
+from typing import Any, TypeAlias
+
+from pysn1.debugger import Identifier, PrimitiveType
+from pysn1.triplet import Buffer, Triplet, iter_triplets
+
+Writable: TypeAlias = bytearray | memoryview
+
+FLOAT32 = Struct("!f")
+FLOAT64 = Struct("!d")
+FLOAT32_EXPONENT = 8  # MMS FloatingPoint, exponent width byte then the IEEE 754 value
+FLOAT64_EXPONENT = 11
+MMS_FLOAT32 = Struct("!Bf")
+MMS_FLOAT64 = Struct("!Bd")
+UTC_TIME = Struct("!IBHB")  # seconds, fraction (high byte + low 2 bytes), quality
+UTC_TIME_LENGTH = 8
+FRACTION = 1 << 24
+NANOSECONDS = 10**9
+BOOLEAN_TRUE = 0xFF
+BITS = 8
+
+# IEC 61850-8-1 MMS Data context tags, as used in GOOSE allData and MMS reports
+MMS_BOOLEAN = 0x83
+MMS_BIT_STRING = 0x84
+MMS_INTEGER = 0x85
+MMS_UNSIGNED = 0x86
+MMS_FLOATING_POINT = 0x87
+MMS_OCTET_STRING = 0x89
+MMS_VISIBLE_STRING = 0x8A
+MMS_STRING = 0x90
+MMS_UTC_TIME = 0x91
+MMS_ARRAY = 0xA1
+MMS_STRUCTURE = 0xA2
+
+
+class ValueCodecError(ValueError): ...
+
+
+class ValueCodecNotFoundError(KeyError): ...
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class BitString:
+    # value holds the bits most significant first, without the unused trailing bits
+    value: int
+    length: int
+
+    def __getitem__(self: "BitString", index: int) -> bool:
+        # bit 0 is the first (most significant) bit, as numbered by IEC 61850
+        if not 0 <= index < self.length:
+            msg = f"Bit {index} is out of range for a bit string of {self.length} bits"
+            raise IndexError(msg)
+        return bool(self.value >> (self.length - 1 - index) & 1)
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class UtcTime:
+    # IEC 61850 UtcTime: seconds since the epoch, fraction of a second in 1/2**24 units and the time quality byte
+    seconds: int
+    fraction: int
+    quality: int = 0
+
+    @property
+    def nanoseconds(self: "UtcTime") -> int:
+        return self.seconds * NANOSECONDS + self.fraction * NANOSECONDS // FRACTION
+
+    def to_datetime(self: "UtcTime") -> datetime:
+        return datetime.fromtimestamp(self.seconds + self.fraction / FRACTION, tz=timezone.utc)
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Codec:
+    # decode reads a whole value, encode_into writes value at offset and returns the end, size is the value length
+    name: str
+    decode: Callable[[memoryview], Any]
+    encode_into: Callable[[Writable, int, Any], int]
+    size: Callable[[Any], int]
+
+
+def _check_length(name: str, view: memoryview, *lengths: int) -> None:
+    if len(view) not in lengths:
+        expected = " or ".join(str(length) for length in lengths)
+        msg = f"{name} value has {len(view)} bytes, expected {expected}"
+        raise ValueCodecError(msg)
+
+
+def _write_integer(buffer: Writable, offset: int, value: int, size: int) -> int:
+    # big endian, byte by byte from the end, so no bytes object is created for the value
+    end = offset + size
+    for position in range(end - 1, offset - 1, -1):
+        buffer[position] = value & 0xFF
+        value >>= BITS
+    return end
+
+
+def integer_size(value: int) -> int:
+    # minimal two's complement length, at least one byte
+    return (value + (value < 0)).bit_length() // BITS + 1
+
+
+def decode_integer(view: memoryview) -> int:
+    if not view:
+        msg = "INTEGER value is empty"
+        raise ValueCodecError(msg)
+    return int.from_bytes(view, "big", signed=True)
+
+
+def encode_integer_into(buffer: Writable, offset: int, value: int) -> int:
+    return _write_integer(buffer, offset, value, integer_size(value))
+
+
+def decode_unsigned(view: memoryview) -> int:
+    # encoded as INTEGER, so a leading zero byte is needed when the high bit is set
+    if not view:
+        msg = "Unsigned value is empty"
+        raise ValueCodecError(msg)
+    if view[0] & 0x80:
+        msg = f"Unsigned value starts with {view[0]:#04x}, which makes it negative"
+        raise ValueCodecError(msg)
+    return int.from_bytes(view, "big")
+
+
+def encode_unsigned_into(buffer: Writable, offset: int, value: int) -> int:
+    if value < 0:
+        msg = f"Unsigned value must be positive, got {value}"
+        raise ValueCodecError(msg)
+    return encode_integer_into(buffer, offset, value)
+
+
+def decode_boolean(view: memoryview) -> bool:
+    _check_length("BOOLEAN", view, 1)
+    return view[0] != 0
+
+
+def encode_boolean_into(buffer: Writable, offset: int, value: bool) -> int:  # noqa: FBT001
+    buffer[offset] = BOOLEAN_TRUE if value else 0
+    return offset + 1
+
+
+def decode_bit_string(view: memoryview) -> BitString:
+    # first byte is the number of unused bits in the last byte
+    if not view:
+        msg = "BIT STRING value is empty"
+        raise ValueCodecError(msg)
+    unused = view[0]
+    if unused >= BITS or (unused and len(view) == 1):
+        msg = f"BIT STRING has {unused} unused bits, but {len(view) - 1} bytes"
+        raise ValueCodecError(msg)
+    return BitString(value=int.from_bytes(view[1:], "big") >> unused, length=(len(view) - 1) * BITS - unused)
+
+
+def bit_string_size(value: BitString) -> int:
+    return 1 + (value.length + BITS - 1) // BITS
+
+
+def encode_bit_string_into(buffer: Writable, offset: int, value: BitString) -> int:
+    unused = -value.length % BITS
+    buffer[offset] = unused
+    return _write_integer(buffer, offset + 1, value.value << unused, bit_string_size(value) - 1)
+
+
+def decode_float(view: memoryview) -> float:
+    # MMS FloatingPoint (exponent width byte + IEEE 754), or a bare float32/float64
+    match len(view):
+        case MMS_FLOAT32.size if view[0] == FLOAT32_EXPONENT:
+            return MMS_FLOAT32.unpack_from(view)[1]
+        case MMS_FLOAT64.size if view[0] == FLOAT64_EXPONENT:
+            return MMS_FLOAT64.unpack_from(view)[1]
+        case FLOAT32.size:
+            return FLOAT32.unpack_from(view)[0]
+        case FLOAT64.size:
+            return FLOAT64.unpack_from(view)[0]
+    msg = f"Floating point value has {len(view)} bytes, expected 4 or 8 (+1 for the exponent width)"
+    raise ValueCodecError(msg)
+
+
+def encode_float32_into(buffer: Writable, offset: int, value: float) -> int:
+    MMS_FLOAT32.pack_into(buffer, offset, FLOAT32_EXPONENT, value)
+    return offset + MMS_FLOAT32.size
+
+
+def encode_float64_into(buffer: Writable, offset: int, value: float) -> int:
+    MMS_FLOAT64.pack_into(buffer, offset, FLOAT64_EXPONENT, value)
+    return offset + MMS_FLOAT64.size
+
+
+def decode_utc_time(view: memoryview) -> UtcTime:
+    _check_length("UtcTime", view, UTC_TIME_LENGTH)
+    seconds, high, low, quality = UTC_TIME.unpack_from(view)
+    return UtcTime(seconds=seconds, fraction=(high << 16) | low, quality=quality)
+
+
+def encode_utc_time_into(buffer: Writable, offset: int, value: UtcTime) -> int:
+    UTC_TIME.pack_into(buffer, offset, value.seconds, value.fraction >> 16, value.fraction & 0xFFFF, value.quality)
+    return offset + UTC_TIME_LENGTH
+
+
+def _write_bytes(buffer: Writable, offset: int, value: Buffer) -> int:
+    end = offset + len(value)
+    buffer[offset:end] = value
+    return end
+
+
+def encode_visible_string_into(buffer: Writable, offset: int, value: str) -> int:
+    return _write_bytes(buffer, offset, value.encode("ascii"))
+
+
+def encode_utf8_string_into(buffer: Writable, offset: int, value: str) -> int:
+    return _write_bytes(buffer, offset, value.encode())
+
+
+INTEGER = Codec(name="INTEGER", decode=decode_integer, encode_into=encode_integer_into, size=integer_size)
+UNSIGNED = Codec(name="Unsigned", decode=decode_unsigned, encode_into=encode_unsigned_into, size=integer_size)
+BOOLEAN = Codec(name="BOOLEAN", decode=decode_boolean, encode_into=encode_boolean_into, size=lambda _: 1)
+BIT_STRING = Codec(
+    name="BIT STRING",
+    decode=decode_bit_string,
+    encode_into=encode_bit_string_into,
+    size=bit_string_size,
+)
+FLOAT = Codec(
+    name="FloatingPoint",
+    decode=decode_float,
+    encode_into=encode_float32_into,
+    size=lambda _: MMS_FLOAT32.size,
+)
+DOUBLE = Codec(
+    name="FloatingPoint",
+    decode=decode_float,
+    encode_into=encode_float64_into,
+    size=lambda _: MMS_FLOAT64.size,
+)
+UTC = Codec(
+    name="UtcTime",
+    decode=decode_utc_time,
+    encode_into=encode_utc_time_into,
+    size=lambda _: UTC_TIME_LENGTH,
+)
+OCTET_STRING = Codec(name="OCTET STRING", decode=bytes, encode_into=_write_bytes, size=len)
+VISIBLE_STRING = Codec(
+    name="VisibleString",
+    decode=lambda view: str(view, "ascii"),
+    encode_into=encode_visible_string_into,
+    size=len,
+)
+UTF8_STRING = Codec(
+    name="UTF8String",
+    decode=lambda view: str(view, "utf-8"),
+    encode_into=encode_utf8_string_into,
+    size=lambda value: len(value.encode()),
+)
+
+UNIVERSAL_CODECS: dict[PrimitiveType, Codec] = {
+    PrimitiveType.BOOLEAN: BOOLEAN,
+    PrimitiveType.INTEGER: INTEGER,
+    PrimitiveType.BIT_STRING: BIT_STRING,
+    PrimitiveType.OCTET_STRING: OCTET_STRING,
+    PrimitiveType.ENUMERATED: INTEGER,
+    PrimitiveType.UTF8_STRING: UTF8_STRING,
+    PrimitiveType.VISIBLE_STRING: VISIBLE_STRING,
+}
+MMS_CODECS: dict[int, Codec] = {
+    MMS_BOOLEAN: BOOLEAN,
+    MMS_BIT_STRING: BIT_STRING,
+    MMS_INTEGER: INTEGER,
+    MMS_UNSIGNED: UNSIGNED,
+    MMS_FLOATING_POINT: FLOAT,
+    MMS_OCTET_STRING: OCTET_STRING,
+    MMS_VISIBLE_STRING: VISIBLE_STRING,
+    MMS_STRING: UTF8_STRING,
+    MMS_UTC_TIME: UTC,
+}
+
+
+def codec_for(tag: int) -> Codec:
+    # universal tags by PrimitiveType, context-specific tags as IEC 61850 MMS Data
+    codec = MMS_CODECS.get(tag)
+    if codec is not None:
+        return codec
+    identifier = Identifier.from_int(tag)
+    if identifier.primitive and isinstance(identifier.datatype, PrimitiveType):
+        codec = UNIVERSAL_CODECS.get(identifier.datatype)
+        if codec is not None:
+            return codec
+    msg = f"No value codec for tag {tag:#04x}"
+    raise ValueCodecNotFoundError(msg)
+
+
+def decode_value(triplet: Triplet) -> Any:  # noqa: ANN401
+    value = triplet.value
+    return codec_for(triplet.tag).decode(value if isinstance(value, memoryview) else memoryview(value))
+
+
+def build(tag: int, value: Any, codec: Codec | None = None) -> Triplet:  # noqa: ANN401
+    # encodes value with the codec of tag (or the given one) into a new triplet
+    codec = codec or codec_for(tag)
+    buffer = bytearray(codec.size(value))
+    codec.encode_into(buffer, 0, value)
+    return Triplet(tag=tag, length=len(buffer), value=bytes(buffer))
+
+
+def decode_data(view: memoryview) -> list[Any]:
+    # MMS Data sequence (e.g. GOOSE allData), arrays and structures become nested lists
+    # valid Data without a codec (generalized-time, binary-time, bcd, booleanArray, objId, ...) is kept as raw bytes
+    values: list[Any] = []
+    for _, triplet in iter_triplets(view):
+        value = triplet.value if isinstance(triplet.value, memoryview) else memoryview(triplet.value)
+        if triplet.tag in (MMS_ARRAY, MMS_STRUCTURE):
+            values.append(decode_data(value))
+            continue
+        try:
+            codec = codec_for(triplet.tag)
+        except ValueCodecNotFoundError:
+            values.append(bytes(value))
+        else:
+            values.append(codec.decode(value))
+    return values
@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from pysn1.aio import TripletStream, open_triplet_stream, read_triplet
+from pysn1.triplet import Triplet, TripletBadLengthError, TripletLengthTooBigError, TripletMissingBytesError
+
+STREAM = (
+    bytes(Triplet.build(tag=0x81, value=b"\x01"))
+    + bytes(Triplet.build(tag=0x82, value=b""))
+    + bytes(Triplet.build(tag=0xA0, value=b"\x02" * 0x100))
+    + bytes(Triplet.build(tag=0x9F22, value=b"\x03" * 0x80))
+)
+EXPECTED = [(0x81, b"\x01"), (0x82, b""), (0xA0, b"\x02" * 0x100), (0x9F22, b"\x03" * 0x80)]
+
+
+def _reader(*segments: bytes, eof: bool = True) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    for segment in segments:
+        reader.feed_data(segment)
+    if eof:
+        reader.feed_eof()
+    return reader
+
+
+async def _collect(reader: asyncio.StreamReader) -> list[tuple[int, bytes]]:
+    return [(triplet.tag, bytes(triplet.value)) async for triplet in TripletStream(reader)]
+
+
+class TestAio:
+    def test_stream(self: "TestAio") -> None:
+        async def run() -> list[tuple[int, bytes]]:
+            return await _collect(_reader(STREAM))
+
+        assert asyncio.run(run()) == EXPECTED
+
+    def test_stream_segments(self: "TestAio") -> None:
+        async def run() -> list[tuple[int, bytes]]:
+            reader = asyncio.StreamReader()
+
+            async def produce() -> None:
+                for start in range(0, len(STREAM), 3):
+                    reader.feed_data(STREAM[start : start + 3])
+                    await asyncio.sleep(0)
+                reader.feed_eof()
+
+            producer = asyncio.create_task(produce())
+            triplets = await _collect(reader)
+            await producer
+            return triplets
+
+        assert asyncio.run(run()) == EXPECTED
+
+    def test_read_triplet_eof(self: "TestAio") -> None:
+        async def run() -> Triplet | None:
+            return await read_triplet(_reader())
+
+        assert asyncio.run(run()) is None
+
+    def test_read_triplet_truncated(self: "TestAio") -> None:
+        async def run() -> Triplet | None:
+            return await read_triplet(_reader(b"\x81\x82\x01\x00\x01"))
+
+        with pytest.raises(TripletMissingBytesError) as exc_info:
+            asyncio.run(run())
+        assert exc_info.match(r"Stream ended while reading the triplet value \(1 of 256 bytes\)")
+
+    def test_read_triplet_bad_length(self: "TestAio") -> None:
+        async def run() -> Triplet | None:
+            return await read_triplet(_reader(b"\x81\x81\x01\x01"))
+
+        with pytest.raises(TripletBadLengthError):
+            asyncio.run(run())
+
+    def test_read_triplet_too_big(self: "TestAio") -> None:
+        async def run() -> Triplet | None:
+            return await read_triplet(_reader(b"\x81\x85"))
+
+        with pytest.raises(TripletLengthTooBigError):
+            asyncio.run(run())
+
+    def test_read_triplet_max_length(self: "TestAio") -> None:
+        async def run() -> Triplet | None:
+            return await read_triplet(_reader(b"\x81\x84\xff\xff\xff\xff", eof=False), 0x100)
+
+        with pytest.raises(TripletLengthTooBigError) as exc_info:
+            asyncio.run(run())
+        assert exc_info.match("Triplet length is 4294967295, but the stream accepts at most 256 bytes")
+
+    def test_stream_max_length(self: "TestAio") -> None:
+        async def run(max_length: int) -> list[tuple[int, bytes]]:
+            return [(triplet.tag, bytes(triplet.value)) async for triplet in TripletStream(_reader(STREAM), max_length)]
+
+        assert asyncio.run(run(0x100)) == EXPECTED
+        with pytest.raises(TripletLengthTooBigError, match="at most 255 bytes"):
+            asyncio.run(run(0xFF))
+
+    def test_open_triplet_stream(self: "TestAio") -> None:
+        async def run() -> list[tuple[int, bytes]]:
+            async def serve(_: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+                writer.write(STREAM)
+                await writer.drain()
+                writer.close()
+
+            server = await asyncio.start_server(serve, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                stream, writer = await open_triplet_stream("127.0.0.1", port)
+                triplets = await _collect(stream.reader)
+                writer.close()
+                await writer.wait_closed()
+            return triplets
+
+        assert asyncio.run(run()) == EXPECTED
+
+    def test_open_triplet_stream_max_length(self: "TestAio") -> None:
+        async def run() -> None:
+            async def serve(_: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+                writer.write(STREAM)
+                await writer.drain()
+                writer.close()
+
+            server = await asyncio.start_server(serve, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                stream, writer = await open_triplet_stream("127.0.0.1", port, max_length=0x80)
+                try:
+                    [triplet async for triplet in stream]
+                finally:
+                    writer.close()
+                    await writer.wait_closed()
+
+        with pytest.raises(TripletLengthTooBigError, match="at most 128 bytes"):
+            asyncio.run(run())
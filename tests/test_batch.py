@@ -0,0 +1,171 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pysn1.batch import (  # noqa: E402
+    QUALITY_BITS,
+    VALIDITY_GOOD,
+    VALIDITY_INVALID,
+    VALIDITY_QUESTIONABLE,
+    VALIDITY_RESERVED,
+    BatchValueError,
+    SvLayout,
+    SvLayoutError,
+    SvLayoutMismatchError,
+    decode_quality,
+    decode_sv,
+    decode_utc_times,
+    decode_validity,
+)
+from pysn1.encoder import Constructed, encode  # noqa: E402
+from pysn1.triplet import Triplet  # noqa: E402
+
+CHANNELS = 8
+APDU_HEADER = b"\x40\x00\x00\x00\x00\x00\x00\x00"  # APPID, length, reserved 1 and 2
+
+
+def _sample(smp_cnt: int, asdu: int) -> list[tuple[int, int]]:
+    return [((smp_cnt * 10 + channel) * (-1) ** channel + asdu, channel << 11) for channel in range(CHANNELS)]
+
+
+def _frame(smp_cnt: int, asdus: int = 1) -> bytes:
+    seq_asdu = tuple(
+        Constructed(
+            tag=0x30,
+            children=(
+                Triplet.build(tag=0x80, value=b"MU01"),
+                Triplet.build(tag=0x82, value=smp_cnt.to_bytes(2, "big")),
+                Triplet.build(tag=0x83, value=b"\x00\x00\x00\x01"),
+                Triplet.build(tag=0x85, value=b"\x02"),
+                Triplet.build(
+                    tag=0x87,
+                    value=b"".join(
+                        value.to_bytes(4, "big", signed=True) + quality.to_bytes(4, "big")
+                        for value, quality in _sample(smp_cnt, asdu)
+                    ),
+                ),
+            ),
+        )
+        for asdu in range(asdus)
+    )
+    sav_pdu = Constructed(
+        tag=0x60,
+        children=(Triplet.build(tag=0x80, value=bytes((asdus,))), Constructed(tag=0xA2, children=seq_asdu)),
+    )
+    return APDU_HEADER + bytes(encode(sav_pdu))
+
+
+class TestBatch:
+    def test_layout(self: "TestBatch") -> None:
+        layout = SvLayout.from_frame(_frame(0, asdus=2), offset=len(APDU_HEADER))
+        assert layout.asdus == 2  # noqa: PLR2004
+        assert layout.channels == CHANNELS
+        assert layout.frame_size == len(_frame(0, asdus=2))
+
+    def test_decode_sv_frames(self: "TestBatch") -> None:
+        frames = [_frame(smp_cnt) for smp_cnt in range(4000, 4010)]
+        columns = decode_sv(frames, offset=len(APDU_HEADER))
+        assert columns.smp_cnt.shape == (10, 1)
+        assert columns.smp_cnt[:, 0].tolist() == list(range(4000, 4010))
+        assert columns.values.shape == (10, 1, CHANNELS)
+        assert columns.values.dtype == np.int32
+        assert columns.values[3, 0].tolist() == [value for value, _ in _sample(4003, 0)]
+        assert columns.quality[3, 0].tolist() == [quality for _, quality in _sample(4003, 0)]
+
+    def test_decode_sv_asdus(self: "TestBatch") -> None:
+        frames = [_frame(smp_cnt, asdus=4) for smp_cnt in range(3)]
+        columns = decode_sv(frames, offset=len(APDU_HEADER))
+        assert columns.values.shape == (3, 4, CHANNELS)
+        assert columns.values[2, 3].tolist() == [value for value, _ in _sample(2, 3)]
+
+    def test_decode_sv_buffer(self: "TestBatch") -> None:
+        frames = [_frame(smp_cnt) for smp_cnt in range(5)]
+        stride = len(frames[0]) + 4
+        buffer = b"".join(frame + b"\xff" * 4 for frame in frames)[:-4]
+        columns = decode_sv(buffer, offset=len(APDU_HEADER), stride=stride)
+        assert columns.smp_cnt[:, 0].tolist() == list(range(5))
+        layout = SvLayout.from_frame(frames[0], offset=len(APDU_HEADER))
+        assert decode_sv(memoryview(b"".join(frames)), layout).smp_cnt[:, 0].tolist() == list(range(5))
+
+    def test_decode_sv_mismatch(self: "TestBatch") -> None:
+        frames = [_frame(0), _frame(1), _frame(2, asdus=2)]
+        with pytest.raises(SvLayoutMismatchError) as exc_info:
+            decode_sv(frames, offset=len(APDU_HEADER))
+        assert exc_info.match("Sampled Values frame 2 has")
+        frames[2] = frames[2][: len(frames[0])]
+        with pytest.raises(SvLayoutMismatchError) as exc_info:
+            decode_sv(frames, offset=len(APDU_HEADER))
+        assert exc_info.match("Sampled Values frame 2 does not match the layout of the first frame")
+
+    def test_decode_sv_not_sv(self: "TestBatch") -> None:
+        with pytest.raises(SvLayoutError) as exc_info:
+            decode_sv([b"\x61\x00"])
+        assert exc_info.match(r"Sampled Values frame starts with tag 0x61, expected savPdu \(0x60\)")
+
+
+class TestBatchUtcTime:
+    TIMES = (
+        b"\x65\x00\x00\x00\x80\x00\x00\x0a",  # 0.5 s, 10 bits of accuracy
+        b"\x65\x00\x00\x01\x00\x00\x01\x80",  # leap seconds known
+        b"\x00\x00\x00\x00\x40\x00\x00\x7f",  # clock failure and not synchronized, unspecified accuracy
+    )
+
+    def test_utc_times(self: "TestBatchUtcTime") -> None:
+        times = decode_utc_times([memoryview(time) for time in self.TIMES])
+        assert times.time.dtype == np.dtype("datetime64[ns]")
+        assert times.time.astype(np.int64).tolist() == [
+            0x65000000 * 10**9 + 500_000_000,
+            0x65000001 * 10**9 + 59,  # 1/2**24 s, truncated to ns
+            250_000_000,
+        ]
+        assert str(times.time[0]) == "2023-09-12T06:06:56.500000000"
+        assert times.leap_seconds_known.tolist() == [False, True, False]
+        assert times.clock_failure.tolist() == [False, False, True]
+        assert times.clock_not_synchronized.tolist() == [False, False, True]
+        assert times.accuracy.tolist() == [10, 0, 31]
+
+    def test_utc_times_buffer(self: "TestBatchUtcTime") -> None:
+        # a UtcTime every 12 bytes, after a 2-byte header (e.g. the tag and length of every t triplet)
+        buffer = b"".join(b"\x91\x08" + time + b"\xff\xff" for time in self.TIMES)
+        times = decode_utc_times(buffer, offset=2, stride=12)
+        assert times.time.tolist() == decode_utc_times(list(self.TIMES)).time.tolist()
+
+    def test_utc_times_length(self: "TestBatchUtcTime") -> None:
+        with pytest.raises(BatchValueError, match="Batch value 1 has 7 bytes, expected 8"):
+            decode_utc_times([self.TIMES[0], self.TIMES[1][:7]])
+
+    def test_utc_times_empty(self: "TestBatchUtcTime") -> None:
+        assert decode_utc_times(b"").time.shape == (0,)
+
+
+class TestBatchQuality:
+    def test_quality(self: "TestBatchQuality") -> None:
+        qualities = [b"\x03\x00\x00", b"\x03\xc0\x00", b"\x03\x01\x10"]
+        matrix = decode_quality(qualities)
+        assert matrix.shape == (3, len(QUALITY_BITS))
+        assert matrix.dtype == np.bool_
+        assert not matrix[0].any()
+        assert matrix[1].tolist() == [True, True] + [False] * 11
+        assert [QUALITY_BITS[bit] for bit in np.flatnonzero(matrix[2])] == ["old_data", "test"]
+
+    def test_validity(self: "TestBatchQuality") -> None:
+        # 00 good, 01 invalid, 10 reserved, 11 questionable, in the first two bits of the bit string
+        matrix = decode_quality([b"\x03\x00\x00", b"\x03\x40\x00", b"\x03\x80\x00", b"\x03\xc0\x20"])
+        validity = decode_validity(matrix)
+        assert validity.dtype == np.uint8
+        assert validity.tolist() == [VALIDITY_GOOD, VALIDITY_INVALID, VALIDITY_RESERVED, VALIDITY_QUESTIONABLE]
+        assert matrix[3, QUALITY_BITS.index("source")]
+
+    def test_quality_buffer(self: "TestBatchQuality") -> None:
+        buffer = b"\x84\x03\x03\xc0\x00" * 4
+        matrix = decode_quality(buffer, size=3, offset=2, stride=5)
+        assert matrix.shape == (4, 13)
+        assert matrix[:, :2].all()
+
+    def test_quality_unused_bits(self: "TestBatchQuality") -> None:
+        with pytest.raises(BatchValueError, match="Bit string 1 has a different number of unused bits"):
+            decode_quality([b"\x03\x00\x00", b"\x02\x00\x00"])
+
+    def test_quality_buffer_needs_size(self: "TestBatchQuality") -> None:
+        with pytest.raises(BatchValueError, match="needs the value size"):
+            decode_quality(b"\x03\x00\x00")
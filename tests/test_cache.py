@@ -0,0 +1,131 @@
+import pytest
+
+from pysn1.cache import DecodeCache
+from pysn1.encoder import Constructed, encode
+from pysn1.tree import decode_tree
+from pysn1.triplet import Triplet
+
+NAMES = Constructed(
+    tag=0xA1,
+    children=tuple(Triplet.build(tag=0x1A, value=f"LD0/LLN0$ST$Ind{index}".encode()) for index in range(3)),
+)
+
+
+def _response(value: bytes) -> bytes:
+    return bytes(encode(Constructed(tag=0xA0, children=(NAMES, Triplet.build(tag=0x83, value=value)))))
+
+
+class TestCache:
+    def test_tree(self: "TestCache") -> None:
+        cache = DecodeCache()
+        response = _response(b"\x00")
+        subtree, end = cache.tree(bytearray(b"\xff" + response), 1)
+        node = decode_tree(response)
+        assert end == len(response) + 1
+        assert subtree.tag == 0xA0  # noqa: PLR2004
+        assert subtree.identifier.constructed is True
+        assert [child.tag for child in subtree] == [0xA1, 0x83]
+        assert [bytes(name.value) for name in subtree[0].children] == [bytes(child.value) for child in node[0]]
+        assert bytes(subtree[1].value) == b"\x00"
+        assert len(subtree[0]) == 3  # noqa: PLR2004
+        assert cache.stats()["misses"] == 2  # noqa: PLR2004
+
+    def test_copies_buffer(self: "TestCache") -> None:
+        cache = DecodeCache()
+        buffer = bytearray(_response(b"\x00"))
+        subtree, _ = cache.tree(buffer)
+        buffer[-1] = 0x01
+        assert bytes(subtree[1].value) == b"\x00"
+        assert cache.tree(buffer)[0] is not subtree
+
+    def test_shared_substructures(self: "TestCache") -> None:
+        cache = DecodeCache()
+        first, _ = cache.tree(_response(b"\x00"))
+        again, _ = cache.tree(_response(b"\x00"))
+        changed, _ = cache.tree(_response(b"\x01"))
+        assert again is first
+        assert changed is not first
+        # only the changed outer element is decoded again, the unchanged name list is shared
+        assert changed[0] is first[0]
+        assert cache.hits == 2  # noqa: PLR2004
+        assert cache.misses == 3  # noqa: PLR2004
+        assert cache.stats()["hit_rate"] == pytest.approx(0.4)
+
+    def test_nbytes(self: "TestCache") -> None:
+        cache = DecodeCache()
+        first = _response(b"\x00")
+        cache.tree(first)
+        # the name list entry is a view into the same copy, not a second copy
+        assert len(cache) == 2  # noqa: PLR2004
+        assert cache.nbytes == len(first)
+        cache.tree(_response(b"\x01"))
+        assert cache.nbytes == 2 * len(first)
+
+    def test_nbytes_shared_copy(self: "TestCache") -> None:
+        cache = DecodeCache(maxsize=2)
+        first = _response(b"\x00")
+        cache.tree(first)
+        changed, _ = cache.tree(_response(b"\x01"))
+        # the first response is evicted, but the name list and the changed response still point into its copy
+        assert first not in cache
+        assert len(cache) == 2  # noqa: PLR2004
+        assert cache.nbytes == 2 * len(first)
+        assert bytes(changed[0][0].value) == b"LD0/LLN0$ST$Ind0"
+
+    def test_nbytes_eviction(self: "TestCache") -> None:
+        response = _response(b"\x00")
+        cache = DecodeCache(maxsize=1)
+        cache.tree(response)
+        assert len(cache) == 1
+        assert cache.evictions == 1
+        assert cache.nbytes == len(response)
+        cache.clear()
+        assert cache.nbytes == 0
+
+    def test_triplet(self: "TestCache") -> None:
+        cache = DecodeCache()
+        response = _response(b"\x00")
+        triplet = cache.triplet(response)
+        assert triplet is cache.triplet(response)
+        assert bytes(triplet) == bytes(Triplet.from_bytes(response))
+        primitive = cache.triplet(b"\x83\x01\x00")
+        assert primitive == Triplet.from_bytes(b"\x83\x01\x00")
+        assert b"\x83\x01\x00" not in cache
+
+    def test_indefinite(self: "TestCache") -> None:
+        cache = DecodeCache()
+        indefinite = b"\xa1\x80\x30\x80\x83\x01\x00\x00\x00\x00\x00"
+        subtree, end = cache.tree(indefinite)
+        assert end == len(indefinite)
+        assert subtree.triplet.indefinite is True
+        assert bytes(subtree[0][0].value) == b"\x00"
+
+    def test_long_form_length(self: "TestCache") -> None:
+        inner = b"\x30\x83\x00\x01\x00" + b"\x04\x81\xfd" + b"A" * 253
+        subtree, end = DecodeCache().tree(b"\x30\x82\x01\x05" + inner)
+        assert end == 4 + len(inner)
+        assert subtree[0].triplet.length == 0x100  # noqa: PLR2004
+        assert bytes(subtree[0][0].value) == b"A" * 253
+
+    def test_limits(self: "TestCache") -> None:
+        cache = DecodeCache(maxsize=2)
+        for value in range(3):
+            cache.tree(bytes(encode(Constructed(tag=0x30, children=(Triplet.build(tag=0x02, value=bytes((value,))),)))))
+        assert len(cache) == 2  # noqa: PLR2004
+        assert cache.evictions == 1
+        assert b"\x30\x03\x02\x01\x00" not in cache
+        assert b"\x30\x03\x02\x01\x02" in cache
+
+        cache = DecodeCache(maxbytes=8)
+        cache.tree(b"\x30\x03\x02\x01\x00")
+        cache.tree(b"\x30\x03\x02\x01\x01")
+        assert cache.stats()["bytes"] == 5  # noqa: PLR2004
+        # larger than maxbytes, decoded but never cached
+        cache.tree(b"\x30\x07\x02\x01\x00\x02\x02\x00\x01")
+        assert len(cache) == 1
+        cache.clear()
+        assert cache.stats()["entries"] == cache.nbytes == 0
+
+    def test_errors(self: "TestCache") -> None:
+        with pytest.raises(ValueError, match="must be at least 1, got 0 and 1"):
+            DecodeCache(maxsize=0, maxbytes=1)
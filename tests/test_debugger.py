@@ -1,4 +1,20 @@
-from pysn1.debugger import ApplicationType, ContextType, Identifier, IdentifierClass, PrimitiveType
+import logging
+
+import pytest
+
+from pysn1.debugger import (
+    ApplicationType,
+    ContextType,
+    Identifier,
+    IdentifierClass,
+    IdentifierMissingBytesError,
+    IdentifierOutOfRangeError,
+    LazyDebug,
+    PrimitiveType,
+    PrivateType,
+    UniversalType,
+)
+from pysn1.triplet import Triplet
 
 
 class TestDebugger:
@@ -247,3 +263,157 @@ class TestDebuggerFromBytes:
         assert identifier.datatype == ContextType(value=1)
         assert int(identifier) == 0x81  # noqa: PLR2004
         assert bytes(identifier) == b"\x81"
+
+
+class TestDebuggerInterned:
+    def test_from_int_interned(self: "TestDebuggerInterned") -> None:
+        assert Identifier.from_int(0x61) is Identifier.from_int(0x61)
+        assert Identifier.from_bytes(b"\x61") is Identifier.from_int(0x61)
+
+    def test_from_int_table(self: "TestDebuggerInterned") -> None:
+        for integer in range(0x100):
+            if integer & 0x1F == 0x1F:  # noqa: PLR2004
+                continue
+            assert Identifier.from_int(integer) == Identifier._decode(integer)  # noqa: SLF001
+            assert int(Identifier.from_int(integer)) == integer
+
+    def test_from_int_negative(self: "TestDebuggerInterned") -> None:
+        with pytest.raises(IdentifierOutOfRangeError) as exc_info:
+            Identifier.from_int(-1)
+        assert exc_info.match("Identifier must be positive, got -1")
+
+    def test_from_int_too_big(self: "TestDebuggerInterned") -> None:
+        with pytest.raises(IdentifierOutOfRangeError) as exc_info:
+            Identifier.from_int(0x100)
+        assert exc_info.match("has 2 bytes, but does not use the high-tag-number form")
+
+    def test_from_bytes_empty(self: "TestDebuggerInterned") -> None:
+        with pytest.raises(IdentifierMissingBytesError) as exc_info:
+            Identifier.from_bytes(b"")
+        assert exc_info.match("Identifier is missing bytes")
+
+
+class TestDebuggerHighTag:
+    def test_high_tag_context(self: "TestDebuggerHighTag") -> None:
+        identifier = Identifier.from_bytes(b"\x9f\x22")
+        assert identifier.reference == IdentifierClass.CONTEXT
+        assert identifier.primitive is True
+        assert identifier.datatype == ContextType(value=34)
+        assert identifier.number == 34  # noqa: PLR2004
+        assert int(identifier) == 0x9F22  # noqa: PLR2004
+        assert bytes(identifier) == b"\x9f\x22"
+        assert len(identifier) == 2  # noqa: PLR2004
+
+    def test_high_tag_application_multi_byte(self: "TestDebuggerHighTag") -> None:
+        identifier = Identifier(
+            reference=IdentifierClass.APPLICATION,
+            constructed=True,
+            datatype=ApplicationType(value=200),
+        )
+        assert bytes(identifier) == b"\x7f\x81\x48"
+        assert len(identifier) == 3  # noqa: PLR2004
+        assert Identifier.from_bytes(b"\x7f\x81\x48") == identifier
+        assert Identifier.from_int(0x7F8148) == identifier
+
+    def test_high_tag_universal(self: "TestDebuggerHighTag") -> None:
+        identifier = Identifier.from_bytes(b"\x1f\x1f")
+        assert identifier.datatype == PrimitiveType.DATE
+        assert bytes(identifier) == b"\x1f\x1f"
+
+    def test_high_tag_unknown_numbers(self: "TestDebuggerHighTag") -> None:
+        private = Identifier.from_bytes(b"\xdf\x40")
+        assert private.reference == IdentifierClass.PRIVATE
+        assert private.datatype == PrivateType(value=64)
+        assert private.label == "Private 64"
+        assert bytes(private) == b"\xdf\x40"
+        universal = Identifier.from_bytes(b"\x3f\x81\x00")
+        assert universal.constructed is True
+        assert universal.datatype == UniversalType(value=128)
+        assert universal.label == "Universal 128 [Constructed]"
+        assert int(universal) == 0x3F8100  # noqa: PLR2004
+        # private numbers PrimitiveType knows keep decoding to it
+        assert Identifier.from_int(0xC1).datatype == PrimitiveType.BOOLEAN
+
+    def test_high_tag_cached(self: "TestDebuggerHighTag") -> None:
+        assert Identifier.from_bytes(b"\x9f\x22") is Identifier.from_bytes(b"\x9f\x22")
+
+    def test_high_tag_from_buffer(self: "TestDebuggerHighTag") -> None:
+        assert Identifier.from_buffer(b"\x00\x9f\x81\x00\x05", offset=1) == (
+            Identifier(reference=IdentifierClass.CONTEXT, datatype=ContextType(value=128)),
+            4,
+        )
+        assert Identifier.from_buffer(b"\x80\x05") == (Identifier.from_int(0x80), 1)
+
+    def test_high_tag_leading_byte_only(self: "TestDebuggerHighTag") -> None:
+        with pytest.raises(IdentifierMissingBytesError) as exc_info:
+            Identifier.from_int(0x9F)
+        assert exc_info.match("Identifier 0x9f uses the high-tag-number form, but is missing bytes")
+
+    def test_high_tag_missing_bytes(self: "TestDebuggerHighTag") -> None:
+        with pytest.raises(IdentifierMissingBytesError) as exc_info:
+            Identifier.from_bytes(b"\x9f\x81")
+        assert exc_info.match("uses the high-tag-number form, but is missing bytes")
+        with pytest.raises(IdentifierMissingBytesError):
+            Identifier.from_buffer(b"\x9f\x81")
+
+    def test_high_tag_extra_bytes(self: "TestDebuggerHighTag") -> None:
+        with pytest.raises(IdentifierOutOfRangeError) as exc_info:
+            Identifier.from_bytes(b"\x9f\x22\x01")
+        assert exc_info.match("has 1 extra bytes")
+
+    def test_high_tag_padding(self: "TestDebuggerHighTag") -> None:
+        with pytest.raises(IdentifierOutOfRangeError) as exc_info:
+            Identifier.from_bytes(b"\x9f\x80\x22")
+        assert exc_info.match(r"tag number starts with a padding byte \(0x80\)")
+
+    def test_high_tag_low_number(self: "TestDebuggerHighTag") -> None:
+        with pytest.raises(IdentifierOutOfRangeError) as exc_info:
+            Identifier.from_bytes(b"\x9f\x05")
+        assert exc_info.match(r"uses the high-tag-number form for tag number 5 \(< 31\)")
+
+
+class TestDebuggerLazy:
+    def test_lazy_renders_on_str(self: "TestDebuggerLazy") -> None:
+        calls = []
+
+        def render(obj: object) -> str:
+            calls.append(obj)
+            return "rendered"
+
+        lazy = LazyDebug(1, render)
+        assert calls == []
+        assert str(lazy) == "rendered"
+        assert str(lazy) == "rendered"
+        assert calls == [1]
+
+    def test_lazy_uses_debug(self: "TestDebuggerLazy") -> None:
+        triplet = Triplet.build(tag=0x81, value=b"\x01")
+        assert str(LazyDebug(triplet)) == triplet.debug()
+        assert str(LazyDebug(Identifier.from_int(0x30))) == str(Identifier.from_int(0x30))
+
+    def test_lazy_not_rendered_when_filtered(self: "TestDebuggerLazy", caplog: pytest.LogCaptureFixture) -> None:
+        calls = []
+
+        def render(obj: object) -> str:
+            calls.append(obj)
+            return f"rendered {obj}"
+
+        logger = logging.getLogger("pysn1.test")
+        with caplog.at_level(logging.WARNING, logger="pysn1.test"):
+            logger.info(LazyDebug(1, render))
+            logger.warning(LazyDebug(2, render))
+        assert calls == [2]
+        assert caplog.messages == ["rendered 2"]
+
+    def test_identifier_str_cached(self: "TestDebuggerLazy") -> None:
+        identifier = Identifier.from_int(0xAB)
+        rendered = str(identifier)
+        assert str(identifier) is rendered
+        assert str(identifier).startswith(repr(identifier))
+
+    def test_identifier_label(self: "TestDebuggerLazy") -> None:
+        assert Identifier.from_int(0x02).label == "Universal Integer"
+        assert Identifier.from_int(0x30).label == "Universal Sequence_of [Constructed]"
+        assert Identifier.from_int(0x83).label == "Context 3"
+        assert Identifier.from_int(0x61).label == "Application 1 [Constructed]"
+        assert Identifier.from_int(0xBF22).label == "Context 34 [Constructed]"
@@ -0,0 +1,105 @@
+import pytest
+
+from pysn1.encoder import Constructed, EncoderBufferTooSmallError, Encoding, encode, encode_into, encoded_size
+from pysn1.triplet import Triplet, TripletBadTagError
+
+
+def _nested(element: Constructed | Triplet) -> bytes:
+    # reference encoding, concatenating every level like Triplet.__bytes__ does
+    if isinstance(element, Triplet):
+        return bytes(element)
+    return bytes(Triplet.build(tag=element.tag, value=b"".join(_nested(child) for child in element.children)))
+
+
+DATASET = Constructed(
+    tag=0xAB,
+    children=tuple(Triplet.build(tag=0x85, value=index.to_bytes(2, "big")) for index in range(100)),
+)
+GOOSE_PDU = Constructed(
+    tag=0x61,
+    children=(
+        Triplet.build(tag=0x80, value=b"IED1LD0/LLN0$GO$gcb01"),
+        Triplet.build(tag=0x85, value=b"\x01"),
+        Constructed(tag=0xA2, children=(Triplet.build(tag=0x83, value=b"\x00" * 0x100),)),
+        DATASET,
+    ),
+)
+
+
+class TestEncoder:
+    def test_encode_triplet(self: "TestEncoder") -> None:
+        triplet = Triplet.build(tag=0x81, value=b"pysn1")
+        assert encode(triplet) == bytes(triplet)
+        assert encoded_size(triplet) == len(triplet)
+
+    def test_encode_empty_constructed(self: "TestEncoder") -> None:
+        assert encode(Constructed(tag=0x30)) == b"\x30\x00"
+
+    def test_encode_nested(self: "TestEncoder") -> None:
+        encoded = encode(GOOSE_PDU)
+        assert isinstance(encoded, bytearray)
+        assert encoded == _nested(GOOSE_PDU)
+        assert encoded_size(GOOSE_PDU) == len(encoded)
+
+    def test_encode_extended_lengths(self: "TestEncoder") -> None:
+        for length in (0x7F, 0x80, 0xFF, 0x100, 0xFFFF, 0x10000):
+            element = Constructed(tag=0x30, children=(Triplet.build(tag=0x04, value=b"\x01" * length),))
+            assert encode(element) == _nested(element)
+
+    def test_encode_high_tag(self: "TestEncoder") -> None:
+        element = Constructed(tag=0xBF22, children=(Triplet.build(tag=0x9F23, value=b"\x01"),))
+        assert encode(element) == b"\xbf\x22\x04\x9f\x23\x01\x01"
+
+    def test_encode_into(self: "TestEncoder") -> None:
+        buffer = bytearray(b"\xff" * 2 + b"\x00" * encoded_size(DATASET) + b"\xff")
+        end = encode_into(DATASET, buffer, offset=2)
+        assert end == len(buffer) - 1
+        assert buffer[2:end] == _nested(DATASET)
+        assert buffer[:2] == b"\xff\xff"
+        assert buffer[end:] == b"\xff"
+
+    def test_encode_into_too_small(self: "TestEncoder") -> None:
+        with pytest.raises(EncoderBufferTooSmallError) as exc_info:
+            encode_into(GOOSE_PDU, bytearray(10))
+        assert exc_info.match("but buffer contains only 10 bytes")
+
+    def test_encode_ber(self: "TestEncoder") -> None:
+        element = Constructed(
+            tag=0x30,
+            indefinite=True,
+            children=(
+                Triplet.build(tag=0x04, value=b"\x01"),
+                Constructed(tag=0xA0, indefinite=True, children=(Triplet.build(tag=0x02, value=b"\x05"),)),
+            ),
+        )
+        encoded = encode(element, Encoding.BER)
+        assert encoded == b"\x30\x80\x04\x01\x01\xa0\x80\x02\x01\x05\x00\x00\x00\x00"
+        assert encoded_size(element, Encoding.BER) == len(encoded)
+        assert Triplet.from_bytes(bytes(encoded)).indefinite is True
+
+    def test_encode_der_ignores_indefinite(self: "TestEncoder") -> None:
+        element = Constructed(tag=0x30, indefinite=True, children=(Triplet.build(tag=0x04, value=b"\x01"),))
+        assert encode(element) == b"\x30\x03\x04\x01\x01"
+        assert encode(element, Encoding.BER) == b"\x30\x80\x04\x01\x01\x00\x00"
+
+    def test_encode_ber_definite(self: "TestEncoder") -> None:
+        assert encode(GOOSE_PDU, Encoding.BER) == encode(GOOSE_PDU)
+
+    def test_encode_into_ber(self: "TestEncoder") -> None:
+        element = Constructed(tag=0xBF22, indefinite=True, children=(DATASET,))
+        buffer = bytearray(encoded_size(element, Encoding.BER) + 1)
+        end = encode_into(element, buffer, offset=1, encoding=Encoding.BER)
+        assert end == len(buffer)
+        assert buffer[1:] == b"\xbf\x22\x80" + encode(DATASET) + b"\x00\x00"
+
+    def test_encode_der_reencodes_ber_triplet(self: "TestEncoder") -> None:
+        triplet = Triplet.from_bytes(b"\x30\x80\x04\x01\x01\x00\x00")
+        assert encode(triplet) == b"\x30\x03\x04\x01\x01"
+        assert encode(triplet, Encoding.BER) == b"\x30\x80\x04\x01\x01\x00\x00"
+
+    def test_encode_bad_tag(self: "TestEncoder") -> None:
+        for encoding in Encoding:
+            with pytest.raises(TripletBadTagError):
+                encode(Constructed(tag=0xBF, children=(DATASET,)), encoding)
+        with pytest.raises(TripletBadTagError):
+            encode(Constructed(tag=0xBF, indefinite=True, children=(DATASET,)), Encoding.BER)
@@ -0,0 +1,162 @@
+from pathlib import Path
+from struct import pack
+
+import pytest
+
+from pysn1.encoder import Constructed, encode
+from pysn1.goose import GooseFilter, GooseStateCache, GooseStateError
+from pysn1.pcap import ETHERTYPE_GOOSE, ETHERTYPE_SV, CaptureReader
+from pysn1.triplet import Triplet
+from tests.test_pcap import MACS
+
+
+def _payload(appid: int, gocb_ref: bytes, tag: int = 0x80) -> bytes:
+    pdu = bytes(
+        encode(
+            Constructed(
+                tag=0x61,
+                children=(Triplet.build(tag=tag, value=gocb_ref), Triplet.build(tag=0x81, value=b"\x07\xd0")),
+            ),
+        ),
+    )
+    return pack("!HHHH", appid, len(pdu) + 8, 0, 0) + pdu
+
+
+def _capture(path: Path, payloads: list[tuple[int, bytes]]) -> Path:
+    data = pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 0xFFFF, 1)
+    for ethertype, payload in payloads:
+        packet = MACS + pack("!H", ethertype) + payload
+        data += pack("<IIII", 0, 0, len(packet), len(packet)) + packet
+    path.write_bytes(data)
+    return path
+
+
+class TestGoose:
+    def test_filter(self: "TestGoose") -> None:
+        goose_filter = GooseFilter([(0x0001, "IED1LD0/LLN0$GO$gcb01"), (0x0001, b"IED1LD0/LLN0$GO$gcb02")])
+        assert goose_filter.match(_payload(0x0001, b"IED1LD0/LLN0$GO$gcb01")) is True
+        assert goose_filter.match(bytearray(_payload(0x0001, b"IED1LD0/LLN0$GO$gcb02"))) is True
+        assert goose_filter.match(memoryview(_payload(0x0001, b"IED1LD0/LLN0$GO$gcb01"))) is True
+        assert goose_filter.match(_payload(0x0001, b"IED1LD0/LLN0$GO$gcb03")) is False
+        assert goose_filter.match(_payload(0x0002, b"IED1LD0/LLN0$GO$gcb01")) is False
+        assert goose_filter.hits == {
+            (0x0001, b"IED1LD0/LLN0$GO$gcb01"): 2,
+            (0x0001, b"IED1LD0/LLN0$GO$gcb02"): 1,
+        }
+        assert goose_filter.stats() == {
+            "matched": 3,
+            "dropped_appid": 1,
+            "dropped_gocb_ref": 1,
+            "dropped_malformed": 0,
+        }
+        assert goose_filter.dropped == 2  # noqa: PLR2004
+
+    def test_filter_any_gocb_ref(self: "TestGoose") -> None:
+        goose_filter = GooseFilter([(0x0003, b"gcb01"), (0x0003, None)])
+        assert goose_filter.match(_payload(0x0003, b"gcb02")) is True
+        assert goose_filter.match(b"\x00\x03") is False
+        assert goose_filter.hits == {(0x0003, b"gcb01"): 0, (0x0003, None): 1}
+        assert goose_filter.dropped_malformed == 1
+
+    def test_filter_offset(self: "TestGoose") -> None:
+        goose_filter = GooseFilter([(0x0001, b"gcb01")])
+        assert goose_filter.match(b"\xff" * 3 + _payload(0x0001, b"gcb01"), offset=3) is True
+
+    def test_filter_malformed(self: "TestGoose") -> None:
+        goose_filter = GooseFilter([(0x0001, b"gcb01")])
+        assert goose_filter.match(_payload(0x0001, b"gcb01", tag=0x81)) is False
+        assert goose_filter.match(_payload(0x0001, b"gcb01")[:12]) is False
+        assert goose_filter.match(pack("!HHHH", 0x0001, 10, 0, 0) + b"\x30\x00") is False
+        assert goose_filter.dropped_malformed == 3  # noqa: PLR2004
+        assert goose_filter.matched == 0
+
+    def test_filter_frames(self: "TestGoose", tmp_path: Path) -> None:
+        path = _capture(
+            tmp_path / "goose.pcap",
+            [
+                (ETHERTYPE_GOOSE, _payload(0x0001, b"gcb01")),
+                (ETHERTYPE_SV, _payload(0x0001, b"gcb01")),
+                (ETHERTYPE_GOOSE, _payload(0x0001, b"gcb02")),
+                (ETHERTYPE_GOOSE, _payload(0x0001, b"gcb01")),
+            ],
+        )
+        goose_filter = GooseFilter([(0x0001, b"gcb01")])
+        with CaptureReader(path) as reader:
+            assert [frame.index for frame in goose_filter.frames(reader)] == [0, 3]
+        assert goose_filter.stats()["dropped_gocb_ref"] == 1
+
+
+def _state_pdu(gocb_ref: bytes, st_num: int, sq_num: int, all_data: bytes, conf_rev: int = 1) -> bytes:
+    children = (
+        Triplet.build(tag=0x80, value=gocb_ref),
+        Triplet.build(tag=0x81, value=b"\x07\xd0"),
+        Triplet.build(tag=0x85, value=st_num.to_bytes(4, "big")),
+        Triplet.build(tag=0x86, value=sq_num.to_bytes(4, "big")),
+        Triplet.build(tag=0x88, value=conf_rev.to_bytes(1, "big")),
+        Triplet.build(tag=0xAB, value=all_data),
+    )
+    return bytes(encode(Constructed(tag=0x61, children=children)))
+
+
+class TestGooseStateCache:
+    def test_retransmission(self: "TestGooseStateCache") -> None:
+        decoded = []
+
+        def decode(view: memoryview) -> bytes:
+            decoded.append(bytes(view))
+            return bytes(view)
+
+        cache = GooseStateCache(decode=decode)
+        first = cache.update(_state_pdu(b"gcb01", 1, 0, b"\x83\x01\x00"))
+        again = cache.update(memoryview(_state_pdu(b"gcb01", 1, 1, b"\x83\x01\x00")))
+        assert first.changed is True
+        assert again.changed is False
+        assert again.sq_num == 1
+        assert again.dataset is first.dataset
+        assert decoded == [b"\x83\x01\x00"]
+        assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+
+    def test_state_change(self: "TestGooseStateCache") -> None:
+        cache = GooseStateCache()
+        assert cache.update(_state_pdu(b"gcb01", 1, 0, b"\x83\x01\x00")).dataset == [False]
+        changed = cache.update(_state_pdu(b"gcb01", 2, 0, b"\x83\x01\xff"))
+        assert changed.changed is True
+        assert changed.dataset == [True]
+        # same stNum but different allData (or confRev) is decoded again rather than trusted
+        assert cache.update(_state_pdu(b"gcb01", 2, 1, b"\x83\x01\x00")).dataset == [False]
+        assert cache.update(_state_pdu(b"gcb01", 2, 2, b"\x83\x01\x00", conf_rev=2)).changed is True
+        assert cache.misses == 4  # noqa: PLR2004
+
+    def test_binary_time(self: "TestGooseStateCache") -> None:
+        # binary-time (0x8c) has no value codec, the default decoder keeps its bytes
+        state = GooseStateCache().update(_state_pdu(b"gcb01", 1, 0, b"\x8c\x04\x00\x00\x00\x01\x83\x01\xff"))
+        assert state.dataset == [b"\x00\x00\x00\x01", True]
+
+    def test_lru(self: "TestGooseStateCache") -> None:
+        cache = GooseStateCache(maxsize=2)
+        cache.update(_state_pdu(b"gcb01", 1, 0, b""))
+        cache.update(_state_pdu(b"gcb02", 1, 0, b""))
+        cache.update(_state_pdu(b"gcb01", 1, 1, b""))
+        cache.update(_state_pdu(b"gcb03", 1, 0, b""))
+        assert "gcb01" in cache
+        assert b"gcb02" not in cache
+        assert len(cache) == 2  # noqa: PLR2004
+        assert cache.evictions == 1
+
+    def test_errors(self: "TestGooseStateCache") -> None:
+        cache = GooseStateCache()
+        with pytest.raises(GooseStateError, match=r"Expected a goosePdu \(0x61\) at offset 0, got tag 0x62"):
+            cache.update(b"\x62\x00")
+        with pytest.raises(GooseStateError, match="missing fields 0x85, 0x86, 0x88, 0xab"):
+            cache.update(_payload(0x0001, b"gcb01"), 8)
+        with pytest.raises(ValueError, match="maxsize must be at least 1, got 0"):
+            GooseStateCache(maxsize=0)
+
+    def test_frames(self: "TestGooseStateCache", tmp_path: Path) -> None:
+        pdu = _state_pdu(b"gcb01", 1, 0, b"\x83\x01\x00")
+        payload = pack("!HHHH", 1, len(pdu) + 8, 0, 0) + pdu
+        path = _capture(tmp_path / "state.pcap", [(ETHERTYPE_GOOSE, payload)] * 3 + [(ETHERTYPE_SV, payload)])
+        cache = GooseStateCache()
+        with CaptureReader(path) as reader:
+            changes = [state.changed for _, state in cache.frames(reader)]
+        assert changes == [True, False, False]
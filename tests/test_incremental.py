@@ -0,0 +1,92 @@
+import pytest
+
+from pysn1.incremental import DecoderState, IncrementalDecoder
+from pysn1.triplet import (
+    Triplet,
+    TripletBadLengthError,
+    TripletIndefiniteLengthError,
+    TripletLengthTooBigError,
+    TripletMissingBytesError,
+)
+
+STREAM = (
+    bytes(Triplet.build(tag=0x81, value=b"\x01"))
+    + bytes(Triplet.build(tag=0x82, value=b""))
+    + bytes(Triplet.build(tag=0xA0, value=b"\x02" * 0x100))
+    + bytes(Triplet.build(tag=0x9F22, value=b"\x03" * 0x80))
+)
+EXPECTED = [(0x81, b"\x01"), (0x82, b""), (0xA0, b"\x02" * 0x100), (0x9F22, b"\x03" * 0x80)]
+
+
+def _decoded(triplets: list[Triplet]) -> list[tuple[int, bytes]]:
+    return [(triplet.tag, bytes(triplet.value)) for triplet in triplets]
+
+
+class TestIncremental:
+    def test_feed_whole(self: "TestIncremental") -> None:
+        decoder = IncrementalDecoder()
+        assert _decoded(decoder.feed(STREAM)) == EXPECTED
+        assert decoder.pending is False
+        decoder.close()
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 100])
+    def test_feed_segments(self: "TestIncremental", size: int) -> None:
+        decoder = IncrementalDecoder()
+        triplets = []
+        for start in range(0, len(STREAM), size):
+            triplets.extend(decoder.feed(STREAM[start : start + size]))
+        assert _decoded(triplets) == EXPECTED
+        decoder.close()
+
+    def test_feed_emits_early(self: "TestIncremental") -> None:
+        decoder = IncrementalDecoder()
+        assert _decoded(decoder.feed(STREAM[:4])) == [(0x81, b"\x01")]
+        assert decoder.state is DecoderState.LENGTH
+        assert _decoded(decoder.feed(STREAM[4:5])) == [(0x82, b"")]
+        assert decoder.feed(STREAM[5:7]) == []
+        assert decoder.state is DecoderState.EXTENDED_LENGTH
+        assert decoder.feed(STREAM[7:100]) == []
+        assert decoder.state is DecoderState.VALUE
+
+    def test_feed_triplet_lengths(self: "TestIncremental") -> None:
+        triplet = IncrementalDecoder().feed(b"\x81\x82\x01\x00" + b"\x01" * 0x100)[0]
+        assert triplet.length == 0x100  # noqa: PLR2004
+        assert len(triplet) == 0x104  # noqa: PLR2004
+
+    def test_close_incomplete(self: "TestIncremental") -> None:
+        decoder = IncrementalDecoder()
+        decoder.feed(b"\x81\x02\x01")
+        with pytest.raises(TripletMissingBytesError) as exc_info:
+            decoder.close()
+        assert exc_info.match(r"Stream ended while decoding a triplet \(value\)")
+        assert decoder.pending is False
+
+    def test_bad_length(self: "TestIncremental") -> None:
+        decoder = IncrementalDecoder()
+        with pytest.raises(TripletBadLengthError):
+            decoder.feed(b"\x81\x81\x01")
+        assert decoder.pending is False
+
+    def test_length_too_big(self: "TestIncremental") -> None:
+        with pytest.raises(TripletLengthTooBigError):
+            IncrementalDecoder().feed(b"\x81\x85")
+
+    def test_max_length(self: "TestIncremental") -> None:
+        decoder = IncrementalDecoder(max_length=0x100)
+        with pytest.raises(TripletLengthTooBigError, match="length is 1073741824, but the decoder accepts at most 256"):
+            decoder.feed(b"\x04\x84\x40\x00\x00\x00")
+        assert decoder.pending is False
+        assert decoder.feed(b"\x04\x82\x01\x00" + b"\x01" * 0x100)[0].length == 0x100  # noqa: PLR2004
+
+    def test_huge_length_not_preallocated(self: "TestIncremental") -> None:
+        # a 1 GB announced length only buffers what actually arrived
+        decoder = IncrementalDecoder()
+        assert decoder.feed(b"\x04\x84\x40\x00\x00\x00\x01\x02") == []
+        assert decoder.pending is True
+        assert len(decoder._value) == 2  # noqa: PLR2004, SLF001
+
+    def test_indefinite_length(self: "TestIncremental") -> None:
+        decoder = IncrementalDecoder()
+        with pytest.raises(TripletIndefiniteLengthError):
+            decoder.feed(b"\x30\x80\x00\x00")
+        assert decoder.pending is False
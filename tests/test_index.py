@@ -0,0 +1,116 @@
+import tracemalloc
+
+import pytest
+
+from pysn1.encoder import Constructed, encode
+from pysn1.index import TlvIndex
+from pysn1.tree import NodeNotFoundError, decode_tree
+from pysn1.triplet import Triplet, TripletMissingBytesError
+
+ENTRIES = 1000
+RESPONSE = bytes(
+    encode(
+        Constructed(
+            tag=0xA1,
+            children=(
+                Triplet.build(tag=0x02, value=b"\x01"),
+                Constructed(
+                    tag=0xBF1F,
+                    children=tuple(
+                        Constructed(
+                            tag=0x30,
+                            children=(
+                                Triplet.build(tag=0x80, value=b"LD0/LLN0$ST$Mod$stVal"),
+                                Constructed(tag=0xA1, children=()),
+                            ),
+                        )
+                        for _ in range(ENTRIES)
+                    ),
+                ),
+            ),
+        ),
+    ),
+)
+
+
+class TestIndex:
+    def test_index_walk(self: "TestIndex") -> None:
+        index = TlvIndex.from_buffer(RESPONSE)
+        nodes = list(decode_tree(RESPONSE).walk())
+        assert len(index) == len(nodes)
+        assert list(index.tag) == [node.tag for node in nodes]
+        assert list(index.offset) == [node.offset for node in nodes]
+        assert [index.value_offset(row) for row in range(len(index))] == [node.value_offset for node in nodes]
+        assert [index.triplet(row) for row in range(len(index))] == [node.triplet for node in nodes]
+
+    def test_index_tree(self: "TestIndex") -> None:
+        index = TlvIndex.from_buffer(RESPONSE)
+        assert list(index.roots()) == [0]
+        integer, entries = index.children(0)
+        assert index.tag[integer] == 0x02  # noqa: PLR2004
+        assert index.identifier(entries).high_tag
+        entry = list(index.children(entries))[-1]
+        assert index.parent[entry] == entries
+        assert bytes(index.value(index.find(entry, 0x80))) == b"LD0/LLN0$ST$Mod$stVal"
+        assert list(index.children(index.find(entry, 0xA1))) == []
+        with pytest.raises(NodeNotFoundError, match="no child with tag 0x85"):
+            index.find(entry, 0x85)
+
+    def test_index_roots(self: "TestIndex") -> None:
+        buffer = b"\x30\x03\x02\x01\x05\x04\x00\x30\x00"
+        index = TlvIndex.from_buffer(buffer)
+        assert list(index.roots()) == [0, 2, 3]
+        assert list(index.parent) == [-1, 0, -1, -1]
+        assert list(index.end) == [2, 2, 3, 4]
+
+    def test_index_value_is_view(self: "TestIndex") -> None:
+        index = TlvIndex.from_buffer(RESPONSE)
+        assert isinstance(index.triplet(0).value, memoryview)
+        assert index.value(0).obj is RESPONSE
+
+    def test_index_memory(self: "TestIndex") -> None:
+        tracemalloc.start()
+        try:
+            nodes = list(decode_tree(RESPONSE).walk())
+            tree_size = tracemalloc.get_traced_memory()[0]
+            del nodes
+            tracemalloc.reset_peak()
+            start = tracemalloc.get_traced_memory()[0]
+            index = TlvIndex.from_buffer(RESPONSE)
+            index_size = tracemalloc.get_traced_memory()[0] - start
+        finally:
+            tracemalloc.stop()
+        assert index_size * 10 < tree_size
+        assert index.nbytes <= index_size
+
+    def test_index_indefinite(self: "TestIndex") -> None:
+        # indefinite-length rows (nested, empty and followed by siblings) match the tree
+        buffer = (
+            b"\x30\x80"
+            b"\x04\x01\x01"
+            b"\xa1\x80\x02\x01\x05\x00\x00"
+            b"\xa2\x80\x00\x00"
+            b"\x00\x00"
+            b"\x05\x00"
+        )
+        index = TlvIndex.from_buffer(buffer)
+        nodes = list(decode_tree(buffer).walk()) + list(decode_tree(buffer, len(buffer) - 2).walk())
+        assert list(index.tag) == [node.tag for node in nodes]
+        assert list(index.offset) == [node.offset for node in nodes]
+        assert [index.value_offset(row) for row in range(len(index))] == [node.value_offset for node in nodes]
+        assert [index.triplet(row) for row in range(len(index))] == [node.triplet for node in nodes]
+        assert list(index.roots()) == [0, 5]
+        assert list(index.children(0)) == [1, 2, 4]
+        assert [index.indefinite(row) for row in range(len(index))] == [True, False, True, False, True, False]
+
+    def test_index_indefinite_unterminated(self: "TestIndex") -> None:
+        with pytest.raises(TripletMissingBytesError):
+            TlvIndex.from_buffer(b"\x30\x06\xa1\x80\x02\x01\x05\x00")
+
+    def test_index_child_too_long(self: "TestIndex") -> None:
+        with pytest.raises(TripletMissingBytesError, match="parent ends at 4"):
+            TlvIndex.from_buffer(b"\x30\x02\x04\x05\x00\x00\x00\x00\x00")
+
+    def test_index_truncated(self: "TestIndex") -> None:
+        with pytest.raises(TripletMissingBytesError):
+            TlvIndex.from_buffer(b"\x30\x05\x04\x01")
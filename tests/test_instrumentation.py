@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pysn1 import instrumentation
+from pysn1.debugger import Identifier
+from pysn1.goose import GooseFilter
+from pysn1.tree import decode_tree
+from pysn1.triplet import Triplet, TripletMissingBytesError, iter_triplets
+
+
+@pytest.fixture(autouse=True)
+def _reset() -> None:
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+class TestInstrumentation:
+    def test_disabled(self: "TestInstrumentation") -> None:
+        original = vars(Triplet)["from_buffer"]
+        assert instrumentation.is_enabled() is False
+        Triplet.from_bytes(b"\x81\x01\x01")
+        assert instrumentation.snapshot()["tags"] == {}
+        with instrumentation.instrumented():
+            assert vars(Triplet)["from_buffer"] is not original
+        # disabled again, the plain decoders are back
+        assert vars(Triplet)["from_buffer"] is original
+        assert isinstance(vars(Triplet)["read_header"], staticmethod)
+        assert Triplet.read_header.__module__ == "pysn1.triplet"
+
+    def test_counters(self: "TestInstrumentation") -> None:
+        data = (
+            b"\x81\x01\x01\x82\x81\x80"
+            + b"\x00" * 0x80
+            + b"\x83\x82\x01\x00" + b"\x00" * 0x100
+            + b"\x30\x80\x00\x00"
+        )
+        with instrumentation.instrumented() as metrics:
+            triplets = list(iter_triplets(data))
+            Triplet.from_bytes(buffer := b"\x85\x01\x00")
+            Triplet.from_buffer(buffer=buffer, offset=0)
+            Identifier.from_bytes(b"\xa1")
+            decode_tree(b"\xbf\x21\x00").identifier  # noqa: B018
+        assert len(triplets) == 4  # noqa: PLR2004
+        snapshot = instrumentation.snapshot()
+        assert snapshot["tags"] == {"0x85": 2, "0x81": 1, "0x82": 1, "0x83": 1, "0x30": 1, "0xbf21": 1}
+        assert snapshot["length_forms"] == {
+            "NO_EXTRA_BYTES": 4,
+            "ONE_EXTRA_BYTE": 1,
+            "TWO_EXTRA_BYTES": 1,
+            "INDEFINITE_LENGTH": 1,
+        }
+        # from_bytes -> from_int is counted once, by the outermost call
+        assert snapshot["identifiers"] == {"0xa1": 1, "0xbf21": 1}
+        assert snapshot["latency"]["Triplet.from_buffer"]["count"] == 6  # noqa: PLR2004
+        assert snapshot["latency"]["Identifier.from_bytes"]["count"] == 1
+        assert snapshot["latency"]["Identifier.from_int"]["count"] == 1
+        buckets = snapshot["latency"]["Triplet.from_bytes"]["buckets"]
+        assert sum(buckets.values()) == 1
+        assert metrics.tags[0x85] == 2  # noqa: PLR2004
+
+    def test_errors(self: "TestInstrumentation") -> None:
+        with instrumentation.instrumented():
+            with pytest.raises(TripletMissingBytesError):
+                Triplet.from_bytes(b"\x81")
+            with pytest.raises(TripletMissingBytesError):
+                Triplet.from_bytes(b"\x81\x02\x01")
+            Triplet.from_bytes(b"\x81\x00")
+        snapshot = instrumentation.snapshot()
+        assert snapshot["errors"] == {"TripletMissingBytesError": 2}
+        assert snapshot["latency"]["Triplet.from_bytes"]["count"] == 3  # noqa: PLR2004
+        instrumentation.reset()
+        assert instrumentation.snapshot() == {
+            "tags": {},
+            "length_forms": {},
+            "identifiers": {},
+            "errors": {},
+            "latency": {},
+        }
+
+    def test_threads(self: "TestInstrumentation") -> None:
+        data = b"\x85\x01\x00" * 10_000
+
+        def decode(_: int) -> int:
+            return sum(1 for _ in iter_triplets(data))
+
+        with instrumentation.instrumented(), ThreadPoolExecutor(max_workers=4) as pool:
+            assert sum(pool.map(decode, range(4))) == 40_000  # noqa: PLR2004
+        snapshot = instrumentation.snapshot()
+        # the nesting depth is per thread, a call in one thread does not hide the calls of the others
+        assert snapshot["tags"] == {"0x85": 40_000}
+        assert snapshot["latency"]["Triplet.from_buffer"]["count"] == 40_000  # noqa: PLR2004
+        assert "Triplet.read_header" not in snapshot["latency"]
+
+    def test_read_header(self: "TestInstrumentation") -> None:
+        payload = b"\x00\x01\x00\x10\x00\x00\x00\x00" + b"\x61\x07\x80\x05gcb01"
+        with instrumentation.instrumented():
+            assert GooseFilter([(0x0001, b"gcb01")]).match(payload) is True
+            assert Triplet.read_header(b"\x30\x82\x01\x00") == (0x30, 0x100, 4)
+        snapshot = instrumentation.snapshot()
+        assert snapshot["tags"] == {"0x61": 1, "0x80": 1, "0x30": 1}
+        assert snapshot["length_forms"] == {"NO_EXTRA_BYTES": 2, "TWO_EXTRA_BYTES": 1}
+        assert snapshot["latency"]["Triplet.read_header"]["count"] == 3  # noqa: PLR2004
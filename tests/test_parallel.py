@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+
+from pysn1.encoder import Constructed, encode
+from pysn1.parallel import ParallelDecodeError, Records, decode_parallel, frame_table
+from pysn1.tree import decode_tree
+from pysn1.triplet import Triplet
+from tests.test_pcap import GOOSE_PDU, SV_PDU, _pcap
+
+FRAMES = [
+    bytes(
+        encode(
+            Constructed(
+                tag=0x61,
+                children=(
+                    Triplet.build(tag=0x80, value=b"LD/LLN0$GO$gcb"),
+                    Constructed(tag=0xAB, children=(Triplet.build(tag=0x83, value=bytes((index & 1,))),)),
+                ),
+            ),
+        ),
+    )
+    for index in range(20)
+]
+FRAMES[7] = bytes(Triplet.build(tag=0x04, value=b"\x01" * 0x100))
+BUFFER = b"".join(FRAMES)
+
+
+def _expected(buffer: bytes) -> list[tuple[int, int, int, int, int]]:
+    rows: list[tuple[int, int, int, int, int]] = []
+    for index, (offset, _) in enumerate(frame_table(buffer)):
+        rows.extend(
+            (index, node.tag, node.offset, node.value_offset, node.triplet.length)
+            for node in decode_tree(buffer, offset).walk()
+        )
+    return rows
+
+
+def _rows(records: Records) -> list[tuple[int, int, int, int, int]]:
+    return list(zip(records.frame, records.tag, records.offset, records.value_offset, records.length, strict=True))
+
+
+class TestParallel:
+    def test_frame_table(self: "TestParallel") -> None:
+        table = frame_table(BUFFER)
+        assert [BUFFER[offset : offset + length] for offset, length in table] == FRAMES
+
+    def test_frame_table_indefinite(self: "TestParallel") -> None:
+        frames = [b"\x61\x80\xab\x80\x83\x01\x00\x00\x00\x00\x00", FRAMES[0], b"\x61\x80\x00\x00"]
+        buffer = b"".join(frames)
+        assert [buffer[offset : offset + length] for offset, length in frame_table(buffer)] == frames
+        assert _rows(decode_parallel(buffer, workers=1)) == _expected(buffer)
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_parallel_order(self: "TestParallel", workers: int) -> None:
+        records = decode_parallel(BUFFER, workers=workers, chunk_frames=3)
+        assert _rows(records) == _expected(BUFFER)
+        assert records.frames == len(FRAMES)
+
+    def test_parallel_parent(self: "TestParallel") -> None:
+        records = decode_parallel(BUFFER, workers=2, chunk_frames=3)
+        rows = records.rows(19)
+        assert [records.tag[row] for row in rows] == [0x61, 0x80, 0xAB, 0x83]
+        assert [records.parent[row] for row in rows] == [-1, 0, 0, 2]
+        assert [records.tag[row] for row in records.rows(7)] == [0x04]
+
+    def test_parallel_frames(self: "TestParallel") -> None:
+        records = decode_parallel(BUFFER, [(0, len(FRAMES[0]))], workers=1)
+        assert records.frames == 1
+        assert len(records) == len(list(decode_tree(BUFFER).walk()))
+
+    def test_parallel_capture(self: "TestParallel", tmp_path: Path) -> None:
+        records = decode_parallel(_pcap(tmp_path / "goose.pcap"), workers=2)
+        assert [records.tag[records.starts[frame]] for frame in range(records.frames)] == [GOOSE_PDU[0], SV_PDU[0]]
+
+    def test_parallel_bad_frame(self: "TestParallel") -> None:
+        buffer = BUFFER + b"\x30\x05\x02\x01"
+        with pytest.raises(ParallelDecodeError, match="Frame 20"):
+            decode_parallel(buffer, [*frame_table(BUFFER), (len(BUFFER), 4)], workers=2, chunk_frames=3)
@@ -0,0 +1,111 @@
+import logging
+from pathlib import Path
+from struct import pack
+
+import pytest
+
+from pysn1.__main__ import main
+from pysn1.encoder import Constructed, encode
+from pysn1.pcap import ETHERTYPE_GOOSE, ETHERTYPE_SV, CaptureReader, PcapFormatError
+from pysn1.triplet import Triplet
+
+GOOSE_PDU = bytes(encode(Constructed(tag=0x61, children=(Triplet.build(tag=0x80, value=b"LD/LLN0$GO$gcb"),))))
+SV_PDU = bytes(encode(Constructed(tag=0x60, children=(Triplet.build(tag=0x80, value=b"\x01"),))))
+MACS = b"\x01\x0c\xcd\x01\x00\x01" + b"\x00\x11\x22\x33\x44\x55"
+
+
+def _ethernet(ethertype: int, pdu: bytes, appid: int = 0x0001, *, vlan: bool = False) -> bytes:
+    tag = pack("!HH", 0x8100, 0x8004) if vlan else b""
+    return MACS + tag + pack("!HHHHH", ethertype, appid, len(pdu) + 8, 0, 0) + pdu
+
+
+PACKETS = [
+    _ethernet(ETHERTYPE_GOOSE, GOOSE_PDU),
+    MACS + pack("!H", 0x0800) + b"\x45" * 20,  # IPv4, skipped
+    _ethernet(ETHERTYPE_SV, SV_PDU, appid=0x4000, vlan=True),
+]
+
+
+def _pcap(path: Path, endian: str = "<", magic: int = 0xA1B2C3D4) -> Path:
+    data = pack(endian + "IHHiIII", magic, 2, 4, 0, 0, 0xFFFF, 1)
+    for index, packet in enumerate(PACKETS):
+        data += pack(endian + "IIII", 10 + index, 500, len(packet), len(packet)) + packet
+    path.write_bytes(data)
+    return path
+
+
+def _block(block_type: int, body: bytes) -> bytes:
+    body += b"\x00" * (-len(body) % 4)
+    return pack("<II", block_type, len(body) + 12) + body + pack("<I", len(body) + 12)
+
+
+def _pcapng(path: Path) -> Path:
+    data = _block(0x0A0D0D0A, pack("<IHHq", 0x1A2B3C4D, 1, 0, -1))
+    data += _block(0x00000001, pack("<HHI", 1, 0, 0) + pack("<HHB3x", 9, 1, 9) + pack("<HH", 0, 0))
+    timestamp = 10 * 10**9 + 500
+    for packet in PACKETS[:2]:
+        header = pack("<IIIII", 0, timestamp >> 32, timestamp & 0xFFFFFFFF, len(packet), len(packet))
+        data += _block(0x00000006, header + packet)
+    data += _block(0x00000003, pack("<I", len(PACKETS[2])) + PACKETS[2])
+    path.write_bytes(data)
+    return path
+
+
+class TestPcap:
+    @pytest.mark.parametrize("endian", ["<", ">"])
+    def test_pcap_frames(self: "TestPcap", tmp_path: Path, endian: str) -> None:
+        with CaptureReader(_pcap(tmp_path / "goose.pcap", endian)) as reader:
+            frames = [
+                (frame.index, frame.timestamp_ns, frame.ethertype, frame.appid, bytes(frame.pdu)) for frame in reader
+            ]
+        assert frames == [
+            (0, 10_000_500_000, ETHERTYPE_GOOSE, 0x0001, GOOSE_PDU),
+            (2, 12_000_500_000, ETHERTYPE_SV, 0x4000, SV_PDU),
+        ]
+
+    def test_pcap_nanoseconds(self: "TestPcap", tmp_path: Path) -> None:
+        with CaptureReader(_pcap(tmp_path / "goose.pcap", magic=0xA1B23C4D)) as reader:
+            assert [frame.timestamp_ns for frame in reader] == [10_000_000_500, 12_000_000_500]
+
+    def test_pcap_payload(self: "TestPcap", tmp_path: Path) -> None:
+        with CaptureReader(_pcap(tmp_path / "goose.pcap")) as reader:
+            frame = next(iter(reader))
+            assert bytes(frame.payload[:4]) == pack("!HH", 0x0001, len(GOOSE_PDU) + 8)
+            assert frame.pdu.obj is frame.payload.obj
+
+    def test_pcap_offset(self: "TestPcap", tmp_path: Path) -> None:
+        path = _pcapng(tmp_path / "goose.pcapng")
+        data = path.read_bytes()
+        with CaptureReader(path) as reader:
+            offsets = [(frame.offset, len(frame.pdu)) for frame in reader]
+        assert [data[offset : offset + length] for offset, length in offsets] == [GOOSE_PDU, SV_PDU]
+
+    def test_pcapng_frames(self: "TestPcap", tmp_path: Path) -> None:
+        with CaptureReader(_pcapng(tmp_path / "goose.pcapng")) as reader:
+            frames = [(frame.index, frame.timestamp_ns, frame.ethertype, bytes(frame.pdu)) for frame in reader]
+        assert frames == [(0, 10_000_000_500, ETHERTYPE_GOOSE, GOOSE_PDU), (2, 0, ETHERTYPE_SV, SV_PDU)]
+
+    def test_pcap_not_a_capture(self: "TestPcap", tmp_path: Path) -> None:
+        path = tmp_path / "text.pcap"
+        path.write_bytes(b"not a capture")
+        with CaptureReader(path) as reader, pytest.raises(PcapFormatError, match="not a pcap or pcapng"):
+            list(reader)
+
+    def test_pcap_empty(self: "TestPcap", tmp_path: Path) -> None:
+        path = tmp_path / "empty.pcap"
+        path.write_bytes(b"")
+        with pytest.raises(PcapFormatError, match="empty"):
+            CaptureReader(path)
+
+    def test_pcap_truncated(self: "TestPcap", tmp_path: Path) -> None:
+        path = _pcap(tmp_path / "goose.pcap")
+        path.write_bytes(path.read_bytes()[:-1])
+        with CaptureReader(path) as reader, pytest.raises(PcapFormatError, match="packet 2 is truncated"):
+            list(reader)
+
+    def test_pcap_main(self: "TestPcap", tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+        path = _pcap(tmp_path / "goose.pcap")
+        with caplog.at_level(logging.INFO):
+            main(["pcap", str(path)])
+        assert "2 frames (1 GOOSE, 1 SV), 4 elements, 0 errors" in caplog.text
+        assert "frames/s" in caplog.text
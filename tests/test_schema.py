@@ -0,0 +1,113 @@
+import pytest
+
+from pysn1.encoder import Constructed, encode
+from pysn1.schema import Field, Schema, SchemaFormatError, SchemaMismatchError, compile_schema
+from pysn1.triplet import Triplet
+
+GOCB_REF = b"IED1LD0/LLN0$GO$gcb01"
+SCHEMA = Schema(
+    tag=0x61,
+    fields=(
+        Field(name="gocbRef", tag=0x80, format=f"{len(GOCB_REF)}s"),
+        Field(name="stNum", tag=0x85, format="I"),
+        Field(name="sqNum", tag=0x86, format="I"),
+        Field(
+            name="allData",
+            tag=0xAB,
+            children=(
+                Field(name="stVal", tag=0x83, format="?"),
+                Field(name="mag", tag=0x87, format="5s"),
+                Field(name="count", tag=0x85, format="b"),
+            ),
+        ),
+    ),
+)
+
+
+def _pdu(st_num: bytes = b"\x00\x00\x00\x07", sq_num: bytes = b"\x00\x00\x01\x00") -> bytes:
+    return bytes(
+        encode(
+            Constructed(
+                tag=0x61,
+                children=(
+                    Triplet.build(tag=0x80, value=GOCB_REF),
+                    Triplet.build(tag=0x85, value=st_num),
+                    Triplet.build(tag=0x86, value=sq_num),
+                    Constructed(
+                        tag=0xAB,
+                        children=(
+                            Triplet.build(tag=0x83, value=b"\xff"),
+                            Triplet.build(tag=0x87, value=b"\x08\x41\x20\x00\x00"),
+                            Triplet.build(tag=0x85, value=b"\xfe"),
+                        ),
+                    ),
+                ),
+            ),
+        ),
+    )
+
+
+EXPECTED = {
+    "gocbRef": GOCB_REF,
+    "stNum": 7,
+    "sqNum": 256,
+    "allData": {"stVal": True, "mag": b"\x08\x41\x20\x00\x00", "count": -2},
+}
+
+
+class TestSchema:
+    def test_schema_compiled(self: "TestSchema") -> None:
+        assert SCHEMA.decode(_pdu()) == EXPECTED
+
+    def test_schema_offset(self: "TestSchema") -> None:
+        assert SCHEMA.decode(b"\x00\x00" + _pdu() + b"\x00", 2) == EXPECTED
+
+    def test_schema_cached(self: "TestSchema") -> None:
+        assert SCHEMA.compile() is compile_schema(SCHEMA)
+        assert Schema(tag=SCHEMA.tag, fields=SCHEMA.fields).compile() is SCHEMA.compile()
+
+    def test_schema_decoder_kept(self: "TestSchema") -> None:
+        schema = Schema(tag=SCHEMA.tag, fields=SCHEMA.fields)
+        schema.decode(_pdu())
+        compile_schema.cache_clear()
+        assert schema.decode(_pdu()) == EXPECTED
+        assert compile_schema.cache_info().misses == 0
+        assert schema == SCHEMA
+        assert hash(schema) == hash(SCHEMA)
+
+    def test_schema_fallback(self: "TestSchema") -> None:
+        # BER integers shrink to the minimum length, so the fixed layout no longer matches
+        decoded = SCHEMA.decode(_pdu(st_num=b"\x07", sq_num=b"\x01\x00"))
+        assert decoded == EXPECTED
+
+    def test_schema_fallback_short_buffer(self: "TestSchema") -> None:
+        pdu = _pdu(st_num=b"\x07", sq_num=b"\x01\x00")
+        assert len(pdu) < SCHEMA.root.encoded_length()
+        assert SCHEMA.decode(memoryview(pdu)) == EXPECTED
+
+    def test_schema_mismatch_tag(self: "TestSchema") -> None:
+        with pytest.raises(SchemaMismatchError) as exc_info:
+            SCHEMA.decode(b"\x62\x00")
+        assert exc_info.match("Schema field '' expects tag 0x61, got 0x62")
+
+    def test_schema_mismatch_elements(self: "TestSchema") -> None:
+        with pytest.raises(SchemaMismatchError) as exc_info:
+            SCHEMA.decode(bytes(Triplet.build(tag=0x61, value=bytes(Triplet.build(tag=0x80, value=GOCB_REF)))))
+        assert exc_info.match("Schema field '' expects 4 elements, got 1")
+
+    def test_schema_encoded_length(self: "TestSchema") -> None:
+        assert SCHEMA.root.encoded_length() == len(_pdu())
+        assert SCHEMA.fields[1].header() == b"\x85\x04"
+
+    @pytest.mark.parametrize("fmt", ["2B", "2H", "BH", "3x", ""])
+    def test_field_format_one_value(self: "TestSchema", fmt: str) -> None:
+        with pytest.raises(SchemaFormatError, match="expected 1"):
+            Field(name="value", tag=0x85, format=fmt)
+
+    def test_field_format_invalid(self: "TestSchema") -> None:
+        with pytest.raises(SchemaFormatError, match="invalid format 'Z'"):
+            Field(name="value", tag=0x85, format="Z")
+
+    def test_field_format_constructed(self: "TestSchema") -> None:
+        with pytest.raises(SchemaFormatError, match="would be ignored"):
+            Field(name="value", tag=0xA0, format="B", children=(Field(name="child", tag=0x80, format="B"),))
@@ -0,0 +1,84 @@
+import pytest
+
+from pysn1.encoder import Constructed, encode
+from pysn1.template import Template, TemplateFieldError
+from pysn1.triplet import Triplet
+
+GOOSE_PDU = Constructed(
+    tag=0x61,
+    children=(
+        Triplet.build(tag=0x80, value=b"IED1LD0/LLN0$GO$gcb01"),
+        Triplet.build(tag=0x84, value=b"\x00" * 8),
+        Triplet.build(tag=0x85, value=b"\x01"),
+        Triplet.build(tag=0x86, value=b"\x00"),
+        Constructed(
+            tag=0xAB,
+            children=(
+                Triplet.build(tag=0x83, value=b"\x00"),
+                Triplet.build(tag=0x84, value=b"\x03\x00\x00"),
+            ),
+        ),
+    ),
+)
+FIELDS = {"t": (1,), "stNum": (2,), "sqNum": (3,), "stVal": (4, 0)}
+
+
+class TestTemplate:
+    def test_template_encode(self: "TestTemplate") -> None:
+        template = Template(GOOSE_PDU, FIELDS)
+        assert bytes(template) == encode(GOOSE_PDU)
+        assert len(template) == len(encode(GOOSE_PDU))
+        assert template["stNum"] == b"\x01"
+        assert template["stVal"] == b"\x00"
+
+    def test_template_location(self: "TestTemplate") -> None:
+        template = Template(GOOSE_PDU, FIELDS)
+        location = template.location("t")
+        assert location.path == (1,)
+        assert location.length == 8  # noqa: PLR2004
+        assert bytes(template)[location.offset - 2 : location.offset] == b"\x84\x08"
+
+    def test_template_update_in_place(self: "TestTemplate") -> None:
+        template = Template(GOOSE_PDU, FIELDS)
+        frame = template.frame
+        assert template.update({"sqNum": b"\x01", "stVal": b"\x01"}) is True
+        assert template.reencodes == 0
+        assert frame[template.location("stVal").offset] == 1
+        assert template["sqNum"] == b"\x01"
+        assert bytes(template) == encode(template.element)
+
+    def test_template_update_reencode(self: "TestTemplate") -> None:
+        template = Template(GOOSE_PDU, FIELDS)
+        template["stVal"] = b"\x01"
+        offset = template.location("stVal").offset
+        assert template.update({"sqNum": b"\x00\x80"}) is False
+        assert template.reencodes == 1
+        assert template["sqNum"] == b"\x00\x80"
+        assert template["stVal"] == b"\x01"
+        assert template.location("stVal").offset == offset + 1
+        assert bytes(template) == encode(template.element)
+        assert Triplet.from_bytes(bytes(template)).length == len(template) - 2
+
+    def test_template_update_after_reencode(self: "TestTemplate") -> None:
+        template = Template(GOOSE_PDU, FIELDS)
+        template["sqNum"] = b"\x00\x80"
+        template["sqNum"] = b"\x00\x81"
+        assert template.reencodes == 1
+        assert template["sqNum"] == b"\x00\x81"
+        assert bytes(template) == encode(template.element)
+
+    def test_template_unknown_field(self: "TestTemplate") -> None:
+        template = Template(GOOSE_PDU, FIELDS)
+        with pytest.raises(KeyError):
+            template["confRev"] = b"\x01"
+
+    def test_template_bad_path(self: "TestTemplate") -> None:
+        with pytest.raises(TemplateFieldError) as exc_info:
+            Template(GOOSE_PDU, {"allData": (4,)})
+        assert exc_info.match(r"Template field path \(4,\) does not end in a primitive element")
+        with pytest.raises(TemplateFieldError) as exc_info:
+            Template(GOOSE_PDU, {"missing": (9,)})
+        assert exc_info.match(r"Template field path \(9,\) index 9 is out of range at depth 0")
+        with pytest.raises(TemplateFieldError) as exc_info:
+            Template(GOOSE_PDU, {"deep": (2, 0)})
+        assert exc_info.match(r"Template field path \(2, 0\) goes through a primitive element at depth 1")
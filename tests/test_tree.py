@@ -0,0 +1,149 @@
+import logging
+from pathlib import Path
+
+import pytest
+
+from pysn1.__main__ import main
+from pysn1.debugger import ContextType, IdentifierClass
+from pysn1.tree import Node, NodeNotFoundError, decode_tree, iter_dump
+from pysn1.triplet import Triplet
+
+GOCB_REF = b"IED1LD0/LLN0$GO$gcb01"
+ALL_DATA = bytes(Triplet.build(tag=0x83, value=b"\x01")) + bytes(Triplet.build(tag=0x84, value=b"\x03\x00\x00"))
+GOOSE_PDU = bytes(
+    Triplet.build(
+        tag=0x61,
+        value=bytes(Triplet.build(tag=0x80, value=GOCB_REF))
+        + bytes(Triplet.build(tag=0x85, value=b"\x07"))
+        + bytes(Triplet.build(tag=0x86, value=b"\x2a"))
+        + bytes(Triplet.build(tag=0xAB, value=ALL_DATA)),
+    ),
+)
+
+
+class TestTree:
+    def test_decode_tree_root(self: "TestTree") -> None:
+        root = decode_tree(GOOSE_PDU)
+        assert root.tag == 0x61  # noqa: PLR2004
+        assert root.offset == 0
+        assert root.value_offset == 2  # noqa: PLR2004
+        assert root.identifier.reference == IdentifierClass.APPLICATION
+        assert root.identifier.constructed is True
+        assert root.expanded is False
+
+    def test_decode_tree_children(self: "TestTree") -> None:
+        root = decode_tree(GOOSE_PDU)
+        assert [child.tag for child in root] == [0x80, 0x85, 0x86, 0xAB]
+        assert root.expanded is True
+        assert root[0].value == GOCB_REF
+        assert root[0].offset == 2  # noqa: PLR2004
+        assert GOOSE_PDU[root[0].value_offset : root[0].value_offset + root[0].triplet.length] == GOCB_REF
+
+    def test_decode_tree_lazy(self: "TestTree") -> None:
+        root = decode_tree(GOOSE_PDU)
+        assert root.find(0x85).value == b"\x07"
+        assert root.find(0x86).value == b"\x2a"
+        all_data = root.find(0xAB)
+        assert all_data.expanded is False
+
+    def test_decode_tree_cached(self: "TestTree") -> None:
+        all_data = decode_tree(GOOSE_PDU).find(0xAB)
+        assert all_data.children is all_data.children
+        assert [child.tag for child in all_data] == [0x83, 0x84]
+        assert all_data[1].identifier.datatype == ContextType(value=4)
+        assert all_data[1].value == b"\x03\x00\x00"
+
+    def test_decode_tree_walk(self: "TestTree") -> None:
+        tags = [node.tag for node in decode_tree(GOOSE_PDU).walk()]
+        assert tags == [0x61, 0x80, 0x85, 0x86, 0xAB, 0x83, 0x84]
+
+    def test_decode_tree_primitive(self: "TestTree") -> None:
+        node, end = Node.from_buffer(b"\x00\x81\x01\x01", offset=1)
+        assert end == 4  # noqa: PLR2004
+        assert node.children == ()
+        assert list(node) == []
+
+    def test_decode_tree_not_found(self: "TestTree") -> None:
+        with pytest.raises(NodeNotFoundError) as exc_info:
+            decode_tree(GOOSE_PDU).find(0x99)
+        assert exc_info.match("Node has no child with tag 0x99")
+
+    def test_decode_tree_high_tag(self: "TestTree") -> None:
+        root = decode_tree(b"\xbf\x22\x04\x9f\x23\x01\x01")
+        assert root.identifier.datatype == ContextType(value=34)
+        assert root.identifier.constructed is True
+        assert [child.tag for child in root] == [0x9F23]
+        assert root[0].identifier.datatype == ContextType(value=35)
+        assert root[0].offset == 3  # noqa: PLR2004
+
+    def test_decode_tree_unknown_tags(self: "TestTree") -> None:
+        root = decode_tree(b"\x30\x04\xdf\x40\x01\x00")
+        assert root[0].identifier.label == "Private 64"
+        # 0x9f05 has no Identifier (high-tag form for a low number), the tree is walked regardless
+        root = decode_tree(b"\x30\x09\x9f\x05\x01\x00\xbf\x05\x02\x01\x00")
+        assert [node.tag for node in root.walk()] == [0x30, 0x9F05, 0xBF05, 0x01]
+
+    def test_decode_tree_long_form_length(self: "TestTree") -> None:
+        # 0x83 00 01 00 for 256 is valid BER, but not the shortest length form len(triplet) assumes
+        buffer = b"\x00\x30\x83\x00\x01\x00" + b"\x04\x81\xfd" + b"A" * 253
+        root, end = Node.from_buffer(buffer, 1)
+        assert end == len(buffer)
+        assert (root.offset, root.header, root.value_offset) == (1, 5, 6)
+        assert (root[0].offset, root[0].value_offset) == (6, 9)
+        assert bytes(buffer[root[0].value_offset : root[0].value_offset + 3]) == b"AAA"
+        assert [node.offset for node in root.walk()] == [1, 6]
+
+    def test_decode_tree_indefinite(self: "TestTree") -> None:
+        root = decode_tree(b"\x30\x80\x04\x01\x01\xa0\x80\x02\x01\x05\x00\x00\x00\x00")
+        assert root.value_offset == 2  # noqa: PLR2004
+        assert [(node.tag, node.offset, node.value_offset) for node in root.walk()] == [
+            (0x30, 0, 2),
+            (0x04, 2, 4),
+            (0xA0, 5, 7),
+            (0x02, 7, 9),
+        ]
+
+
+class TestTreeDump:
+    def test_dump(self: "TestTreeDump") -> None:
+        lines = list(iter_dump(GOOSE_PDU))
+        length = len(GOOSE_PDU) - 2
+        assert lines[0] == f"00000000  61 {length:02x}  Application 1 [Constructed], {length} bytes"
+        assert lines[1] == "00000002    80 15  Context 0, 21 bytes"
+        assert lines[2] == "00000004      49 45 44 31 4c 44 30 2f 4c 4c 4e 30 24 47 4f 24  |IED1LD0/LLN0$GO$|"
+        assert lines[3].startswith("00000014      67 63 62 30 31 ")
+        assert lines[3].endswith("|gcb01|")
+        assert lines[-2] == "00000024      84 03  Context 4, 3 bytes"
+        assert lines[-1].startswith("00000026        03 00 00 ")
+
+    def test_dump_long_form_length(self: "TestTreeDump") -> None:
+        buffer = b"\x30\x82\x01\x05" + b"\x30\x83\x00\x01\x00" + b"\x04\x81\xfd" + b"A" * 253
+        lines = list(iter_dump(buffer))
+        assert lines[1] == "00000004    30 83 00 01 00  Universal Sequence_of [Constructed], 256 bytes"
+        assert lines[2] == "00000009      04 81 fd  Universal Octet_string, 253 bytes"
+        assert lines[3].startswith("0000000c        41 41 ")
+
+    def test_dump_unknown_tags(self: "TestTreeDump") -> None:
+        assert list(iter_dump(b"\x30\x06\xdf\x40\x00\x9f\x05\x00")) == [
+            "00000000  30 06  Universal Sequence_of [Constructed], 6 bytes",
+            "00000002    df 40 00  Private 64, 0 bytes",
+            "00000005    9f 05 00  Tag 0x9f05, 0 bytes",
+        ]
+
+    def test_dump_streams(self: "TestTreeDump") -> None:
+        data = bytes(Triplet.build(tag=0x04, value=b"\x00" * 0x10000))
+        lines = iter_dump(data)
+        assert next(lines) == "00000000  04 83 01 00 00  Universal Octet_string, 65536 bytes"
+        assert next(lines).startswith("00000005    00 00")
+        assert sum(1 for _ in lines) == 0x10000 // 16 - 1
+
+    def test_dump_width(self: "TestTreeDump") -> None:
+        lines = list(iter_dump(b"\x04\x03abc", width=2))
+        assert lines[1:] == ["00000002    61 62  |ab|", "00000004    63     |c|"]
+
+    def test_dump_main(self: "TestTreeDump", tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+        path = tmp_path / "goose.ber"
+        path.write_bytes(GOOSE_PDU)
+        with caplog.at_level(logging.INFO):
+            main(["dump", str(path)])
+        assert caplog.messages == list(iter_dump(GOOSE_PDU))
@@ -106,6 +106,199 @@ class TestTripletFromBytes:
         assert exc_info.match("Triplet extended length is missing bytes")
 
 
+class TestTripletFromBuffer:
+    def test_from_buffer(self: "TestTripletFromBuffer") -> None:
+        bytestring = b"\x81\x01\x01"
+        triplet, end = t.Triplet.from_buffer(bytestring)
+        assert triplet.tag == DEFAULT_TAG
+        assert triplet.length == 1
+        assert isinstance(triplet.value, memoryview)
+        assert triplet.value == b"\x01"
+        assert end == len(bytestring)
+        assert bytes(triplet) == bytestring
+
+    def test_from_buffer_offset(self: "TestTripletFromBuffer") -> None:
+        bytestring = b"\x00\x00\x81\x02ab\x01"
+        triplet, end = t.Triplet.from_buffer(bytestring, offset=2)
+        assert triplet.tag == DEFAULT_TAG
+        assert triplet.value == b"ab"
+        assert end == 6  # noqa: PLR2004
+
+    def test_from_buffer_zero_copy(self: "TestTripletFromBuffer") -> None:
+        buffer = bytearray(b"\x81\x02ab")
+        triplet, _ = t.Triplet.from_buffer(buffer)
+        buffer[2:4] = b"cd"
+        assert triplet.value == b"cd"
+
+    def test_from_buffer_extended_length_2(self: "TestTripletFromBuffer") -> None:
+        length = 0x100
+        value = (b"\x00" * (length - 1)) + b"\x01"
+        bytestring = b"\x81\x82\x01\x00" + value
+        triplet, end = t.Triplet.from_buffer(memoryview(bytestring))
+        assert triplet.length == length
+        assert triplet.value == value
+        assert end == len(bytestring)
+        assert len(triplet) == len(bytestring)
+
+    def test_from_buffer_read_header(self: "TestTripletFromBuffer") -> None:
+        assert t.Triplet.read_header(b"\x00\x81\x81\x80", offset=1) == (DEFAULT_TAG, 0x80, 4)
+
+    def test_from_buffer_missing_header(self: "TestTripletFromBuffer") -> None:
+        with pytest.raises(t.TripletMissingBytesError) as exc_info:
+            t.Triplet.from_buffer(b"\x81\x01\x01", offset=2)
+        assert exc_info.match("Triplet header at offset 2 is missing bytes")
+
+    def test_from_buffer_missing_bytes_value(self: "TestTripletFromBuffer") -> None:
+        with pytest.raises(t.TripletMissingBytesError) as exc_info:
+            t.Triplet.from_buffer(b"\x81\x02\x01")
+        assert exc_info.match("Triplet length is 2, but value contains only 1 bytes")
+
+
+class TestTripletLengthForms:
+    @pytest.mark.parametrize(
+        ("header", "length"),
+        [
+            (b"\x81\x7f", 0x7F),
+            (b"\x81\x81\x80", 0x80),
+            (b"\x81\x82\x01\x00", 0x100),
+            (b"\x81\x83\x01\x00\x00", 0x10000),
+            (b"\x81\x84\x00\x01\x00\x00", 0x10000),
+        ],
+    )
+    def test_length_forms(self: "TestTripletLengthForms", header: bytes, length: int) -> None:
+        triplet, end = t.Triplet.from_buffer(header + b"\x01" * length)
+        assert triplet.length == length
+        assert end == len(header) + length
+
+    def test_length_three_bytes_encode(self: "TestTripletLengthForms") -> None:
+        triplet = t.Triplet.build(tag=DEFAULT_TAG, value=b"\x01" * 0x10000)
+        assert bytes(triplet)[:5] == b"\x81\x83\x01\x00\x00"
+        assert len(bytes(triplet)) == len(triplet)
+
+    def test_length_partial_extended_length(self: "TestTripletLengthForms") -> None:
+        with pytest.raises(t.TripletMissingBytesError) as exc_info:
+            t.Triplet.from_bytes(b"\x81\x82\x01")
+        assert exc_info.match("Triplet extended length is missing bytes")
+
+    def test_length_too_big(self: "TestTripletLengthForms") -> None:
+        with pytest.raises(t.TripletLengthTooBigError) as exc_info:
+            t.Triplet.from_bytes(b"\x81\x85\x01")
+        assert exc_info.match("Triplet with extended length > 4 not implemented")
+
+
+class TestTripletHighTag:
+    def test_high_tag_from_bytes(self: "TestTripletHighTag") -> None:
+        bytestring = b"\xbf\x81\x48\x01\x01"
+        triplet = t.Triplet.from_bytes(bytestring)
+        assert triplet.tag == 0xBF8148  # noqa: PLR2004
+        assert triplet.length == 1
+        assert triplet.value == b"\x01"
+        assert len(triplet) == len(bytestring)
+        assert bytes(triplet) == bytestring
+
+    def test_high_tag_from_buffer(self: "TestTripletHighTag") -> None:
+        triplet, end = t.Triplet.from_buffer(b"\x9f\x22\x81\x80" + b"\x00" * 0x80)
+        assert triplet.tag == 0x9F22  # noqa: PLR2004
+        assert triplet.length == 0x80  # noqa: PLR2004
+        assert end == 0x84  # noqa: PLR2004
+
+    def test_high_tag_build(self: "TestTripletHighTag") -> None:
+        triplet = t.Triplet.build(tag=0x9F22, value=b"ab")
+        assert bytes(triplet) == b"\x9f\x22\x02ab"
+        assert len(triplet) == 5  # noqa: PLR2004
+
+    def test_high_tag_missing_bytes(self: "TestTripletHighTag") -> None:
+        with pytest.raises(t.TripletMissingBytesError) as exc_info:
+            t.Triplet.from_bytes(b"\x9f\x81\x01")
+        assert exc_info.match("Triplet header at offset 0 is missing bytes")
+
+
+class TestIterTriplets:
+    def test_iter_triplets(self: "TestIterTriplets") -> None:
+        bytestring = b"\x81\x01\x01\x82\x00\x83\x02ab"
+        triplets = list(t.iter_triplets(bytestring))
+        assert [offset for offset, _ in triplets] == [0, 3, 5]
+        assert [triplet.tag for _, triplet in triplets] == [0x81, 0x82, 0x83]
+        assert [bytes(triplet.value) for _, triplet in triplets] == [b"\x01", b"", b"ab"]
+
+    def test_iter_triplets_range(self: "TestIterTriplets") -> None:
+        bytestring = b"\xa0\x05\x81\x01\x01\x82\x00\xff"
+        triplets = list(t.iter_triplets(bytestring, start=2, end=7))
+        assert [(offset, triplet.tag) for offset, triplet in triplets] == [(2, 0x81), (5, 0x82)]
+
+    def test_iter_triplets_empty(self: "TestIterTriplets") -> None:
+        assert list(t.iter_triplets(b"")) == []
+
+    def test_iter_triplets_truncated(self: "TestIterTriplets") -> None:
+        iterator = t.iter_triplets(b"\x81\x01\x01\x82\x02\x01")
+        assert next(iterator)[1].value == b"\x01"
+        with pytest.raises(t.TripletMissingBytesError) as exc_info:
+            next(iterator)
+        assert exc_info.match("Triplet length is 2, but value contains only 1 bytes")
+
+    def test_iter_triplets_truncated_by_end(self: "TestIterTriplets") -> None:
+        with pytest.raises(t.TripletMissingBytesError) as exc_info:
+            list(t.iter_triplets(b"\x81\x02\x01\x01", end=3))
+        assert exc_info.match("Triplet length is 2, but value contains only 1 bytes")
+
+    def test_iter_triplets_end_too_big(self: "TestIterTriplets") -> None:
+        with pytest.raises(t.TripletMissingBytesError) as exc_info:
+            list(t.iter_triplets(b"\x81\x00", end=3))
+        assert exc_info.match("Triplet buffer ends at 3, but buffer contains only 2 bytes")
+
+
+class TestTripletIndefiniteLength:
+    # 0x30 0x80 [0x04 0x01 0x01] [0xa0 0x80 [0x02 0x01 0x05] 0x00 0x00] 0x00 0x00
+    BER = b"\x30\x80\x04\x01\x01\xa0\x80\x02\x01\x05\x00\x00\x00\x00"
+
+    def test_from_buffer(self: "TestTripletIndefiniteLength") -> None:
+        triplet, end = t.Triplet.from_buffer(self.BER + b"\xff")
+        assert triplet.indefinite is True
+        assert triplet.tag == 0x30  # noqa: PLR2004
+        assert bytes(triplet.value) == self.BER[2:-2]
+        assert triplet.length == len(self.BER) - 4
+        assert end == len(self.BER)
+        assert len(triplet) == len(self.BER)
+        assert bytes(triplet) == self.BER
+
+    def test_from_bytes(self: "TestTripletIndefiniteLength") -> None:
+        triplet = t.Triplet.from_bytes(self.BER)
+        assert triplet.value == self.BER[2:-2]
+        assert bytes(triplet) == self.BER
+
+    def test_nested(self: "TestTripletIndefiniteLength") -> None:
+        triplets = list(t.iter_triplets(t.Triplet.from_bytes(self.BER).value))
+        assert [(offset, triplet.tag, triplet.indefinite) for offset, triplet in triplets] == [
+            (0, 0x04, False),
+            (3, 0xA0, True),
+        ]
+        assert bytes(triplets[1][1].value) == b"\x02\x01\x05"
+
+    def test_find_end_of_contents(self: "TestTripletIndefiniteLength") -> None:
+        assert t.find_end_of_contents(self.BER, 2) == len(self.BER) - 2
+        assert t.find_end_of_contents(b"\x04\x82\x01\x00" + b"\x00" * 0x100 + b"\x00\x00") == 0x104  # noqa: PLR2004
+
+    def test_read_header(self: "TestTripletIndefiniteLength") -> None:
+        with pytest.raises(t.TripletIndefiniteLengthError) as exc_info:
+            t.Triplet.read_header(self.BER)
+        assert exc_info.match(r"indefinite length form \(0x80\)")
+
+    def test_primitive(self: "TestTripletIndefiniteLength") -> None:
+        with pytest.raises(t.TripletBadLengthError) as exc_info:
+            t.Triplet.from_bytes(b"\x04\x80\x01\x00\x00")
+        assert exc_info.match("Triplet at offset 0 is primitive")
+
+    def test_missing_end_of_contents(self: "TestTripletIndefiniteLength") -> None:
+        with pytest.raises(t.TripletMissingBytesError) as exc_info:
+            t.Triplet.from_bytes(self.BER[:-2])
+        assert exc_info.match("Triplet with indefinite length at offset 2 is missing the end-of-contents octets")
+
+    def test_bad_end_of_contents(self: "TestTripletIndefiniteLength") -> None:
+        with pytest.raises(t.TripletBadLengthError) as exc_info:
+            t.Triplet.from_bytes(b"\x30\x80\x00\x01\x00")
+        assert exc_info.match("end-of-contents at offset 2 has a non-zero length")
+
+
 class TestTriplet:
     def test_from_bytes(self: "TestTriplet") -> None:
         bytestring = b"\x81\x01\x01"
@@ -184,3 +377,79 @@ class TestTriplet:
         with pytest.raises(t.TripletMissingBytesError) as exc_info:
             t.Triplet(tag=DEFAULT_TAG, length=2, value=b"\x01")
         assert exc_info.match("Triplet length is 2, but value contains only 1 bytes")
+
+
+class TestTripletValidation:
+    def test_default(self: "TestTripletValidation") -> None:
+        assert t.get_validation() is t.Validation.TRUSTED
+        triplet = t.Triplet.from_bytes(b"\x81\x01\x01")
+        assert triplet == t.Triplet(tag=DEFAULT_TAG, length=1, value=b"\x01")
+        assert t.unchecked_triplet(DEFAULT_TAG, 1, b"\x01") == triplet
+        assert t.trusted_triplet(0x30, 0, b"", indefinite=True).indefinite is True
+
+    def test_strict(self: "TestTripletValidation") -> None:
+        with t.validation("strict") as level:
+            assert level is t.Validation.STRICT
+            with pytest.raises(t.TripletTooManyBytesError):
+                t.trusted_triplet(DEFAULT_TAG, 1, b"\x01\x02")
+            assert t.Triplet.from_bytes(b"\x81\x01\x01").value == b"\x01"
+        assert t.get_validation() is t.Validation.TRUSTED
+        # trusted paths are only unchecked outside STRICT, the caller vouches for the length
+        assert t.trusted_triplet(DEFAULT_TAG, 1, b"\x01\x02").length == 1
+
+    def test_none(self: "TestTripletValidation") -> None:
+        previous = t.set_validation(t.Validation.NONE)
+        try:
+            assert t.Triplet.build(DEFAULT_TAG, b"\x01") == t.Triplet(tag=DEFAULT_TAG, length=1, value=b"\x01")
+        finally:
+            t.set_validation(previous)
+        with pytest.raises(t.TripletTooManyBytesError):
+            t.Triplet(tag=DEFAULT_TAG, length=0, value=b"\x01")
+        with pytest.raises(ValueError, match="'lenient' is not a valid Validation"):
+            t.set_validation("lenient")
+
+
+class TestTripletHash:
+    def test_hash_writable_buffer(self: "TestTripletHash") -> None:
+        triplet, _ = t.Triplet.from_buffer(bytearray(b"\x81\x01\x01"))
+        assert isinstance(triplet.value, memoryview)
+        assert hash(triplet) == hash(t.Triplet.from_bytes(b"\x81\x01\x01"))
+        assert {triplet, t.Triplet(tag=DEFAULT_TAG, length=1, value=b"\x01")} == {triplet}
+        assert hash(triplet) != hash(t.Triplet.from_bytes(b"\x81\x01\x02"))
+
+
+class TestTripletBadTag:
+    @pytest.mark.parametrize("tag", [0x1F, 0x3F, 0x9F, 0xBF, 0xFF])
+    def test_leading_byte_only(self: "TestTripletBadTag", tag: int) -> None:
+        with pytest.raises(t.TripletBadTagError, match=f"Tag {tag:#04x} is only the leading byte"):
+            t.Triplet.build(tag=tag, value=b"\x01")
+        with pytest.raises(t.TripletBadTagError):
+            t.pack_header(tag, 1)
+        with pytest.raises(t.TripletBadTagError):
+            t.pack_header_into(bytearray(2), 0, tag, 1)
+        with pytest.raises(t.TripletBadTagError):
+            bytes(t.Triplet(tag=tag, length=1, value=b"\x01"))
+
+    @pytest.mark.parametrize("tag", [0x1E, 0x9E, 0x9F1F, 0xBF8100])
+    def test_round_trip(self: "TestTripletBadTag", tag: int) -> None:
+        triplet = t.Triplet.build(tag=tag, value=b"\x01")
+        assert t.Triplet.from_bytes(bytes(triplet)) == triplet
+        assert t.Triplet.from_buffer(bytes(triplet) + bytes(triplet), len(triplet)) == (triplet, 2 * len(triplet))
+
+    @pytest.mark.parametrize(
+        ("tag", "match"),
+        [
+            (0x1234, "does not use the high-tag-number form"),
+            (0x9F8022, "padding byte"),
+            (0x9F81, "continuation bits"),
+            (0x9F0102, "continuation bits"),
+            (0x9F05, "tag number 5"),
+        ],
+    )
+    def test_bad_multi_byte(self: "TestTripletBadTag", tag: int, match: str) -> None:
+        with pytest.raises(t.TripletBadTagError, match=match):
+            t.Triplet.build(tag=tag, value=b"\x01")
+        with pytest.raises(t.TripletBadTagError):
+            t.pack_header(tag, 1)
+        with pytest.raises(t.TripletBadTagError):
+            t.pack_header_into(bytearray(5), 0, tag, 1)
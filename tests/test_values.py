@@ -0,0 +1,174 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from pysn1 import values as v
+from pysn1.triplet import Triplet
+
+
+def _encode(codec: v.Codec, value: object) -> bytes:
+    buffer = bytearray(b"\xee" + b"\x00" * codec.size(value) + b"\xee")
+    end = codec.encode_into(buffer, 1, value)
+    assert end == len(buffer) - 1
+    assert buffer[0] == buffer[-1] == 0xEE  # noqa: PLR2004
+    return bytes(buffer[1:-1])
+
+
+class TestValuesInteger:
+    @pytest.mark.parametrize(
+        ("value", "encoded"),
+        [
+            (0, b"\x00"),
+            (127, b"\x7f"),
+            (128, b"\x00\x80"),
+            (-1, b"\xff"),
+            (-128, b"\x80"),
+            (-129, b"\xff\x7f"),
+            (0x12345678, b"\x12\x34\x56\x78"),
+            (-(2**63), b"\x80" + b"\x00" * 7),
+        ],
+    )
+    def test_integer(self: "TestValuesInteger", value: int, encoded: bytes) -> None:
+        assert _encode(v.INTEGER, value) == encoded
+        assert v.INTEGER.decode(memoryview(encoded)) == value
+
+    def test_integer_empty(self: "TestValuesInteger") -> None:
+        with pytest.raises(v.ValueCodecError, match="INTEGER value is empty"):
+            v.decode_integer(memoryview(b""))
+
+    def test_unsigned(self: "TestValuesInteger") -> None:
+        assert _encode(v.UNSIGNED, 0xFFFF) == b"\x00\xff\xff"
+        assert v.decode_unsigned(memoryview(b"\x00\xff\xff")) == 0xFFFF  # noqa: PLR2004
+        with pytest.raises(v.ValueCodecError, match="makes it negative"):
+            v.decode_unsigned(memoryview(b"\xff"))
+        with pytest.raises(v.ValueCodecError, match="must be positive"):
+            _encode(v.UNSIGNED, -1)
+
+
+class TestValuesBoolean:
+    def test_boolean(self: "TestValuesBoolean") -> None:
+        assert _encode(v.BOOLEAN, True) == b"\xff"  # noqa: FBT003
+        assert _encode(v.BOOLEAN, False) == b"\x00"  # noqa: FBT003
+        assert v.decode_boolean(memoryview(b"\x01")) is True
+        assert v.decode_boolean(memoryview(b"\x00")) is False
+
+    def test_boolean_length(self: "TestValuesBoolean") -> None:
+        with pytest.raises(v.ValueCodecError, match="BOOLEAN value has 2 bytes, expected 1"):
+            v.decode_boolean(memoryview(b"\x00\x01"))
+
+
+class TestValuesBitString:
+    def test_bit_string(self: "TestValuesBitString") -> None:
+        # IEC 61850 quality, 13 bits, 3 unused: validity questionable (bits 0-1 = 11), oscillatory (bit 7)
+        encoded = b"\x03\xc1\x00"
+        bits = v.decode_bit_string(memoryview(encoded))
+        assert bits == v.BitString(value=0b1100_0001_0000_0, length=13)
+        assert [bits[index] for index in range(bits.length)] == [True, True] + [False] * 5 + [True] + [False] * 5
+        assert _encode(v.BIT_STRING, bits) == encoded
+
+    def test_bit_string_empty(self: "TestValuesBitString") -> None:
+        assert v.decode_bit_string(memoryview(b"\x00")) == v.BitString(value=0, length=0)
+        assert _encode(v.BIT_STRING, v.BitString(value=0, length=0)) == b"\x00"
+
+    def test_bit_string_bad_unused(self: "TestValuesBitString") -> None:
+        with pytest.raises(v.ValueCodecError, match="BIT STRING has 8 unused bits"):
+            v.decode_bit_string(memoryview(b"\x08\x00"))
+
+    def test_bit_string_index(self: "TestValuesBitString") -> None:
+        with pytest.raises(IndexError, match="Bit 2 is out of range"):
+            v.BitString(value=0, length=2)[2]
+
+
+class TestValuesFloat:
+    def test_float32(self: "TestValuesFloat") -> None:
+        encoded = _encode(v.FLOAT, 1.5)
+        assert encoded == b"\x08\x3f\xc0\x00\x00"
+        assert v.decode_float(memoryview(encoded)) == 1.5  # noqa: PLR2004
+        assert v.decode_float(memoryview(encoded[1:])) == 1.5  # noqa: PLR2004
+
+    def test_float64(self: "TestValuesFloat") -> None:
+        encoded = _encode(v.DOUBLE, -0.1)
+        assert encoded[0] == v.FLOAT64_EXPONENT
+        assert v.decode_float(memoryview(encoded)) == -0.1  # noqa: PLR2004
+        assert v.decode_float(memoryview(encoded[1:])) == -0.1  # noqa: PLR2004
+
+    def test_float_length(self: "TestValuesFloat") -> None:
+        with pytest.raises(v.ValueCodecError, match="Floating point value has 3 bytes"):
+            v.decode_float(memoryview(b"\x00\x00\x00"))
+
+
+class TestValuesUtcTime:
+    def test_utc_time(self: "TestValuesUtcTime") -> None:
+        encoded = b"\x65\x00\x00\x00\x80\x00\x00\x0a"
+        time = v.decode_utc_time(memoryview(encoded))
+        assert time == v.UtcTime(seconds=0x65000000, fraction=0x800000, quality=0x0A)
+        assert time.nanoseconds == 0x65000000 * 10**9 + 500_000_000
+        assert time.to_datetime() == datetime(2023, 9, 12, 6, 6, 56, 500_000, tzinfo=timezone.utc)
+        assert _encode(v.UTC, time) == encoded
+
+    def test_utc_time_length(self: "TestValuesUtcTime") -> None:
+        with pytest.raises(v.ValueCodecError, match="UtcTime value has 7 bytes, expected 8"):
+            v.decode_utc_time(memoryview(b"\x00" * 7))
+
+
+class TestValuesStrings:
+    def test_visible_string(self: "TestValuesStrings") -> None:
+        assert _encode(v.VISIBLE_STRING, "IED1LD0/LLN0$GO$gcb01") == b"IED1LD0/LLN0$GO$gcb01"
+        assert v.VISIBLE_STRING.decode(memoryview(b"gcb01")) == "gcb01"
+
+    def test_mms_string(self: "TestValuesStrings") -> None:
+        assert _encode(v.UTF8_STRING, "ação") == "ação".encode()
+        assert v.UTF8_STRING.decode(memoryview("ação".encode())) == "ação"
+
+    def test_octet_string(self: "TestValuesStrings") -> None:
+        assert _encode(v.OCTET_STRING, b"\x01\x02") == b"\x01\x02"
+        assert v.OCTET_STRING.decode(memoryview(b"\x01\x02")) == b"\x01\x02"
+
+
+class TestValuesCodecFor:
+    @pytest.mark.parametrize(
+        ("tag", "codec"),
+        [
+            (0x01, v.BOOLEAN),
+            (0x02, v.INTEGER),
+            (0x03, v.BIT_STRING),
+            (0x0A, v.INTEGER),
+            (0x1A, v.VISIBLE_STRING),
+            (0x83, v.BOOLEAN),
+            (0x85, v.INTEGER),
+            (0x86, v.UNSIGNED),
+            (0x87, v.FLOAT),
+            (0x8A, v.VISIBLE_STRING),
+            (0x91, v.UTC),
+        ],
+    )
+    def test_codec_for(self: "TestValuesCodecFor", tag: int, codec: v.Codec) -> None:
+        assert v.codec_for(tag) is codec
+
+    def test_codec_not_found(self: "TestValuesCodecFor") -> None:
+        with pytest.raises(v.ValueCodecNotFoundError, match="No value codec for tag 0x30"):
+            v.codec_for(0x30)
+
+    def test_decode_value(self: "TestValuesCodecFor") -> None:
+        assert v.decode_value(Triplet.build(tag=0x85, value=b"\xff\x7f")) == -129  # noqa: PLR2004
+        assert v.decode_value(Triplet.from_buffer(b"\x83\x01\xff")[0]) is True
+
+    def test_build(self: "TestValuesCodecFor") -> None:
+        assert v.build(0x85, 128) == Triplet.build(tag=0x85, value=b"\x00\x80")
+        assert v.build(0x04, 1.5, v.FLOAT) == Triplet.build(tag=0x04, value=b"\x08\x3f\xc0\x00\x00")
+
+
+class TestValuesDecodeData:
+    def test_decode_data(self: "TestValuesDecodeData") -> None:
+        all_data = (
+            bytes(v.build(0x83, True))  # noqa: FBT003
+            + bytes(Triplet.build(tag=0xA2, value=bytes(v.build(0x85, -5)) + bytes(v.build(0x8A, "on"))))
+            + bytes(v.build(0x84, v.BitString(value=0, length=13)))
+        )
+        assert v.decode_data(memoryview(all_data)) == [True, [-5, "on"], v.BitString(value=0, length=13)]
+
+    @pytest.mark.parametrize("tag", [0x8B, 0x8C, 0x8D, 0x8E, 0x8F])
+    def test_decode_data_raw(self: "TestValuesDecodeData", tag: int) -> None:
+        # valid MMS Data without a codec is kept as the raw value bytes
+        data = bytes(Triplet.build(tag=tag, value=b"\x01\x02")) + bytes(v.build(0x83, True))  # noqa: FBT003
+        assert v.decode_data(memoryview(data)) == [b"\x01\x02", True]